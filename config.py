@@ -16,6 +16,45 @@ class Config:
     # API Configuration
     ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
     CLAUDE_MODEL = os.getenv("CLAUDE_MODEL", "claude-3-5-sonnet-20241022")
+    MAX_RESPONSE_TOKENS = int(os.getenv("MAX_RESPONSE_TOKENS", "1024"))
+    CLAUDE_TEMPERATURE = float(os.getenv("CLAUDE_TEMPERATURE")) if os.getenv("CLAUDE_TEMPERATURE") else None  # sent only if set
+    
+    # Retry policy for transient API errors (429/529/5xx/connection resets)
+    API_MAX_ATTEMPTS = int(os.getenv("API_MAX_ATTEMPTS", "4"))
+    API_RETRY_DEADLINE = float(os.getenv("API_RETRY_DEADLINE", "90"))  # seconds across all attempts
+    API_RETRY_BASE_DELAY = 1.0  # seconds, doubled per attempt before jitter
+    API_RETRY_MAX_DELAY = 30.0
+    
+    # HTTP connection pool shared by all requests of a client. Idle keep-alive
+    # connections are reused across turns until they expire.
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "300"))  # seconds idle
+    HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "10"))  # seconds
+    
+    # API Transport: live, record (save responses), replay (serve saved
+    # responses offline) or mock (local stand-in for the Messages API)
+    CLAUDE_TRANSPORT = os.getenv("CLAUDE_TRANSPORT", "live").lower()
+    ANTHROPIC_BASE_URL = os.getenv("ANTHROPIC_BASE_URL")  # e.g. a standalone core.transport server
+    ANTHROPIC_UPSTREAM_URL = os.getenv("ANTHROPIC_UPSTREAM_URL", "https://api.anthropic.com")
+    MOCK_LATENCY = float(os.getenv("MOCK_LATENCY", "0.2"))  # seconds before each response
+    MOCK_TOKEN_DELAY = float(os.getenv("MOCK_TOKEN_DELAY", "0.01"))  # seconds between stream events
+    
+    # Response Cache (opt-in; only used with CLAUDE_TEMPERATURE=0)
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "3600"))  # seconds
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "500"))
+    
+    # Prompt caching marks tools, system prompt and the stable history prefix
+    ENABLE_PROMPT_CACHING = os.getenv("ENABLE_PROMPT_CACHING", "true").lower() == "true"
+    
+    # Streaming Configuration
+    ENABLE_STREAMING = os.getenv("ENABLE_STREAMING", "true").lower() == "true"
+    STREAM_UPDATE_INTERVAL = 50  # milliseconds between coalesced chat updates
+    
+    # Tool Loop Configuration (tool results are sent back until Claude stops calling tools)
+    MAX_TOOL_ITERATIONS = int(os.getenv("MAX_TOOL_ITERATIONS", "10"))
+    TOOL_MAX_PARALLEL = int(os.getenv("TOOL_MAX_PARALLEL", "4"))  # concurrent read-only tool calls
     
     # Application Info
     APP_NAME = "Claude AI Assistant"
@@ -65,6 +104,12 @@ class Config:
     HISTORY_FILE = Path("claude_chat_history.json")
     AUTO_SAVE_HISTORY = True
     
+    # History Summary (messages leaving the history window are summarized in the background)
+    ENABLE_HISTORY_SUMMARY = os.getenv("ENABLE_HISTORY_SUMMARY", "true").lower() == "true"
+    SUMMARY_BATCH_SIZE = 4  # evicted messages collected before a summary refresh
+    SUMMARY_MAX_PENDING = 200  # evicted messages kept while summaries fail
+    SUMMARY_MAX_TOKENS = 512
+    
     # PyAutoGUI Configuration
     PYAUTOGUI_PAUSE = float(os.getenv("PYAUTOGUI_PAUSE", "0.3"))
     PYAUTOGUI_FAILSAFE = os.getenv("PYAUTOGUI_FAILSAFE", "true").lower() == "true"
@@ -79,6 +124,20 @@ class Config:
     USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
     REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "10"))
     MAX_REDIRECTS = 5
+    WEB_MAX_DOWNLOAD_BYTES = int(os.getenv("WEB_MAX_DOWNLOAD_BYTES", str(5 * 1024 * 1024)))  # body bytes read per page
+    WEB_PARSEABLE_CONTENT_TYPES = [
+        'text/html', 'application/xhtml+xml', 'text/plain',
+        'text/xml', 'application/xml', 'application/json'
+    ]
+    HTML_PARSER = os.getenv("HTML_PARSER", "auto").lower()  # auto (lxml if installed), lxml or html.parser
+    HTML_STREAMING_TEXT = os.getenv("HTML_STREAMING_TEXT", "true").lower() == "true"  # text without a full parse
+    WEB_MAX_PARALLEL_FETCHES = int(os.getenv("WEB_MAX_PARALLEL_FETCHES", "6"))  # concurrent load_pages downloads
+    WEB_MAX_FETCHES_PER_HOST = int(os.getenv("WEB_MAX_FETCHES_PER_HOST", "2"))  # of those, to one host
+    WEB_MAX_PAGES_PER_CALL = int(os.getenv("WEB_MAX_PAGES_PER_CALL", "10"))  # URLs per load_pages call
+    HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"  # disk cache for page loads
+    HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(100 * 1024 * 1024)))  # total stored bodies
+    HTTP_CACHE_COMPLETE_BYTES = int(os.getenv("HTTP_CACHE_COMPLETE_BYTES", str(1024 * 1024)))  # read past an early stop to cache
+    HTTP_CACHE_COMPLETE_SECONDS = float(os.getenv("HTTP_CACHE_COMPLETE_SECONDS", "1.0"))  # longest wait for that read
     
     # File Operations
     SUPPORTED_TEXT_EXTENSIONS = [
@@ -99,8 +158,12 @@ class Config:
     LOG_BACKUP_COUNT = 3
     
     # Performance Settings
-    MAX_SCREENSHOT_SIZE = (1920, 1080)
-    COMPRESS_SCREENSHOTS = True
+    MAX_SCREENSHOT_SIZE = tuple(int(v) for v in os.getenv("MAX_SCREENSHOT_SIZE", "1280x800").split('x'))  # capped to the API's image limits
+    COMPRESS_SCREENSHOTS = os.getenv("COMPRESS_SCREENSHOTS", "true").lower() == "true"
+    SCREENSHOT_FORMAT = os.getenv("SCREENSHOT_FORMAT", "auto")  # auto, png, jpeg or webp
+    SCREENSHOT_QUALITY = int(os.getenv("SCREENSHOT_QUALITY", "80"))  # 1-100, 95+ keeps PNG
+    SCREENSHOT_PNG_MAX_COLORS = 1024  # flatter screens than this stay PNG in auto mode
+    SCREENSHOT_ALL_SCREENS = os.getenv("SCREENSHOT_ALL_SCREENS", "false").lower() == "true"
     THUMBNAIL_SIZE = (200, 150)
     
     # Security Settings
@@ -126,11 +189,25 @@ class Config:
     EXPORTS_DIR = BASE_DIR / "exports"
     TEMP_DIR = BASE_DIR / "temp"
     SCREENSHOTS_DIR = BASE_DIR / "screenshots"
+    CLAUDE_RECORDINGS_DIR = TEMP_DIR / "recordings"
+    RESPONSE_CACHE_DIR = TEMP_DIR / "response_cache"
+    HTTP_CACHE_DIR = TEMP_DIR / "http_cache"
+    TELEMETRY_FILE = LOGS_DIR / "telemetry.jsonl"
     
     # API Limits
-    MAX_MESSAGE_LENGTH = 100000
-    MAX_CONTEXT_LENGTH = 150000
-    RATE_LIMIT_REQUESTS = 50  # per minute
+    MAX_MESSAGE_LENGTH = int(os.getenv("MAX_MESSAGE_LENGTH", "100000"))  # characters per text block
+    MAX_CONTEXT_LENGTH = int(os.getenv("MAX_CONTEXT_LENGTH", "150000"))  # input tokens per request
+    RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", "50"))  # per minute
+    RATE_LIMIT_INPUT_TOKENS = int(os.getenv("RATE_LIMIT_INPUT_TOKENS", "40000"))  # per minute, 0 disables
+    RATE_LIMIT_OUTPUT_TOKENS = int(os.getenv("RATE_LIMIT_OUTPUT_TOKENS", "8000"))  # per minute, 0 disables
+    
+    # Telemetry (one record per chat turn, kept in memory and appended to TELEMETRY_FILE)
+    TELEMETRY_MAX_RECORDS = 500
+    TELEMETRY_SINK_ENABLED = os.getenv("TELEMETRY_SINK_ENABLED", "true").lower() == "true"
+    
+    # Async Core (one event loop thread shared by chat, web and file tools)
+    ASYNC_MAX_CONCURRENCY = int(os.getenv("ASYNC_MAX_CONCURRENCY", "8"))
+    ASYNC_POLL_INTERVAL = 30  # milliseconds between Tk result queue polls
     
     # UI Settings
     ANIMATION_SPEED = 250  # milliseconds
@@ -185,7 +262,7 @@ class Config:
         ]
         
         for directory in directories:
-            directory.mkdir(exist_ok=True)
+            directory.mkdir(parents=True, exist_ok=True)
     
     @classmethod
     def get_theme_colors(cls):
@@ -211,8 +288,8 @@ class Config:
         """Validate configuration settings"""
         issues = []
         
-        # Check API key
-        if not cls.ANTHROPIC_API_KEY:
+        # Check API key (replay and mock transports never reach the API)
+        if not cls.ANTHROPIC_API_KEY and cls.CLAUDE_TRANSPORT not in ("replay", "mock"):
             issues.append("ANTHROPIC_API_KEY not set")
         
         # Check numeric values
@@ -268,13 +345,3 @@ class Config:
         except Exception as e:
             print(f"Failed to load user config: {e}")
         return {}
-
-# Auto-create directories on import
-Config.create_directories()
-
-# Validate configuration
-config_issues = Config.validate_config()
-if config_issues:
-    print("⚠️  Configuration Issues:")
-    for issue in config_issues:
-        print(f"   • {issue}")
@@ -0,0 +1,120 @@
+"""
+Tk/asyncio Bridge for Claude Computer Use Assistant
+Runs one asyncio event loop in a background thread and hands results back to Tk
+"""
+
+import asyncio
+import functools
+import queue
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+
+class AsyncBridge:
+    """Schedule coroutines from Tk and deliver their results on the Tk thread
+    
+    All network and tool work runs on a single event loop thread. Blocking
+    functions run in a bounded executor. Completion callbacks and UI updates
+    are queued and drained by one after()-polled handler, so worker code
+    never touches Tk widgets directly.
+    """
+    
+    def __init__(self, root, max_concurrency=None, poll_interval=None):
+        self.root = root
+        self.poll_interval = poll_interval or Config.ASYNC_POLL_INTERVAL
+        self.max_concurrency = max_concurrency or Config.ASYNC_MAX_CONCURRENCY
+        
+        self.ui_queue = queue.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                           thread_name_prefix="bridge-worker")
+        
+        self.loop = asyncio.new_event_loop()
+        self.loop_ready = threading.Event()
+        self.thread = threading.Thread(target=self._run_loop, name="asyncio-bridge", daemon=True)
+        self.thread.start()
+        self.loop_ready.wait()
+        
+        self.running = True
+        self.root.after(self.poll_interval, self._poll)
+        
+    def _run_loop(self):
+        """Run the event loop forever (background thread)"""
+        asyncio.set_event_loop(self.loop)
+        self.loop.set_default_executor(self.executor)
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.loop_ready.set()
+        self.loop.run_forever()
+        
+    def submit(self, coro, callback=None, errback=None):
+        """Schedule a coroutine from any thread
+        
+        callback(result) or errback(exception) runs on the Tk thread when it
+        finishes. Returns a concurrent.futures.Future; cancelling it cancels
+        the coroutine.
+        """
+        future = asyncio.run_coroutine_threadsafe(self._bounded(coro), self.loop)
+        future.add_done_callback(functools.partial(self._deliver, callback=callback, errback=errback))
+        return future
+    
+    def run_blocking(self, func, *args, callback=None, errback=None):
+        """Run a blocking function in the bridge's executor (see submit)"""
+        return self.submit(self.to_thread(func, *args), callback, errback)
+    
+    async def to_thread(self, func, *args):
+        """Await a blocking function on the bridge's executor"""
+        return await self.loop.run_in_executor(self.executor, functools.partial(func, *args))
+    
+    def call_in_ui(self, func, *args):
+        """Queue func(*args) to run on the Tk thread at the next poll"""
+        self.ui_queue.put(functools.partial(func, *args))
+        
+    async def _bounded(self, coro):
+        """Run a coroutine while holding a concurrency slot"""
+        async with self.semaphore:
+            return await coro
+        
+    def _deliver(self, future, callback=None, errback=None):
+        """Queue the outcome of a finished future for the Tk thread"""
+        if future.cancelled():
+            return
+        
+        error = future.exception()
+        if error is not None:
+            if errback:
+                self.call_in_ui(errback, error)
+            else:
+                self.call_in_ui(self._report_error, error)
+        elif callback:
+            self.call_in_ui(callback, future.result())
+            
+    def _report_error(self, error):
+        """Print errors from tasks that have no errback"""
+        traceback.print_exception(type(error), error, error.__traceback__)
+        
+    def _poll(self):
+        """Drain queued callbacks on the Tk thread"""
+        while True:
+            try:
+                func = self.ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func()
+            except Exception:
+                traceback.print_exc()
+        
+        if self.running:
+            self.root.after(self.poll_interval, self._poll)
+            
+    def shutdown(self):
+        """Cancel outstanding work and stop the event loop"""
+        self.running = False
+        
+        def cancel_all():
+            for task in asyncio.all_tasks(self.loop):
+                task.cancel()
+            self.loop.stop()
+        
+        self.loop.call_soon_threadsafe(cancel_all)
+        self.executor.shutdown(wait=False, cancel_futures=True)
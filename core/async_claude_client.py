@@ -0,0 +1,135 @@
+"""
+Async Claude Client for Claude Computer Use Assistant
+AsyncAnthropic based variant of ClaudeClient for use on the AsyncBridge loop
+"""
+
+import asyncio
+import threading
+import time
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+from config import Config
+from core.claude_client import ClaudeClient, HEALTH_CHECK_PATH, connection_limits
+from core.rate_limiter import PRIORITY_INTERACTIVE
+
+class AsyncClaudeClient(ClaudeClient):
+    """ClaudeClient whose request methods are coroutines
+    
+    Message building, prompt caching, screenshot encoding, rate limiting
+    and retry classification are shared with ClaudeClient. Cancelling the
+    awaiting task closes the underlying HTTP request.
+    """
+    
+    def _create_client(self):
+        """Create the underlying async Anthropic SDK client"""
+        # Retries are handled by RetryPolicy so they can honour our deadline
+        return AsyncAnthropic(
+            api_key=Config.ANTHROPIC_API_KEY or "offline",
+            base_url=self.base_url,
+            max_retries=0,
+            http_client=DefaultAsyncHttpxClient(limits=connection_limits())
+        )
+    
+    async def check_connection(self):
+        """Probe the API and return the round trip time (see ClaudeClient.check_connection)
+        
+        Run it on the loop that sends messages: the async connection pool
+        belongs to that loop, so only there is the warmed connection reused.
+        """
+        start_time = time.perf_counter()
+        await self.client.get(HEALTH_CHECK_PATH, cast_to=object, options=self._probe_options())
+        self.last_probe_rtt = time.perf_counter() - start_time
+        return self.last_probe_rtt
+    
+    async def send_message(self, message, screenshot=None, page_content=None, history=None,
+                           priority=PRIORITY_INTERACTIVE):
+        """Send message to Claude and return the complete response"""
+        messages = await self.build_messages(message, screenshot, page_content, history)
+        return await self.create_message(messages, priority)
+    
+    async def stream_message(self, message, screenshot=None, page_content=None, history=None,
+                             priority=PRIORITY_INTERACTIVE):
+        """Async generator yielding the events described in ClaudeClient.stream_message"""
+        messages = await self.build_messages(message, screenshot, page_content, history)
+        async for event in self.stream_messages(messages, priority):
+            yield event
+    
+    async def build_messages(self, message, screenshot=None, page_content=None, history=None):
+        """Build the messages payload off the event loop (screenshot encoding is CPU bound)"""
+        return await asyncio.to_thread(self._build_messages, message, screenshot, page_content, history)
+    
+    async def create_message(self, messages, priority=PRIORITY_INTERACTIVE, **overrides):
+        """Send a prepared messages list and return the complete response"""
+        params = self._request_params(messages, **overrides)
+        cached = self._cached_response(params)
+        if cached is not None:
+            return cached
+        
+        start_time = time.perf_counter()
+        response = await self.retry_policy.call_async(lambda: self._create(params, priority))
+        self.response_cache.put(params, response, time.perf_counter() - start_time)
+        return response
+    
+    async def stream_messages(self, messages, priority=PRIORITY_INTERACTIVE):
+        """Stream the response to a prepared messages list"""
+        params = self._request_params(messages)
+        cached = self._cached_response(params)
+        if cached is not None:
+            for event in self.response_events(cached):
+                yield event
+            return
+        
+        start_time = time.perf_counter()
+        async for kind, payload in self.retry_policy.call_stream_async(lambda: self._stream_events(params, priority)):
+            if kind == "message":
+                self.response_cache.put(params, payload, time.perf_counter() - start_time)
+            yield kind, payload
+    
+    async def _create(self, params, priority):
+        """Make one blocking request attempt"""
+        estimated_tokens = await self._acquire_rate_limit_async(params, priority)
+        
+        response = await self.client.messages.create(**params)
+        self.last_usage = self.usage_summary(response)
+        self._record_rate_limit_usage(estimated_tokens)
+        
+        return response
+    
+    async def _stream_events(self, params, priority):
+        """Make one streaming request attempt, yielding stream events"""
+        estimated_tokens = await self._acquire_rate_limit_async(params, priority)
+        
+        start_time = time.perf_counter()
+        first_token_time = None
+        self.last_stream_stats = {}
+        
+        async with self.client.messages.stream(**params) as stream:
+            async for event in stream:
+                if event.type == "content_block_delta" and event.delta.type == "text_delta":
+                    if first_token_time is None:
+                        first_token_time = time.perf_counter() - start_time
+                    yield ("text", event.delta.text)
+                elif event.type == "content_block_stop" and event.content_block.type == "tool_use":
+                    if first_token_time is None:
+                        first_token_time = time.perf_counter() - start_time
+                    yield ("tool_use", event.content_block)
+            
+            response = await stream.get_final_message()
+        
+        self.last_stream_stats = {
+            'time_to_first_token': first_token_time,
+            'total_time': time.perf_counter() - start_time
+        }
+        self.last_usage = self.usage_summary(response)
+        self._record_rate_limit_usage(estimated_tokens)
+        yield ("message", response)
+    
+    async def _acquire_rate_limit_async(self, params, priority):
+        """Wait for rate limit capacity without blocking the event loop"""
+        cancel_event = threading.Event()
+        try:
+            return await asyncio.to_thread(self._acquire_rate_limit, params, priority, cancel_event)
+        except asyncio.CancelledError:
+            # Take the abandoned request out of the queue
+            cancel_event.set()
+            self.rate_limiter.wake()
+            raise
@@ -1,124 +1,403 @@
-from anthropic import Anthropic
+from anthropic import Anthropic, DefaultHttpxClient
 from config import Config
-import io
-import base64
+from core.context_packer import ContextPacker, CHARS_PER_TOKEN, cap_block, estimate_block_tokens
+from core.rate_limiter import RateLimiter, PRIORITY_INTERACTIVE
+from core.response_cache import ResponseCache
+from core.retry import RetryPolicy
+from core.tool_registry import TOOL_REGISTRY
+from core.transport import transport_base_url
+from utils.image_encoding import ImageEncoder
+import copy
+import json
+import time
+
+# The SDK's HTTP library: httpx, or httpx2 in newer SDK releases
+try:
+    import httpx
+except ImportError:
+    import httpx2 as httpx
+
+# Cheap authenticated endpoint used to probe the connection
+HEALTH_CHECK_PATH = "/v1/models"
+
+def connection_limits():
+    """Connection pool limits from Config"""
+    return httpx.Limits(
+        max_connections=Config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY
+    )
 
 class ClaudeClient:
     def __init__(self):
-        if not Config.ANTHROPIC_API_KEY:
+        if not Config.ANTHROPIC_API_KEY and Config.CLAUDE_TRANSPORT not in ("replay", "mock"):
             raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
-        self.client = Anthropic(api_key=Config.ANTHROPIC_API_KEY)
-        
-    def send_message(self, message, screenshot=None, page_content=None):
-        """Send message to Claude with optional screenshot and page content"""
-        # Prepare full message
-        full_message = message
-        
-        if page_content:
-            full_message += f"\n\nCurrent page content:\n{page_content[:2000]}..."
-        
-        # Prepare message structure
-        messages = [
-            {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": full_message}
-                ]
-            }
-        ]
         
-        # Add screenshot if provided
-        if screenshot:
-            buffer = io.BytesIO()
-            screenshot.save(buffer, format='PNG')
-            img_str = base64.b64encode(buffer.getvalue()).decode()
-            
-            messages[0]["content"].append({
-                "type": "image",
-                "source": {
-                    "type": "base64",
-                    "media_type": "image/png",
-                    "data": img_str
-                }
-            })
-        
-        # Send to Claude
-        response = self.client.messages.create(
-            model=Config.CLAUDE_MODEL,
-            max_tokens=1024,
-            messages=messages,
-            tools=self._get_tools()
+        # Live API, or the local record/replay/mock server (see core.transport)
+        self.base_url = transport_base_url()
+        self.client = self._create_client()
+        self.retry_policy = RetryPolicy()
+        
+        # Timing of the most recent streamed response
+        self.last_stream_stats = {}
+        
+        # Token usage (including prompt cache hits) of the most recent response
+        self.last_usage = {}
+        
+        # Screenshot encoding stage and details of the last encoded screenshot
+        self.image_encoder = ImageEncoder()
+        self.last_image_encoding = None
+        
+        # Maps coordinates in the latest screenshot Claude saw to screen space
+        self.screen_scaling = None
+        
+        # Opt-in cache of responses to identical deterministic requests
+        self.response_cache = ResponseCache()
+        self.last_response_cached = False
+        
+        # Fits each request into the context budget
+        self.context_packer = ContextPacker()
+        self.last_context_report = None
+        
+        # Client-side request/token limits shared by every caller of this client
+        self.rate_limiter = RateLimiter()
+        self.last_queue_wait = 0.0
+        
+        # Round trip time of the last health probe (see check_connection)
+        self.last_probe_rtt = None
+        
+        # Tools and system prompt never change between requests; build them once
+        self.tools = self._get_tools()
+        self.system = self._get_system()
+        if Config.ENABLE_PROMPT_CACHING:
+            self.tools[-1] = dict(self.tools[-1], cache_control={"type": "ephemeral"})
+            self.system[-1] = dict(self.system[-1], cache_control={"type": "ephemeral"})
+        
+        # Size of the fixed prompt prefix, measured once for token estimates
+        self.fixed_prompt_chars = len(TOOL_REGISTRY.serialized()) + len(json.dumps(self.system))
+        
+    def fork(self):
+        """Get a client for side requests, such as history summaries
+        
+        The fork shares the SDK connection pool, rate limiter and response
+        cache, but keeps its own per-request state (last_usage,
+        last_queue_wait, retry attempts, ...) so side requests do not
+        overwrite what is reported for the chat turn.
+        """
+        forked = copy.copy(self)
+        forked.retry_policy = RetryPolicy()
+        forked.last_stream_stats = {}
+        forked.last_usage = {}
+        forked.last_image_encoding = None
+        forked.last_response_cached = False
+        forked.last_context_report = None
+        forked.last_queue_wait = 0.0
+        return forked
+    
+    def _create_client(self):
+        """Create the underlying Anthropic SDK client"""
+        # Retries are handled by RetryPolicy so they can honour our deadline
+        return Anthropic(
+            api_key=Config.ANTHROPIC_API_KEY or "offline",
+            base_url=self.base_url,
+            max_retries=0,
+            http_client=DefaultHttpxClient(limits=connection_limits())
         )
+    
+    def check_connection(self):
+        """Probe the API and return the round trip time in seconds
+        
+        Uses a lightweight authenticated request, so a bad key or an
+        unreachable API raises. The probe also opens a keep-alive
+        connection, which spares the first message DNS and TLS setup.
+        """
+        start_time = time.perf_counter()
+        self.client.get(HEALTH_CHECK_PATH, cast_to=object, options=self._probe_options())
+        self.last_probe_rtt = time.perf_counter() - start_time
+        return self.last_probe_rtt
+    
+    @staticmethod
+    def _probe_options():
+        """Request options for the health probe"""
+        return {'params': {'limit': 1}, 'timeout': Config.HEALTH_CHECK_TIMEOUT}
+    
+    def send_message(self, message, screenshot=None, page_content=None, history=None,
+                     priority=PRIORITY_INTERACTIVE):
+        """Send message to Claude with optional screenshot and page content
+        
+        history is an alternating list of prior Messages API turns (see
+        MessageHistoryManager.get_messages) that is sent ahead of the message.
+        priority orders this request in the rate limiter queue.
+        """
+        messages = self._build_messages(message, screenshot, page_content, history)
+        return self.create_message(messages, priority)
+    
+    def stream_message(self, message, screenshot=None, page_content=None, history=None,
+                       priority=PRIORITY_INTERACTIVE):
+        """Stream Claude's response as it is generated
+        
+        Yields ("text", str) for every text delta, ("tool_use", block) for every
+        completed tool_use block and finally ("message", response) with the
+        fully assembled response.
+        """
+        messages = self._build_messages(message, screenshot, page_content, history)
+        return self.stream_messages(messages, priority)
+    
+    def create_message(self, messages, priority=PRIORITY_INTERACTIVE, **overrides):
+        """Send a prepared messages list and wait for the complete response
         
+        overrides replace request parameters (e.g. system, max_tokens);
+        a value of None removes the parameter (tools=None sends no tools).
+        """
+        params = self._request_params(messages, **overrides)
+        cached = self._cached_response(params)
+        if cached is not None:
+            return cached
+        
+        start_time = time.perf_counter()
+        response = self.retry_policy.call(lambda: self._create(params, priority))
+        self.response_cache.put(params, response, time.perf_counter() - start_time)
         return response
     
-    def _get_tools(self):
-        """Get tool definitions for Claude"""
+    def stream_messages(self, messages, priority=PRIORITY_INTERACTIVE):
+        """Stream the response to a prepared messages list (see stream_message)"""
+        params = self._request_params(messages)
+        cached = self._cached_response(params)
+        if cached is not None:
+            return iter(self.response_events(cached))
+        
+        return self._caching_stream(params, self.retry_policy.call_stream(lambda: self._stream_events(params, priority)))
+    
+    def _caching_stream(self, params, events):
+        """Pass stream events through, caching the final message"""
+        start_time = time.perf_counter()
+        for kind, payload in events:
+            if kind == "message":
+                self.response_cache.put(params, payload, time.perf_counter() - start_time)
+            yield kind, payload
+    
+    def _cached_response(self, params):
+        """Look a request up in the response cache, updating last_* details on a hit"""
+        response = self.response_cache.get(params)
+        self.last_response_cached = response is not None
+        if response is not None:
+            self.last_usage = {}
+            self.last_queue_wait = 0.0
+            self.last_stream_stats = {'time_to_first_token': 0.0, 'total_time': 0.0}
+        return response
+    
+    @staticmethod
+    def response_events(response):
+        """Get the stream events equivalent to a complete response"""
+        events = []
+        for block in response.content:
+            if block.type == "text":
+                events.append(("text", block.text))
+            elif block.type == "tool_use":
+                events.append(("tool_use", block))
+        events.append(("message", response))
+        return events
+    
+    def _create(self, params, priority):
+        """Make one blocking request attempt"""
+        estimated_tokens = self._acquire_rate_limit(params, priority)
+        
+        response = self.client.messages.create(**params)
+        self.last_usage = self.usage_summary(response)
+        self._record_rate_limit_usage(estimated_tokens)
+        
+        return response
+    
+    def _stream_events(self, params, priority):
+        """Make one streaming request attempt, yielding stream_message events"""
+        estimated_tokens = self._acquire_rate_limit(params, priority)
+        
+        start_time = time.perf_counter()
+        first_token_time = None
+        self.last_stream_stats = {}
+        
+        with self.client.messages.stream(**params) as stream:
+            for event in stream:
+                if event.type == "content_block_delta" and event.delta.type == "text_delta":
+                    if first_token_time is None:
+                        first_token_time = time.perf_counter() - start_time
+                    yield ("text", event.delta.text)
+                elif event.type == "content_block_stop" and event.content_block.type == "tool_use":
+                    if first_token_time is None:
+                        first_token_time = time.perf_counter() - start_time
+                    yield ("tool_use", event.content_block)
+            
+            response = stream.get_final_message()
+        
+        self.last_stream_stats = {
+            'time_to_first_token': first_token_time,
+            'total_time': time.perf_counter() - start_time
+        }
+        self.last_usage = self.usage_summary(response)
+        self._record_rate_limit_usage(estimated_tokens)
+        yield ("message", response)
+    
+    def _build_messages(self, message, screenshot=None, page_content=None, history=None):
+        """Build the messages payload: prior turns followed by the new user turn
+        
+        The context packer fits the message, attachments and history into
+        MAX_CONTEXT_LENGTH tokens; what it cut is kept in last_context_report.
+        """
+        # Encode screenshot if provided
+        self.last_image_encoding = None
+        encoded = None
+        if screenshot:
+            encoded = self.image_encoder.encode(screenshot)
+            self.last_image_encoding = encoded
+            self.screen_scaling = encoded.scaling
+        
+        content, messages, self.last_context_report = self.context_packer.pack(
+            message, history, page_content, encoded,
+            reserved_tokens=self.fixed_prompt_chars // CHARS_PER_TOKEN
+        )
+        user_turn = {"role": "user", "content": content}
+        
+        # Cache everything up to the end of the previous turns
+        if Config.ENABLE_PROMPT_CACHING and messages and messages[-1]["content"]:
+            last_block = messages[-1]["content"][-1]
+            messages[-1]["content"][-1] = dict(last_block, cache_control={"type": "ephemeral"})
+        
+        # Fold into a trailing user turn (e.g. pending tool results) to keep roles alternating
+        if messages and messages[-1]["role"] == "user":
+            messages[-1]["content"].extend(user_turn["content"])
+        else:
+            messages.append(user_turn)
+        
+        return messages
+    
+    def continue_messages(self, messages, response, tool_results):
+        """Append Claude's tool_use turn and the matching tool_result turn
+        
+        Returns a new messages list for the next request of a tool loop. The
+        history cache breakpoint moves to the newest tool result so each step
+        reads the previous steps from the prompt cache. Tool results are
+        capped at MAX_MESSAGE_LENGTH characters like packed history.
+        """
+        continued = []
+        for turn in messages:
+            content = [
+                {key: value for key, value in block.items() if key != "cache_control"}
+                for block in turn["content"]
+            ]
+            continued.append({"role": turn["role"], "content": content})
+        
+        results = [dict(cap_block(result, Config.MAX_MESSAGE_LENGTH)[0]) for result in tool_results]
+        if Config.ENABLE_PROMPT_CACHING and results:
+            results[-1]["cache_control"] = {"type": "ephemeral"}
+        
+        continued.append({"role": "assistant", "content": self.content_to_blocks(response.content)})
+        continued.append({"role": "user", "content": results})
+        return continued
+    
+    def tool_result_block(self, tool_use_id, result, is_error=False, screenshot=None):
+        """Build a tool_result block, attaching a screenshot as an image result"""
+        block = {
+            "type": "tool_result",
+            "tool_use_id": tool_use_id,
+            "content": str(result)
+        }
+        
+        if screenshot is not None:
+            encoded = self.image_encoder.encode(screenshot)
+            self.last_image_encoding = encoded
+            self.screen_scaling = encoded.scaling
+            block["content"] = [
+                {"type": "text", "text": str(result)},
+                encoded.to_content_block()
+            ]
+        
+        if is_error:
+            block["is_error"] = True
+        return block
+    
+    def _request_params(self, messages, **overrides):
+        """Get the keyword arguments shared by blocking and streaming requests"""
+        params = {
+            'model': Config.CLAUDE_MODEL,
+            'max_tokens': Config.MAX_RESPONSE_TOKENS,
+            'system': self.system,
+            'messages': messages,
+            'tools': self.tools
+        }
+        if Config.CLAUDE_TEMPERATURE is not None:
+            # The installed SDK's create()/stream() have no temperature argument
+            params['extra_body'] = {'temperature': Config.CLAUDE_TEMPERATURE}
+        params.update(overrides)
+        return {key: value for key, value in params.items() if value is not None}
+    
+    def _acquire_rate_limit(self, params, priority, cancel_event=None):
+        """Wait for rate limit capacity, returning the estimated input tokens"""
+        estimated_tokens = self.estimate_input_tokens(params, self.fixed_prompt_chars)
+        self.last_queue_wait = self.rate_limiter.acquire(priority, estimated_tokens, cancel_event=cancel_event)
+        return estimated_tokens
+    
+    def _record_rate_limit_usage(self, estimated_tokens):
+        """Report actual usage of the last response to the rate limiter"""
+        usage = self.last_usage
+        self.rate_limiter.record_usage(
+            usage.get('input_tokens', 0) + usage.get('cache_creation_input_tokens', 0),
+            usage.get('output_tokens', 0),
+            estimated_tokens
+        )
+    
+    @staticmethod
+    def estimate_input_tokens(params, fixed_chars=None):
+        """Roughly estimate a request's input tokens (see estimate_block_tokens)
+        
+        fixed_chars is the precomputed size of the tools and system prompt.
+        Images, including screenshots inside tool results, count as
+        IMAGE_BLOCK_TOKENS rather than as the length of their base64 data.
+        """
+        if fixed_chars is None:
+            fixed_chars = len(json.dumps(params.get('tools', []))) + len(json.dumps(params.get('system', [])))
+        
+        return fixed_chars // CHARS_PER_TOKEN + sum(
+            estimate_block_tokens(block)
+            for message in params['messages']
+            for block in message['content']
+        )
+    
+    @staticmethod
+    def usage_summary(response):
+        """Get token usage, including prompt cache reads and writes, as a dict"""
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return {}
+        
+        return {
+            'input_tokens': getattr(usage, 'input_tokens', 0) or 0,
+            'output_tokens': getattr(usage, 'output_tokens', 0) or 0,
+            'cache_creation_input_tokens': getattr(usage, 'cache_creation_input_tokens', 0) or 0,
+            'cache_read_input_tokens': getattr(usage, 'cache_read_input_tokens', 0) or 0
+        }
+    
+    @staticmethod
+    def content_to_blocks(content):
+        """Convert response content blocks into plain dicts for storage/replay"""
+        blocks = []
+        for block in content:
+            if block.type == "text" and block.text:
+                blocks.append({"type": "text", "text": block.text})
+            elif block.type == "tool_use":
+                blocks.append({
+                    "type": "tool_use",
+                    "id": block.id,
+                    "name": block.name,
+                    "input": block.input
+                })
+        return blocks
+    
+    def _get_system(self):
+        """Get the system prompt blocks sent with every request"""
         return [
-            {
-                "name": "computer",
-                "description": "Use a computer to perform actions",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "action": {
-                            "type": "string",
-                            "enum": ["click", "type", "scroll", "key", "move", "screenshot"]
-                        },
-                        "coordinate": {
-                            "type": "array",
-                            "items": {"type": "integer"},
-                            "description": "[x, y] coordinates for click/move actions"
-                        },
-                        "text": {
-                            "type": "string",
-                            "description": "Text to type"
-                        },
-                        "key": {
-                            "type": "string",
-                            "description": "Key to press"
-                        },
-                        "clicks": {
-                            "type": "integer",
-                            "description": "Number of scroll clicks"
-                        }
-                    },
-                    "required": ["action"]
-                }
-            },
-            {
-                "name": "file_operations",
-                "description": "Perform file operations",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "operation": {
-                            "type": "string",
-                            "enum": ["read", "write", "list", "delete", "copy", "move"]
-                        },
-                        "file_path": {"type": "string"},
-                        "content": {"type": "string"},
-                        "dest_path": {"type": "string"},
-                        "mode": {"type": "string", "enum": ["w", "a"]}
-                    },
-                    "required": ["operation", "file_path"]
-                }
-            },
-            {
-                "name": "web_operations",
-                "description": "Perform web operations",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "operation": {
-                            "type": "string",
-                            "enum": ["load_page", "get_content", "search_elements", "extract_links"]
-                        },
-                        "url": {"type": "string"},
-                        "selector": {"type": "string"},
-                        "search_text": {"type": "string"}
-                    },
-                    "required": ["operation"]
-                }
-            }
+            {"type": "text", "text": "\n\n".join(Config.SYSTEM_PROMPTS.values())}
         ]
+    
+    def _get_tools(self):
+        """Get tool definitions for Claude (declared in the tool registry)"""
+        return list(TOOL_REGISTRY.definitions())
@@ -0,0 +1,235 @@
+"""
+Context Packer for Claude Computer Use Assistant
+Fits the current message, attachments and history into a token budget
+"""
+
+import json
+from config import Config
+from utils.history_manager import SUMMARY_HEADER
+
+CHARS_PER_TOKEN = 4
+IMAGE_BLOCK_TOKENS = 1600  # upper bound for an image of unknown size
+TRUNCATION_NOTE = "\n\n[... {count} characters truncated]"
+CUT_TOOL_RESULTS_NOTE = "[Earlier tool calls and results omitted]"
+MIN_TURN_CHARS = 200  # a turn cut to fewer characters per text part is dropped instead
+BLOCK_OVERHEAD_CHARS = 100  # JSON framing of a block beyond its text
+
+def estimate_image_tokens(size):
+    """Estimate the tokens of an image from its pixel size (width * height / 750)"""
+    width, height = size
+    return max(1, (width * height) // 750)
+
+def estimate_block_tokens(block):
+    """Roughly estimate the tokens of one content block"""
+    block_type = block.get('type')
+    
+    if block_type == 'image':
+        return IMAGE_BLOCK_TOKENS
+    if block_type == 'text':
+        return len(block.get('text', '')) // CHARS_PER_TOKEN + 1
+    if block_type == 'tool_result' and isinstance(block.get('content'), list):
+        return sum(estimate_block_tokens(part) for part in block['content']) + 10
+    return len(json.dumps(block, default=str)) // CHARS_PER_TOKEN + 1
+
+def truncate_text(text, max_chars):
+    """Cut text to max_chars (note included), returning (text, characters removed)"""
+    if len(text) <= max_chars:
+        return text, 0
+    
+    removed = len(text) - max_chars
+    note = TRUNCATION_NOTE.format(count=removed)
+    kept = max(0, max_chars - len(note))
+    return text[:kept] + note, len(text) - kept
+
+def is_summary_block(block):
+    """Whether a content block is the running history summary (see HistoryManager.get_messages)"""
+    return block.get('type') == 'text' and block.get('text', '').startswith(SUMMARY_HEADER)
+
+def cap_block(block, max_chars):
+    """Copy a block with its text cut to max_chars, tool_result text included
+    
+    Covers text blocks and tool_result content given as a string or as a
+    list of blocks. Returns (block, characters removed); an unchanged
+    block is returned as is.
+    """
+    block_type = block.get('type')
+    if block_type == 'text':
+        text, removed = truncate_text(block.get('text', ''), max_chars)
+        return (dict(block, text=text) if removed else block), removed
+    
+    if block_type == 'tool_result':
+        content = block.get('content')
+        if isinstance(content, str):
+            text, removed = truncate_text(content, max_chars)
+            return (dict(block, content=text) if removed else block), removed
+        if isinstance(content, list):
+            parts = [cap_block(part, max_chars) for part in content]
+            removed = sum(cut for _, cut in parts)
+            return (dict(block, content=[part for part, _ in parts]) if removed else block), removed
+    
+    return block, 0
+
+def count_text_parts(block):
+    """Number of separately capped texts in a block (see cap_block)"""
+    block_type = block.get('type')
+    if block_type == 'text':
+        return 1
+    if block_type == 'tool_result':
+        content = block.get('content')
+        if isinstance(content, str):
+            return 1
+        if isinstance(content, list):
+            return sum(count_text_parts(part) for part in content)
+    return 0
+
+class ContextPacker:
+    """Fill a token budget by priority
+    
+    The current message comes first, then attachments (screenshot, page
+    content), then the running history summary, which stands in for
+    everything older and is never dropped, then history from the most
+    recent turn backwards. Single
+    text blocks and tool results are capped at MAX_MESSAGE_LENGTH
+    characters; a turn that still does not fit is cut to half the budget
+    left, and older turns are dropped only once even that is too large. Everything that was cut
+    or left out is listed in the report.
+    """
+    
+    def __init__(self, budget_tokens=None, max_message_chars=None):
+        self.budget_tokens = budget_tokens or Config.MAX_CONTEXT_LENGTH
+        self.max_message_chars = max_message_chars or Config.MAX_MESSAGE_LENGTH
+    
+    def pack(self, message, history=None, page_content=None, image=None, reserved_tokens=0):
+        """Pack one request
+        
+        image is an EncodedImage (or None). reserved_tokens covers the parts
+        sent with every request (system prompt, tools). Returns
+        (user_content, history_messages, report).
+        """
+        report = {
+            'budget': self.budget_tokens,
+            'used': reserved_tokens,
+            'truncated': [],
+            'dropped': []
+        }
+        
+        # 1. Current message
+        text, removed = truncate_text(message, self._chars_left(report))
+        if removed:
+            report['truncated'].append(f"current message ({removed} chars)")
+        report['used'] += len(text) // CHARS_PER_TOKEN + 1
+        
+        # 2. Attachments
+        image_block = None
+        if image is not None:
+            image_tokens = estimate_image_tokens(image.size)
+            if report['used'] + image_tokens <= self.budget_tokens:
+                image_block = image.to_content_block()
+                report['used'] += image_tokens
+            else:
+                report['dropped'].append("screenshot")
+        
+        if page_content:
+            header = "\n\nCurrent page content:\n"
+            available = self._chars_left(report) - len(header)
+            if available < 200:
+                report['dropped'].append("page content")
+            else:
+                page_text, removed = truncate_text(page_content, available)
+                if removed:
+                    report['truncated'].append(f"page content ({removed} chars)")
+                text += header + page_text
+                report['used'] += len(header + page_text) // CHARS_PER_TOKEN
+        
+        user_content = [{"type": "text", "text": text}]
+        if image_block:
+            user_content.append(image_block)
+        
+        # 3. The running summary, pinned ahead of the turns it summarizes
+        turns = list(history or [])
+        summary_block = None
+        if turns and turns[0]['content'] and is_summary_block(turns[0]['content'][0]):
+            first = turns.pop(0)
+            if len(first['content']) > 1:
+                turns.insert(0, {'role': first['role'], 'content': first['content'][1:]})
+            
+            summary_text, removed = truncate_text(first['content'][0]['text'], self._chars_left(report))
+            if removed:
+                report['truncated'].append(f"history summary ({removed} chars)")
+            summary_block = dict(first['content'][0], text=summary_text)
+            report['used'] += estimate_block_tokens(summary_block)
+        
+        # 4./5. Recent turns, then older ones, until the budget runs out
+        kept = []
+        for index in range(len(turns) - 1, -1, -1):
+            turn, removed = self._cap_turn(turns[index], self.max_message_chars)
+            tokens = sum(estimate_block_tokens(block) for block in turn['content'])
+            
+            if report['used'] + tokens > self.budget_tokens:
+                # Cut this turn to half the space left rather than losing it and
+                # everything older; the other half keeps room for the turns before it
+                parts = sum(count_text_parts(block) for block in turns[index]['content'])
+                overhead = BLOCK_OVERHEAD_CHARS * len(turns[index]['content'])
+                limit = (self._chars_left(report) // 2 - overhead) // max(1, parts)
+                if parts and limit >= MIN_TURN_CHARS:
+                    turn, removed = self._cap_turn(turns[index], limit)
+                    tokens = sum(estimate_block_tokens(block) for block in turn['content'])
+            
+            if report['used'] + tokens > self.budget_tokens:
+                report['dropped'].append(f"{index + 1} older turn(s)")
+                break
+            
+            if removed:
+                report['truncated'].append(f"{turn['role']} turn ({removed} chars)")
+            kept.append(turn)
+            report['used'] += tokens
+        kept.reverse()
+        kept = self._trim_start(kept, report)
+        
+        if summary_block is not None:
+            if kept:
+                kept[0] = {'role': 'user', 'content': [summary_block] + kept[0]['content']}
+            else:
+                kept.append({'role': 'user', 'content': [summary_block]})
+        
+        return user_content, kept, report
+    
+    def _chars_left(self, report):
+        """Characters that still fit in the budget, capped per message"""
+        left = (self.budget_tokens - report['used']) * CHARS_PER_TOKEN
+        return max(0, min(self.max_message_chars, left))
+    
+    def _cap_turn(self, turn, max_chars):
+        """Copy a history turn with every text capped at max_chars, returning (turn, characters removed)"""
+        capped = [cap_block(block, max_chars) for block in turn['content']]
+        content = [block for block, _ in capped]
+        return {'role': turn['role'], 'content': content}, sum(removed for _, removed in capped)
+    
+    def _trim_start(self, turns, report):
+        """Make the kept history open with a user turn and no orphaned tool results"""
+        while turns:
+            first = turns[0]
+            if first['role'] == 'user':
+                content = [block for block in first['content'] if block.get('type') != 'tool_result']
+                if len(content) < len(first['content']):
+                    # Their tool_use partners were dropped; keep the tool loop after them
+                    report['dropped'].append("tool results at the cut")
+                    content = content or [{"type": "text", "text": CUT_TOOL_RESULTS_NOTE}]
+                turns[0] = {'role': 'user', 'content': content}
+                break
+            
+            # Its tool_use partner was dropped, or it cannot open the conversation
+            turns.pop(0)
+            report['dropped'].append(f"{first['role']} turn at the cut")
+        
+        return turns
+    
+    @staticmethod
+    def describe(report):
+        """Summarize what a pack dropped or truncated (empty if nothing)"""
+        parts = []
+        if report['dropped']:
+            parts.append("dropped " + ", ".join(report['dropped']))
+        if report['truncated']:
+            parts.append("truncated " + ", ".join(report['truncated']))
+        return "; ".join(parts)
@@ -8,6 +8,7 @@ import time
 import platform
 from config import Config
 from pathlib import Path
+from utils.screenshot import capture_screen
 
 class EnhancedComputerActions:
     """Enhanced computer automation with smart features"""
@@ -18,11 +19,26 @@ class EnhancedComputerActions:
         self.action_history = []
         self.last_screenshot = None
         
+        # Scaling of the screenshot the current action's coordinates refer to
+        self.scaling = None
+        
         # Smart features
         self.smart_delays = True
         self.verify_actions = True
         self.auto_recovery = True
         
+        # Dispatch table: action name -> handler taking the action data
+        self.actions = {
+            "click": self.smart_click,
+            "type": self.smart_type,
+            "scroll": self.smart_scroll,
+            "key": self.smart_key_press,
+            "move": self.smart_move,
+            "screenshot": lambda action_data: self.take_screenshot(),
+            "find_and_click": self.find_and_click,
+            "drag": self.smart_drag
+        }
+        
     def setup_pyautogui(self):
         """Setup PyAutoGUI with optimal settings"""
         try:
@@ -44,12 +60,19 @@ class EnhancedComputerActions:
             print(f"PyAutoGUI setup error: {str(e)}")
             self.available = False
             
-    def execute_action(self, action_data):
-        """Execute a computer action with enhanced error handling"""
+    def execute_action(self, action_data, scaling=None):
+        """Execute a computer action with enhanced error handling
+        
+        scaling is the ScalingContext of the screenshot Claude was looking at;
+        when given, coordinates are mapped from screenshot pixels to the screen.
+        """
         if not self.available:
             return "Computer automation not available"
             
         action_type = action_data.get("action")
+        self.scaling = scaling
+        if scaling:
+            action_data = self.map_to_screen(action_data)
         
         try:
             # Record action
@@ -59,29 +82,39 @@ class EnhancedComputerActions:
             })
             
             # Execute based on action type
-            if action_type == "click":
-                return self.smart_click(action_data)
-            elif action_type == "type":
-                return self.smart_type(action_data)
-            elif action_type == "scroll":
-                return self.smart_scroll(action_data)
-            elif action_type == "key":
-                return self.smart_key_press(action_data)
-            elif action_type == "move":
-                return self.smart_move(action_data)
-            elif action_type == "screenshot":
-                return self.take_screenshot()
-            elif action_type == "find_and_click":
-                return self.find_and_click(action_data)
-            elif action_type == "drag":
-                return self.smart_drag(action_data)
-            else:
+            handler = self.actions.get(action_type)
+            if handler is None:
                 return f"Unknown action: {action_type}"
+            return handler(action_data)
                 
         except pyautogui.FailSafeException:
             return "Action cancelled by failsafe (mouse moved to corner)"
         except Exception as e:
             return f"Action failed: {str(e)}"
+        finally:
+            self.scaling = None
+            
+    def map_to_screen(self, action_data):
+        """Map screenshot coordinates in an action to screen coordinates"""
+        mapped = dict(action_data)
+        
+        for key in ("coordinate", "start", "end"):
+            point = action_data.get(key)
+            if point and len(point) == 2:
+                mapped[key] = list(self.scaling.to_screen(*point))
+        
+        if action_data.get("x") is not None and action_data.get("y") is not None:
+            mapped["x"], mapped["y"] = self.scaling.to_screen(action_data["x"], action_data["y"])
+        
+        return mapped
+    
+    def is_on_screen(self, x, y):
+        """Check coordinates against the captured region or the primary screen"""
+        if self.scaling:
+            return self.scaling.contains(x, y)
+        
+        screen_width, screen_height = pyautogui.size()
+        return 0 <= x <= screen_width and 0 <= y <= screen_height
             
     def smart_click(self, action_data):
         """Smart click with verification and error recovery"""
@@ -90,13 +123,12 @@ class EnhancedComputerActions:
         button = action_data.get("button", "left")
         
         # Validate coordinates
-        screen_width, screen_height = pyautogui.size()
-        if not (0 <= x <= screen_width and 0 <= y <= screen_height):
+        if not self.is_on_screen(x, y):
             return f"Coordinates ({x}, {y}) are outside screen bounds"
         
         # Take screenshot before action if verification enabled
         if self.verify_actions:
-            self.last_screenshot = pyautogui.screenshot()
+            self.last_screenshot = capture_screen()
         
         # Perform click
         if button == "right":
@@ -173,8 +205,7 @@ class EnhancedComputerActions:
         duration = action_data.get("duration", 0.5)
         
         # Validate coordinates
-        screen_width, screen_height = pyautogui.size()
-        if not (0 <= x <= screen_width and 0 <= y <= screen_height):
+        if not self.is_on_screen(x, y):
             return f"Coordinates ({x}, {y}) are outside screen bounds"
         
         # Smooth movement
@@ -190,12 +221,12 @@ class EnhancedComputerActions:
         button = action_data.get("button", "left")
         
         # Validate coordinates
-        screen_width, screen_height = pyautogui.size()
         for x, y in [(start_x, start_y), (end_x, end_y)]:
-            if not (0 <= x <= screen_width and 0 <= y <= screen_height):
+            if not self.is_on_screen(x, y):
                 return f"Coordinates ({x}, {y}) are outside screen bounds"
         
-        # Perform drag
+        # Perform drag from the start point
+        pyautogui.moveTo(start_x, start_y)
         pyautogui.drag(end_x - start_x, end_y - start_y, 
                       duration=duration, button=button)
         
@@ -227,7 +258,7 @@ class EnhancedComputerActions:
     def take_screenshot(self):
         """Take a screenshot and return info"""
         try:
-            screenshot = pyautogui.screenshot()
+            screenshot = capture_screen()
             self.last_screenshot = screenshot
             return f"Screenshot taken: {screenshot.size[0]}x{screenshot.size[1]}"
         except Exception as e:
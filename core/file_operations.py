@@ -8,29 +8,24 @@ class FileOperations:
         self.supported_image_ext = Config.SUPPORTED_IMAGE_EXTENSIONS
         self.binary_ext = Config.BINARY_EXTENSIONS
         
+        # Dispatch table: operation name -> handler taking the operation data
+        self.operations = {
+            "read": lambda data: self.read_file(data.get("file_path")),
+            "write": lambda data: self.write_file(data.get("file_path"), data.get("content", ""), data.get("mode", "w")),
+            "list": lambda data: self.list_directory(data.get("file_path")),
+            "delete": lambda data: self.delete_file(data.get("file_path")),
+            "copy": lambda data: self.copy_file(data.get("file_path"), data.get("dest_path")),
+            "move": lambda data: self.move_file(data.get("file_path"), data.get("dest_path"))
+        }
+        
     def execute_operation(self, operation_data):
         """Execute a file operation"""
         operation = operation_data.get("operation")
-        file_path = operation_data.get("file_path")
+        handler = self.operations.get(operation)
         
-        if operation == "read":
-            return self.read_file(file_path)
-        elif operation == "write":
-            content = operation_data.get("content", "")
-            mode = operation_data.get("mode", "w")
-            return self.write_file(file_path, content, mode)
-        elif operation == "list":
-            return self.list_directory(file_path)
-        elif operation == "delete":
-            return self.delete_file(file_path)
-        elif operation == "copy":
-            dest_path = operation_data.get("dest_path")
-            return self.copy_file(file_path, dest_path)
-        elif operation == "move":
-            dest_path = operation_data.get("dest_path")
-            return self.move_file(file_path, dest_path)
-        else:
+        if handler is None:
             return f"Unknown file operation: {operation}"
+        return handler(operation_data)
     
     def read_file(self, file_path):
         """Read content from a file"""
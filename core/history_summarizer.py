@@ -0,0 +1,85 @@
+"""
+History Summarizer for Claude Computer Use Assistant
+Folds messages evicted from the history window into a running summary
+"""
+
+import json
+from config import Config
+from core.rate_limiter import PRIORITY_BACKGROUND
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running summary of a conversation between a user and an AI "
+    "assistant that controls their computer. Update the existing summary with the "
+    "new messages. Keep the task state: goals, decisions, files and URLs involved, "
+    "results of actions and anything still open. Drop small talk and raw tool "
+    "output. Reply with the updated summary only."
+)
+
+class HistorySummarizer:
+    """Summarize evicted history entries with a low-priority Claude request
+    
+    Runs on a fork of the async client (see ClaudeClient.fork), so its
+    usage and retry stats stay apart from the chat turn's; requests go
+    through the shared rate limiter behind interactive turns
+    (PRIORITY_BACKGROUND).
+    """
+    
+    def __init__(self, claude_client, max_tokens=None):
+        self.claude_client = claude_client
+        self.max_tokens = max_tokens or Config.SUMMARY_MAX_TOKENS
+        
+        # Forked on first use, and again if claude_client is replaced
+        self.client = None
+        self.client_source = None
+    
+    def request_client(self):
+        """Get the summarizer's own fork of claude_client"""
+        if self.client is None or self.client_source is not self.claude_client:
+            self.client = self.claude_client.fork()
+            self.client_source = self.claude_client
+        return self.client
+    
+    async def summarize(self, summary, entries):
+        """Return the summary updated with the given history entries"""
+        messages = [{"role": "user", "content": [{"type": "text", "text": self.build_prompt(summary, entries)}]}]
+        
+        response = await self.request_client().create_message(
+            messages,
+            PRIORITY_BACKGROUND,
+            system=SUMMARY_SYSTEM_PROMPT,
+            tools=None,
+            max_tokens=self.max_tokens
+        )
+        
+        text = "".join(block.text for block in response.content if block.type == "text").strip()
+        if not text:
+            raise ValueError("Empty summary returned")
+        return text
+    
+    def build_prompt(self, summary, entries):
+        """Build the summarization request text"""
+        lines = [f"Existing summary:\n{summary or '(none yet)'}", "", "New messages:"]
+        lines.extend(self.format_entry(entry) for entry in entries)
+        return "\n".join(lines)
+    
+    @staticmethod
+    def format_entry(entry):
+        """Render one history entry as a transcript line"""
+        parts = []
+        
+        for block in entry.get('content') or []:
+            if block.get('type') == 'tool_use':
+                parts.append(f"[called {block.get('name')} {json.dumps(block.get('input'), default=str)[:300]}]")
+            elif block.get('type') == 'tool_result':
+                content = block.get('content')
+                if isinstance(content, list):
+                    content = " ".join(part.get('text', '') for part in content if part.get('type') == 'text')
+                status = "error" if block.get('is_error') else "result"
+                parts.append(f"[{status}: {str(content)[:300]}]")
+        
+        text = entry.get('message', '')
+        if parts and entry.get('sender') == 'Tool':
+            text = " ".join(parts)
+        elif parts:
+            text = f"{text} {' '.join(parts)}"
+        return f"{entry.get('sender', 'Unknown')}: {text[:2000]}"
@@ -0,0 +1,140 @@
+"""
+HTML Parser Backends for Claude Computer Use Assistant
+BeautifulSoup tree parsing and streaming text extraction with lxml or html.parser
+"""
+
+import html.parser
+import importlib.util
+from bs4 import BeautifulSoup
+from config import Config
+
+# Fastest first; html.parser ships with Python and is always available
+BACKENDS = ("lxml", "html.parser")
+
+# Elements whose text is never page content
+SKIPPED_TAGS = frozenset(("script", "style"))
+
+# Characters fed to a streaming parser at a time
+FEED_CHUNK_SIZE = 64 * 1024
+
+def available_backends():
+    """Backends that can be used in this environment, fastest first"""
+    return [name for name in BACKENDS if name == "html.parser" or importlib.util.find_spec(name)]
+
+def resolve_backend(name=None):
+    """Pick the backend to use: the requested one if available, else the fastest"""
+    name = name or Config.HTML_PARSER
+    available = available_backends()
+    if name in available:
+        return name
+    if name not in ("auto", *BACKENDS):
+        print(f"Unknown HTML_PARSER '{name}', using {available[0]}")
+    return available[0]
+
+def parse_html(source, backend=None):
+    """Parse a document into a BeautifulSoup tree"""
+    return BeautifulSoup(source, resolve_backend(backend))
+
+def clean_text(raw_text):
+    """Strip lines and split double-spaced phrases, dropping empty ones"""
+    lines = (line.strip() for line in raw_text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return '\n'.join(chunk for chunk in chunks if chunk)
+
+def extract_text(source, backend=None):
+    """Visible text of a document without building a tree
+    
+    The source is fed to a streaming parser in chunks and only text
+    outside script/style elements is kept. The result is cleaned like
+    WebPage.text.
+    """
+    extractor = text_extractor(backend)
+    for start in range(0, len(source), FEED_CHUNK_SIZE):
+        extractor.feed(source[start:start + FEED_CHUNK_SIZE])
+    return clean_text(extractor.close())
+
+def text_extractor(backend=None):
+    """A streaming text extractor: feed() decoded chunks, close() for the raw text
+    
+    raw_length tells how much text has been collected so far, and text()
+    gives it cleaned, so a caller can stop feeding once it has enough.
+    """
+    if resolve_backend(backend) == "lxml":
+        return LxmlTextExtractor()
+    return StdlibTextExtractor()
+
+class StdlibTextExtractor(html.parser.HTMLParser):
+    """Streaming text extractor on the standard library parser"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.raw_length = 0
+        self.skip_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self.skip_depth += 1
+    
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+    
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.parts.append(data)
+            self.raw_length += len(data)
+    
+    def text(self):
+        """Cleaned text collected so far"""
+        return clean_text("".join(self.parts))
+    
+    def close(self):
+        super().close()
+        return "".join(self.parts)
+
+class TextTarget:
+    """lxml parser target collecting text outside script/style elements"""
+    
+    def __init__(self):
+        self.parts = []
+        self.raw_length = 0
+        self.skip_depth = 0
+    
+    def start(self, tag, attrib):
+        if tag in SKIPPED_TAGS:
+            self.skip_depth += 1
+    
+    def end(self, tag):
+        if tag in SKIPPED_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+    
+    def data(self, data):
+        if not self.skip_depth:
+            self.parts.append(data)
+            self.raw_length += len(data)
+    
+    def close(self):
+        return "".join(self.parts)
+
+class LxmlTextExtractor:
+    """Streaming text extractor on libxml2's HTML parser (no tree is built)"""
+    
+    def __init__(self):
+        from lxml import etree
+        self.target = TextTarget()
+        self.parser = etree.HTMLParser(target=self.target)
+    
+    @property
+    def raw_length(self):
+        return self.target.raw_length
+    
+    def feed(self, data):
+        self.parser.feed(data)
+    
+    def text(self):
+        """Cleaned text collected so far"""
+        return clean_text("".join(self.target.parts))
+    
+    def close(self):
+        return self.parser.close()
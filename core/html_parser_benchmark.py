@@ -0,0 +1,169 @@
+"""
+HTML Parser Benchmark for Claude Computer Use Assistant
+Parse time and peak memory per parser backend over a corpus of saved pages
+
+Usage:
+    python -m core.html_parser_benchmark [--corpus DIR] [--repeat N] [--json PATH]
+
+Without --corpus, synthetic pages of 10 KB to 5 MB are generated once into
+temp/parser_corpus; saved real pages (*.html) can be dropped in there too.
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from config import Config
+from core.html_parser import available_backends, clean_text, extract_text, parse_html
+
+# Sizes of the generated corpus
+CORPUS_SIZES = {"10kb": 10 * 1024, "100kb": 100 * 1024, "1mb": 1024 * 1024, "5mb": 5 * 1024 * 1024}
+
+# tree: full BeautifulSoup parse and text; stream: text only, no tree
+MODES = ("tree", "stream")
+
+def synthetic_page(size):
+    """A page of roughly size bytes with the usual mix of markup"""
+    head = (
+        "<!DOCTYPE html><html><head><title>Benchmark page</title>"
+        "<style>body { font-family: sans-serif; } .nav a { margin: 0 4px; }</style>"
+        "<script>window.analytics = {queue: []}; function track(e) { analytics.queue.push(e); }</script>"
+        "</head><body><div class='nav'>"
+        + "".join(f"<a href='/section/{i}'>Section {i}</a>" for i in range(20))
+        + "</div>"
+    )
+    block = (
+        "<article><h2>Heading {n}</h2>"
+        "<p>Paragraph {n} with <b>bold</b>, <i>italic</i> and a <a href='https://example.com/{n}'>link</a>. "
+        "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt.</p>"
+        "<table><tr><th>Name</th><th>Value</th></tr><tr><td>row {n}</td><td>{n}</td></tr></table>"
+        "<form action='/search'><input name='q{n}'><button name='go'>Go</button></form>"
+        "<script>track('block-{n}');</script></article>\n"
+    )
+    parts = [head]
+    length = len(head)
+    n = 0
+    while length < size:
+        part = block.format(n=n)
+        parts.append(part)
+        length += len(part)
+        n += 1
+    parts.append("</body></html>")
+    return "".join(parts)
+
+def ensure_corpus(directory=None):
+    """Generate the synthetic corpus if the directory has no pages yet"""
+    directory = Path(directory or Config.TEMP_DIR / "parser_corpus")
+    directory.mkdir(parents=True, exist_ok=True)
+    if not any(directory.glob("*.html")):
+        for name, size in CORPUS_SIZES.items():
+            (directory / f"synthetic_{name}.html").write_text(synthetic_page(size), encoding="utf-8")
+    return directory
+
+def run_case(path, backend, mode):
+    """Parse one page once (in the current process) and return the text length"""
+    source = Path(path).read_text(encoding="utf-8", errors="replace")
+    if mode == "stream":
+        return len(extract_text(source, backend))
+    
+    soup = parse_html(source, backend)
+    for element in soup(["script", "style"]):
+        element.decompose()
+    return len(clean_text(soup.get_text()))
+
+def measure_case(path, backend, mode, repeat, results):
+    """Child process: memory of one run, then the best time over repeat runs
+    
+    RSS growth includes native (libxml2) allocations but only shows once
+    a parse exceeds the process's earlier peak; the Python heap peak is
+    exact for Python objects such as the BeautifulSoup tree.
+    """
+    source_size = Path(path).stat().st_size
+    
+    rss_peak = None
+    try:
+        import resource
+        # ru_maxrss is KB on Linux, bytes on macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        run_case(path, backend, mode)
+        rss_peak = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline) * scale
+    except ImportError:
+        pass  # no resource module on Windows
+    
+    tracemalloc.start()
+    run_case(path, backend, mode)
+    heap_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    
+    times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        run_case(path, backend, mode)
+        times.append(time.perf_counter() - start_time)
+    
+    results.put({
+        'page': Path(path).name,
+        'bytes': source_size,
+        'backend': backend,
+        'mode': mode,
+        'best_time': min(times),
+        'rss_peak': rss_peak,
+        'heap_peak': heap_peak
+    })
+
+def benchmark(corpus, repeat=3, backends=None):
+    """Benchmark every page x backend x mode, each in a fresh process"""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    rows = []
+    
+    pages = sorted(Path(corpus).glob("*.html"), key=lambda path: path.stat().st_size)
+    for path in pages:
+        for backend in backends or available_backends():
+            for mode in MODES:
+                process = context.Process(target=measure_case, args=(str(path), backend, mode, repeat, results))
+                process.start()
+                rows.append(results.get())
+                process.join()
+    return rows
+
+def format_report(rows):
+    """Table of the benchmark results"""
+    def megabytes(value):
+        return f"{value / (1024 * 1024):>8.1f}MB" if value is not None else f"{'-':>10}"
+    
+    lines = [f"{'page':<28} {'size':>9} {'backend':<12} {'mode':<7} {'time':>10} {'MB/s':>8} "
+             f"{'rss peak':>10} {'heap peak':>10}"]
+    for row in rows:
+        size = row['bytes'] / (1024 * 1024)
+        lines.append(
+            f"{row['page']:<28} {size:>7.2f}MB {row['backend']:<12} {row['mode']:<7} "
+            f"{row['best_time'] * 1000:>8.1f}ms {size / row['best_time']:>8.1f} "
+            f"{megabytes(row['rss_peak'])} {megabytes(row['heap_peak'])}"
+        )
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends")
+    parser.add_argument("--corpus", help="directory of saved *.html pages (default: generated corpus)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (best is reported)")
+    parser.add_argument("--backend", action="append", choices=available_backends(),
+                        help="backend to benchmark (repeatable, default: all available)")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args()
+    
+    corpus = Path(args.corpus) if args.corpus else ensure_corpus()
+    print(f"Benchmarking {', '.join(args.backend or available_backends())} on {corpus}")
+    rows = benchmark(corpus, args.repeat, args.backend)
+    print(format_report(rows))
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+
+if __name__ == "__main__":
+    main()
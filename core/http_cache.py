@@ -0,0 +1,484 @@
+"""
+HTTP Cache for Claude Computer Use Assistant
+Disk-backed private HTTP cache (RFC 7234) mounted on the web session
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from requests import Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.response import HTTPResponse
+from config import Config
+from core.http_stream import read_until
+
+# Statuses stored (the heuristically cacheable ones worth keeping for page loads)
+CACHEABLE_STATUSES = (200, 203, 301, 308)
+
+# Without explicit freshness, a response with Last-Modified stays fresh for
+# this fraction of its age when fetched (RFC 7234 4.2.2), up to a day
+HEURISTIC_FRACTION = 0.1
+HEURISTIC_MAX_LIFETIME = 24 * 60 * 60
+
+# Headers describing the stored body rather than the resource
+BODY_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+# Bytes read at a time when completing an early-stopped body for the cache
+COMPLETE_CHUNK_SIZE = 64 * 1024
+
+def parse_cache_control(value):
+    """Cache-Control directives as a dict of lowercased name -> value (None for bare directives)"""
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip().strip('"') if argument else None
+    return directives
+
+def parse_seconds(value):
+    """A delta-seconds value, or None when missing or malformed"""
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return None
+
+def parse_http_date(value):
+    """An HTTP date as a timestamp, or None when missing or malformed"""
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+def request_cache_control(request):
+    """Directives of a request, treating Pragma: no-cache as Cache-Control: no-cache"""
+    directives = parse_cache_control(request.headers.get("Cache-Control"))
+    if "no-cache" in request.headers.get("Pragma", "").lower():
+        directives.setdefault("no-cache", None)
+    return directives
+
+class CacheEntry:
+    """Stored response metadata: status, headers, timing and the Vary'd request headers"""
+    
+    def __init__(self, url, status, reason, headers, request_time, response_time, vary=None, size=0):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = CaseInsensitiveDict(headers)
+        self.request_time = request_time
+        self.response_time = response_time
+        self.vary = vary or {}
+        self.size = size
+    
+    @classmethod
+    def from_response(cls, request, response, request_time, response_time):
+        headers = {name: value for name, value in response.headers.items() if name.lower() not in BODY_HEADERS}
+        vary = {
+            name.strip().lower(): request.headers.get(name.strip())
+            for name in response.headers.get("Vary", "").split(",") if name.strip()
+        }
+        return cls(request.url, response.status_code, response.reason, headers,
+                   request_time, response_time, vary)
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['url'], data['status'], data['reason'], data['headers'],
+                   data['request_time'], data['response_time'], data.get('vary'), data.get('size', 0))
+    
+    def to_dict(self):
+        return {
+            'url': self.url,
+            'status': self.status,
+            'reason': self.reason,
+            'headers': dict(self.headers),
+            'request_time': self.request_time,
+            'response_time': self.response_time,
+            'vary': self.vary,
+            'size': self.size
+        }
+    
+    @property
+    def cache_control(self):
+        return parse_cache_control(self.headers.get("Cache-Control"))
+    
+    def freshness_lifetime(self):
+        """Seconds the response is fresh for: max-age, else Expires - Date, else the Last-Modified heuristic"""
+        directives = self.cache_control
+        if "no-cache" in directives:
+            return 0
+        max_age = parse_seconds(directives.get("max-age"))
+        if max_age is not None:
+            return max_age
+        
+        date = parse_http_date(self.headers.get("Date")) or self.response_time
+        if "Expires" in self.headers:
+            # A malformed Expires (often "0" or "-1") means already expired
+            expires = parse_http_date(self.headers["Expires"])
+            return max(0, expires - date) if expires is not None else 0
+        
+        last_modified = parse_http_date(self.headers.get("Last-Modified"))
+        if last_modified is not None and date > last_modified:
+            return min(HEURISTIC_MAX_LIFETIME, (date - last_modified) * HEURISTIC_FRACTION)
+        return 0
+    
+    def age(self, now=None):
+        """Current age in seconds (RFC 7234 4.2.3)"""
+        now = time.time() if now is None else now
+        date = parse_http_date(self.headers.get("Date")) or self.response_time
+        apparent_age = max(0, self.response_time - date)
+        response_delay = self.response_time - self.request_time
+        corrected_age = max(apparent_age, (parse_seconds(self.headers.get("Age")) or 0) + response_delay)
+        return corrected_age + (now - self.response_time)
+    
+    def is_fresh(self, request_directives=None, now=None):
+        """Whether the entry can be served without contacting the server"""
+        request_directives = request_directives or {}
+        if "no-cache" in request_directives:
+            return False
+        lifetime = self.freshness_lifetime()
+        max_age = parse_seconds(request_directives.get("max-age"))
+        if max_age is not None:
+            lifetime = min(lifetime, max_age)
+        return self.age(now) < lifetime
+    
+    def matches(self, request):
+        """Whether a request agrees with the stored one on every Vary header"""
+        return all(request.headers.get(name) == value for name, value in self.vary.items())
+    
+    def validators(self):
+        """Conditional request headers for revalidating this entry"""
+        headers = {}
+        if "ETag" in self.headers:
+            headers["If-None-Match"] = self.headers["ETag"]
+        if "Last-Modified" in self.headers:
+            headers["If-Modified-Since"] = self.headers["Last-Modified"]
+        return headers
+    
+    def refresh(self, not_modified, request_time, response_time):
+        """Take the headers of a 304 response and restart the age"""
+        for name, value in not_modified.headers.items():
+            if name.lower() not in BODY_HEADERS:
+                self.headers[name] = value
+        self.request_time = request_time
+        self.response_time = response_time
+
+class HttpCache:
+    """Response bodies and metadata on disk, keyed by URL
+    
+    Fresh entries are served without a request. Stale entries with an
+    ETag or Last-Modified are revalidated with a conditional request and
+    served from disk on a 304. Bodies are stored decoded, only once they
+    have been read to the end, and the least recently used entries are
+    evicted beyond max_bytes.
+    """
+    
+    def __init__(self, directory=None, max_bytes=None, max_entry_bytes=None, enabled=None):
+        self.directory = Path(directory or Config.HTTP_CACHE_DIR)
+        self.max_bytes = max_bytes or Config.HTTP_CACHE_MAX_BYTES
+        self.max_entry_bytes = max_entry_bytes or Config.WEB_MAX_DOWNLOAD_BYTES
+        self.enabled = Config.HTTP_CACHE_ENABLED if enabled is None else enabled
+        self.lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stored = 0
+        self.bytes_served = 0
+        
+        if self.enabled:
+            self.directory.mkdir(parents=True, exist_ok=True)
+    
+    def key(self, url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+    
+    def is_cacheable_request(self, request):
+        """Plain GETs only: no-store, credentials or the caller's own conditionals bypass the cache"""
+        if not self.enabled or request.method != "GET":
+            return False
+        if "no-store" in request_cache_control(request):
+            return False
+        return not any(name in request.headers for name in ("Authorization", "If-None-Match", "If-Modified-Since"))
+    
+    def is_storable(self, request, response):
+        """Whether a response may be stored and could ever be reused"""
+        if response.status_code not in CACHEABLE_STATUSES:
+            return False
+        if "no-store" in parse_cache_control(response.headers.get("Cache-Control")):
+            return False
+        if response.headers.get("Vary", "").strip() == "*":
+            return False
+        # A response that is neither fresh for a while nor revalidatable is never reused
+        return any(name in response.headers for name in ("Cache-Control", "Expires", "ETag", "Last-Modified"))
+    
+    def lookup(self, request):
+        """The stored entry for a request, or None"""
+        path = self.directory / f"{self.key(request.url)}.json"
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = CacheEntry.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+        return entry if entry.matches(request) else None
+    
+    def read_body(self, entry):
+        """The stored body, or None when it is missing or incomplete"""
+        path = self.directory / f"{self.key(entry.url)}.body"
+        try:
+            body = path.read_bytes()
+            os.utime(path)  # mark as recently used
+        except OSError:
+            return None
+        return body if len(body) == entry.size else None
+    
+    def store(self, entry, body):
+        """Write an entry and its complete body, then evict down to max_bytes"""
+        entry.size = len(body)
+        key = self.key(entry.url)
+        suffix = f"{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            body_tmp = self.directory / f"{key}.body.{suffix}"
+            meta_tmp = self.directory / f"{key}.json.{suffix}"
+            body_tmp.write_bytes(body)
+            with open(meta_tmp, 'w', encoding='utf-8') as f:
+                json.dump(entry.to_dict(), f)
+            with self.lock:
+                os.replace(body_tmp, self.directory / f"{key}.body")
+                os.replace(meta_tmp, self.directory / f"{key}.json")
+                self.stored += 1
+            self.evict()
+        except OSError as e:
+            print(f"Error writing HTTP cache: {str(e)}")
+    
+    def update(self, entry):
+        """Rewrite the metadata of a revalidated entry"""
+        path = self.directory / f"{self.key(entry.url)}.json"
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(entry.to_dict(), f)
+        except OSError as e:
+            print(f"Error writing HTTP cache: {str(e)}")
+    
+    def evict(self):
+        """Delete the least recently used entries until the bodies fit in max_bytes"""
+        with self.lock:
+            bodies = []
+            for path in self.directory.glob("*.body"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                bodies.append((stat.st_mtime, stat.st_size, path))
+            
+            total = sum(size for _, size, _ in bodies)
+            for _, size, path in sorted(bodies, key=lambda body: body[0]):
+                if total <= self.max_bytes:
+                    break
+                path.with_suffix(".json").unlink(missing_ok=True)
+                path.unlink(missing_ok=True)
+                total -= size
+    
+    def clear(self):
+        """Delete every cached response"""
+        for pattern in ("*.json", "*.body", "*.tmp"):
+            for path in self.directory.glob(pattern):
+                path.unlink(missing_ok=True)
+    
+    def record(self, outcome, size=0):
+        with self.lock:
+            if outcome == "hit":
+                self.hits += 1
+            elif outcome == "revalidated":
+                self.revalidated += 1
+            else:
+                self.misses += 1
+            self.bytes_served += size
+    
+    def stats(self):
+        """Get hit, revalidation and miss counts"""
+        with self.lock:
+            lookups = self.hits + self.revalidated + self.misses
+            return {
+                'hits': self.hits,
+                'revalidated': self.revalidated,
+                'misses': self.misses,
+                'stored': self.stored,
+                'hit_rate': (self.hits + self.revalidated) / lookups if lookups else 0.0,
+                'bytes_served': self.bytes_served
+            }
+
+class CachingStream:
+    """A response's raw stream that copies what is read into the cache
+    
+    The body is stored once the stream is read to the end. When the reader
+    stops early and closes the response, the rest of the body is read to
+    finish it for the cache only if Content-Length shows at most
+    complete_bytes are left, and for at most HTTP_CACHE_COMPLETE_SECONDS
+    and until deadline (a time.perf_counter() value the reader may lower to
+    its own); otherwise the entry is dropped.
+    """
+    
+    def __init__(self, raw, cache, entry, content_length=None, complete_bytes=None):
+        self.raw = raw
+        self.cache = cache
+        self.entry = entry
+        self.content_length = content_length
+        self.complete_bytes = Config.HTTP_CACHE_COMPLETE_BYTES if complete_bytes is None else complete_bytes
+        self.deadline = time.perf_counter() + Config.REQUEST_TIMEOUT
+        self.body = bytearray()
+        self.finished = False
+    
+    def copy(self, chunk):
+        if self.entry is None:
+            return
+        self.body += chunk
+        if len(self.body) > self.cache.max_entry_bytes:
+            self.entry = None
+            self.body = bytearray()
+    
+    def finish(self):
+        if self.entry is not None and not self.finished:
+            self.finished = True
+            self.cache.store(self.entry, bytes(self.body))
+    
+    def stream(self, amt=2**16, decode_content=None):
+        # Bodies are stored decoded; an encoded read can't be cached
+        if not decode_content:
+            self.entry = None
+        for chunk in self.raw.stream(amt, decode_content=decode_content):
+            self.copy(chunk)
+            yield chunk
+        self.finish()
+    
+    def read1(self, amt=None, decode_content=None):
+        if not decode_content:
+            self.entry = None
+        chunk = self.raw.read1(amt, decode_content=decode_content)
+        if chunk:
+            self.copy(chunk)
+        elif amt != 0:
+            self.finish()
+        return chunk
+    
+    def read(self, *args, **kwargs):
+        self.entry = None
+        return self.raw.read(*args, **kwargs)
+    
+    def can_complete(self):
+        """Whether the unread rest of the body is known to fit in complete_bytes"""
+        if self.entry is None or self.finished or self.content_length is None:
+            return False
+        # tell() counts bytes as sent, like Content-Length
+        return self.content_length - self.raw.tell() <= self.complete_bytes
+    
+    def close(self):
+        if self.can_complete():
+            deadline = min(self.deadline, time.perf_counter() + Config.HTTP_CACHE_COMPLETE_SECONDS)
+            try:
+                while self.entry is not None:
+                    chunk = read_until(self.raw, deadline, amt=COMPLETE_CHUNK_SIZE)
+                    if chunk is None:
+                        break
+                    if not chunk:
+                        self.finish()
+                        break
+                    self.copy(chunk)
+            except Exception:
+                pass  # the page was already delivered; it just isn't cached
+        self.entry = None
+        self.raw.close()
+    
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+class CachingAdapter(HTTPAdapter):
+    """Transport adapter that answers from an HttpCache where it can
+    
+    Every response gets a cache_status: "hit" (served from disk),
+    "revalidated" (a 304, served from disk), "miss" or "bypass".
+    """
+    
+    def __init__(self, cache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+    
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        cache = self.cache
+        if not cache.is_cacheable_request(request):
+            response = super().send(request, stream, timeout, verify, cert, proxies)
+            response.cache_status = "bypass"
+            return response
+        
+        directives = request_cache_control(request)
+        entry = cache.lookup(request)
+        if entry is not None and entry.is_fresh(directives):
+            response = self.cached_response(request, entry, "hit")
+            if response is not None:
+                return response
+            entry = None
+        
+        sent = request
+        if entry is not None and entry.validators():
+            sent = request.copy()
+            sent.headers.update(entry.validators())
+        
+        request_time = time.time()
+        response = super().send(sent, stream, timeout, verify, cert, proxies)
+        response_time = time.time()
+        response.request = request
+        
+        if entry is not None and response.status_code == 304:
+            entry.refresh(response, request_time, response_time)
+            cached = self.cached_response(request, entry, "revalidated")
+            if cached is not None:
+                response.close()
+                cache.update(entry)
+                return cached
+            # The body went missing since the lookup; fetch it again
+            response.close()
+            request_time = time.time()
+            response = super().send(request, stream, timeout, verify, cert, proxies)
+            response_time = time.time()
+        
+        cache.record("miss")
+        if cache.is_storable(request, response):
+            entry = CacheEntry.from_response(request, response, request_time, response_time)
+            content_length = parse_seconds(response.headers.get("Content-Length"))
+            response.raw = CachingStream(response.raw, cache, entry, content_length)
+        response.cache_status = "miss"
+        return response
+    
+    def cached_response(self, request, entry, cache_status):
+        """A response rebuilt from a stored entry, or None if its body is gone"""
+        body = self.cache.read_body(entry)
+        if body is None:
+            return None
+        self.cache.record(cache_status, len(body))
+        
+        response = Response()
+        response.status_code = entry.status
+        response.reason = entry.reason
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.headers["Content-Length"] = str(len(body))
+        response.encoding = get_encoding_from_headers(response.headers)
+        # Stored bodies are decoded, so the stream gets no Content-Encoding
+        response.raw = HTTPResponse(body=io.BytesIO(body), headers={"Content-Length": str(len(body))},
+                                    status=entry.status, preload_content=False)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.cache_status = cache_status
+        return response
+
+def install_http_cache(session, cache=None):
+    """Mount a CachingAdapter for http and https on a session and return its cache"""
+    cache = cache or HttpCache()
+    adapter = CachingAdapter(cache)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return cache
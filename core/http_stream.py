@@ -0,0 +1,51 @@
+"""
+HTTP Stream Reads for Claude Computer Use Assistant
+Deadline-bounded reads from the raw stream of a streamed requests response
+"""
+
+import time
+from requests.exceptions import ChunkedEncodingError, ConnectionError, ContentDecodingError, SSLError
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError
+from urllib3.exceptions import SSLError as Urllib3SSLError
+
+# Bytes asked for per read; a read returns what has arrived, up to this
+READ_SIZE = 16 * 1024
+
+def set_read_timeout(raw, seconds):
+    """Bound the next socket waits of a response stream; False if it has no open socket"""
+    sock = getattr(getattr(raw, 'connection', None), 'sock', None)
+    if sock is None:
+        return False
+    sock.settimeout(max(seconds, 0.001))
+    return True
+
+def read_until(raw, deadline=None, timeout=None, amt=READ_SIZE):
+    """Read the next piece of a response body, giving up at deadline
+    
+    raw is a urllib3 response (or a wrapper with the same read1); deadline
+    is a time.perf_counter() value and timeout bounds the wait for any
+    data. Returns what has arrived, up to amt decoded bytes, b"" at the
+    end of the body, or None once the deadline has passed. A broken
+    stream raises the requests exception Response.iter_content would.
+    """
+    wait = timeout
+    if deadline is not None:
+        left = deadline - time.perf_counter()
+        if left <= 0:
+            return None
+        wait = left if timeout is None else min(left, timeout)
+    if wait is not None:
+        set_read_timeout(raw, wait)
+    
+    try:
+        return raw.read1(amt, decode_content=True)
+    except ReadTimeoutError as e:
+        if deadline is not None and time.perf_counter() >= deadline - 0.05:
+            return None
+        raise ConnectionError(e)
+    except ProtocolError as e:
+        raise ChunkedEncodingError(e)
+    except DecodeError as e:
+        raise ContentDecodingError(e)
+    except Urllib3SSLError as e:
+        raise SSLError(e)
@@ -0,0 +1,144 @@
+"""
+Client-side Rate Limiting for Claude Computer Use Assistant
+Token buckets for requests and tokens per minute with a priority queue
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from config import Config
+
+# Lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+class TokenBucket:
+    """A bucket refilled continuously up to a per-minute capacity"""
+    
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+        
+    def refill(self, now):
+        """Add the tokens accrued since the last update"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        
+    def wait_time(self, amount):
+        """Seconds until amount tokens are available (0 if available now)"""
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.tokens) / self.rate)
+    
+    def consume(self, amount):
+        """Take tokens; the balance may go negative when usage is reported late"""
+        self.tokens -= amount
+
+class RateLimiter:
+    """Limit requests and input/output tokens per minute
+    
+    Callers block in acquire() until the buckets allow their request.
+    Waiting callers are served strictly by priority, then arrival order,
+    so interactive chat overtakes queued background work.
+    """
+    
+    def __init__(self, requests_per_minute=None, input_tokens_per_minute=None, output_tokens_per_minute=None):
+        limits = {
+            'requests': Config.RATE_LIMIT_REQUESTS if requests_per_minute is None else requests_per_minute,
+            'input_tokens': Config.RATE_LIMIT_INPUT_TOKENS if input_tokens_per_minute is None else input_tokens_per_minute,
+            'output_tokens': Config.RATE_LIMIT_OUTPUT_TOKENS if output_tokens_per_minute is None else output_tokens_per_minute,
+        }
+        # A limit of 0 disables that bucket
+        self.buckets = {name: TokenBucket(limit) for name, limit in limits.items() if limit}
+        
+        self.condition = threading.Condition()
+        self.queue = []
+        self.counter = itertools.count()
+        
+        # Metrics
+        self.total_requests = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_wait = 0.0
+        
+    def acquire(self, priority=PRIORITY_INTERACTIVE, input_tokens=0, timeout=None, cancel_event=None):
+        """Block until a request may be sent, returning the seconds waited
+        
+        Setting cancel_event (and calling wake()) abandons the wait.
+        """
+        start_time = time.monotonic()
+        ticket = (priority, next(self.counter))
+        
+        with self.condition:
+            heapq.heappush(self.queue, ticket)
+            try:
+                while True:
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise InterruptedError("Rate limit wait cancelled")
+                    
+                    wait = None
+                    if self.queue[0] == ticket:
+                        wait = self._wait_time(input_tokens)
+                        if wait <= 0:
+                            self._consume('requests', 1)
+                            self._consume('input_tokens', input_tokens)
+                            break
+                    
+                    if timeout is not None:
+                        remaining = timeout - (time.monotonic() - start_time)
+                        if remaining <= 0:
+                            raise TimeoutError("Timed out waiting for rate limit capacity")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    
+                    self.condition.wait(wait)
+            finally:
+                self.queue.remove(ticket)
+                heapq.heapify(self.queue)
+                self.condition.notify_all()
+            
+            waited = time.monotonic() - start_time
+            self.total_requests += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            self.last_wait = waited
+        
+        return waited
+    
+    def wake(self):
+        """Wake all waiting requests so they re-check for cancellation"""
+        with self.condition:
+            self.condition.notify_all()
+            
+    def record_usage(self, input_tokens=0, output_tokens=0, estimated_input_tokens=0):
+        """Reconcile the buckets with the usage reported by the API"""
+        with self.condition:
+            self._consume('input_tokens', input_tokens - estimated_input_tokens)
+            self._consume('output_tokens', output_tokens)
+            self.condition.notify_all()
+            
+    def metrics(self):
+        """Get queue depth and wait time statistics"""
+        with self.condition:
+            return {
+                'queue_depth': len(self.queue),
+                'total_requests': self.total_requests,
+                'last_wait': self.last_wait,
+                'average_wait': self.total_wait / self.total_requests if self.total_requests else 0.0,
+                'max_wait': self.max_wait
+            }
+    
+    def _wait_time(self, input_tokens):
+        """Seconds until every bucket can cover the next request"""
+        now = time.monotonic()
+        for bucket in self.buckets.values():
+            bucket.refill(now)
+        
+        needs = {'requests': 1, 'input_tokens': input_tokens, 'output_tokens': 0}
+        return max((bucket.wait_time(needs[name]) for name, bucket in self.buckets.items()), default=0.0)
+    
+    def _consume(self, name, amount):
+        """Consume from a bucket if that limit is enabled"""
+        if name in self.buckets:
+            self.buckets[name].consume(amount)
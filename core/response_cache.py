@@ -0,0 +1,144 @@
+"""
+Response Cache for Claude Computer Use Assistant
+Disk-backed cache of responses to byte-identical deterministic requests
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from anthropic.types import Message
+from config import Config
+
+# Request parameters that ask for sampling variety
+SAMPLING_PARAMS = ("top_p", "top_k")
+
+def sampling_param(params, name):
+    """A sampling parameter of a request, whether top-level or sent through extra_body"""
+    if name in params:
+        return params[name]
+    return (params.get('extra_body') or {}).get(name)
+
+def strip_cache_control(value):
+    """Copy a request value without cache_control markers (they don't change output)"""
+    if isinstance(value, dict):
+        return {key: strip_cache_control(item) for key, item in value.items() if key != "cache_control"}
+    if isinstance(value, list):
+        return [strip_cache_control(item) for item in value]
+    return value
+
+class ResponseCache:
+    """Responses keyed by a hash of model, system, tools and messages
+    
+    Images are part of the messages, so an unchanged screenshot hits and a
+    changed one misses. Only requests that explicitly set temperature 0
+    are cached (the API default is 1.0); any others, and those setting
+    top_p or top_k, bypass the cache.
+    Entries expire after ttl seconds and the least recently used ones are
+    evicted beyond max_entries.
+    """
+    
+    def __init__(self, directory=None, ttl=None, max_entries=None, enabled=None):
+        self.directory = Path(directory or Config.RESPONSE_CACHE_DIR)
+        self.ttl = Config.RESPONSE_CACHE_TTL if ttl is None else ttl
+        self.max_entries = max_entries or Config.RESPONSE_CACHE_MAX_ENTRIES
+        self.enabled = Config.RESPONSE_CACHE_ENABLED if enabled is None else enabled
+        self.lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.saved_latency = 0.0
+        
+        if self.enabled:
+            self.directory.mkdir(parents=True, exist_ok=True)
+    
+    def is_cacheable(self, params):
+        """Check whether a request is deterministic enough to cache"""
+        if not self.enabled:
+            return False
+        if sampling_param(params, 'temperature') != 0:
+            return False
+        return all(sampling_param(params, name) is None for name in SAMPLING_PARAMS)
+    
+    def key(self, params):
+        """Hash the parts of a request that determine the response"""
+        relevant = {
+            name: strip_cache_control(params.get(name))
+            for name in ('model', 'max_tokens', 'system', 'tools', 'tool_choice', 'messages', 'stop_sequences')
+        }
+        canonical = json.dumps(relevant, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    
+    def get(self, params):
+        """Get the cached response for a request, or None on a miss/bypass"""
+        if not self.enabled:
+            return None
+        if not self.is_cacheable(params):
+            with self.lock:
+                self.bypassed += 1
+            return None
+        
+        path = self.directory / f"{self.key(params)}.json"
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            
+            if time.time() - entry['created'] > self.ttl:
+                path.unlink(missing_ok=True)
+                raise FileNotFoundError(path)
+            
+            response = Message.model_validate_json(entry['response'])
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError, KeyError):
+            with self.lock:
+                self.misses += 1
+            return None
+        
+        with self.lock:
+            self.hits += 1
+            self.saved_latency += entry.get('latency', 0.0)
+        return response
+    
+    def put(self, params, response, latency):
+        """Store a response that took latency seconds to produce"""
+        if not self.is_cacheable(params) or getattr(response, 'stop_reason', None) == "max_tokens":
+            return
+        
+        entry = {
+            'created': time.time(),
+            'latency': latency,
+            'response': response.model_dump_json()
+        }
+        try:
+            path = self.directory / f"{self.key(params)}.json"
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            self.evict()
+        except OSError as e:
+            print(f"Error writing response cache: {str(e)}")
+    
+    def evict(self):
+        """Delete the least recently used entries beyond max_entries"""
+        entries = sorted(self.directory.glob("*.json"), key=lambda path: path.stat().st_mtime)
+        for path in entries[:max(0, len(entries) - self.max_entries)]:
+            path.unlink(missing_ok=True)
+    
+    def clear(self):
+        """Delete every cached response"""
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+    
+    def stats(self):
+        """Get hit rate and saved latency"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'bypassed': self.bypassed,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'saved_latency': self.saved_latency
+            }
@@ -0,0 +1,201 @@
+"""
+Retry Policy for Claude Computer Use Assistant
+Exponential backoff with full jitter and retry-after support for API calls
+"""
+
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import anthropic
+from config import Config
+
+# Request timeouts, conflicts, rate limits, server errors and overload
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+RETRYABLE_ERROR_TYPES = {'rate_limit_error', 'overloaded_error', 'api_error'}
+
+class RetryPolicy:
+    """Retry transient Claude API failures within an attempt and time budget"""
+    
+    def __init__(self, max_attempts=None, deadline=None, base_delay=None, max_delay=None):
+        self.max_attempts = max_attempts or Config.API_MAX_ATTEMPTS
+        self.deadline = deadline or Config.API_RETRY_DEADLINE
+        self.base_delay = base_delay or Config.API_RETRY_BASE_DELAY
+        self.max_delay = max_delay or Config.API_RETRY_MAX_DELAY
+        
+        # Per-attempt records of the most recently finished call; each call
+        # keeps its own list so concurrent calls cannot mix their attempts
+        self.last_attempts = []
+        
+    def call(self, func):
+        """Call func(), retrying retryable errors; returns its result"""
+        start_time = time.monotonic()
+        attempts = []
+        
+        try:
+            while True:
+                attempt_start = time.monotonic()
+                try:
+                    result = func()
+                    self._record(attempts, attempt_start, None)
+                    return result
+                except Exception as e:
+                    self._record(attempts, attempt_start, e)
+                    delay = self._retry_delay(attempts, e, start_time)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+        finally:
+            self.last_attempts = attempts
+    
+    def call_stream(self, func):
+        """Iterate the generator returned by func(), retrying until it yields
+        
+        Once the first item has been yielded the output is visible to the
+        caller, so later failures are raised instead of retried.
+        """
+        start_time = time.monotonic()
+        attempts = []
+        
+        try:
+            while True:
+                attempt_start = time.monotonic()
+                yielded = False
+                try:
+                    for item in func():
+                        if not yielded:
+                            yielded = True
+                            self._record(attempts, attempt_start, None)
+                        yield item
+                    if not yielded:
+                        self._record(attempts, attempt_start, None)
+                    return
+                except Exception as e:
+                    if yielded:
+                        raise
+                    self._record(attempts, attempt_start, e)
+                    delay = self._retry_delay(attempts, e, start_time)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+        finally:
+            self.last_attempts = attempts
+    
+    async def call_async(self, func):
+        """Await func(), retrying retryable errors (async variant of call)"""
+        start_time = time.monotonic()
+        attempts = []
+        
+        try:
+            while True:
+                attempt_start = time.monotonic()
+                try:
+                    result = await func()
+                    self._record(attempts, attempt_start, None)
+                    return result
+                except Exception as e:
+                    self._record(attempts, attempt_start, e)
+                    delay = self._retry_delay(attempts, e, start_time)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+        finally:
+            self.last_attempts = attempts
+    
+    async def call_stream_async(self, func):
+        """Iterate the async generator returned by func() (see call_stream)"""
+        start_time = time.monotonic()
+        attempts = []
+        
+        try:
+            while True:
+                attempt_start = time.monotonic()
+                yielded = False
+                try:
+                    async for item in func():
+                        if not yielded:
+                            yielded = True
+                            self._record(attempts, attempt_start, None)
+                        yield item
+                    if not yielded:
+                        self._record(attempts, attempt_start, None)
+                    return
+                except Exception as e:
+                    if yielded:
+                        raise
+                    self._record(attempts, attempt_start, e)
+                    delay = self._retry_delay(attempts, e, start_time)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+        finally:
+            self.last_attempts = attempts
+    
+    def is_retryable(self, error):
+        """Classify an error as transient (retryable) or fatal"""
+        if isinstance(error, anthropic.APIConnectionError):
+            return True  # includes timeouts and connection resets
+        
+        if isinstance(error, anthropic.APIStatusError):
+            if error.status_code in RETRYABLE_STATUS_CODES:
+                return True
+            # Errors delivered inside a stream arrive with a 200 status
+            body = error.body if isinstance(error.body, dict) else {}
+            return body.get('error', {}).get('type') in RETRYABLE_ERROR_TYPES
+        
+        return False
+    
+    def retry_after(self, error):
+        """Get the server requested delay in seconds, if any"""
+        response = getattr(error, 'response', None)
+        if response is None:
+            return None
+        
+        headers = response.headers
+        try:
+            if headers.get('retry-after-ms'):
+                return float(headers['retry-after-ms']) / 1000
+            if headers.get('retry-after'):
+                value = headers['retry-after']
+                try:
+                    return float(value)
+                except ValueError:
+                    retry_at = parsedate_to_datetime(value)
+                    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            pass
+        return None
+    
+    def backoff(self, attempt):
+        """Full-jitter exponential backoff for the given attempt number"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+    
+    def _retry_delay(self, attempts, error, start_time):
+        """Get the delay before the next attempt, or None to give up"""
+        attempt = len(attempts)
+        if not self.is_retryable(error) or attempt >= self.max_attempts:
+            return None
+        
+        delay = self.retry_after(error)
+        if delay is None:
+            delay = self.backoff(attempt)
+        
+        if time.monotonic() - start_time + delay > self.deadline:
+            return None
+        
+        print(f"Retrying Claude API request in {delay:.1f}s (attempt {attempt + 1}/{self.max_attempts})")
+        return delay
+    
+    def _record(self, attempts, attempt_start, error):
+        """Record the outcome and latency of one attempt in the call's list"""
+        latency = time.monotonic() - attempt_start
+        attempts.append({
+            'attempt': len(attempts) + 1,
+            'latency': latency,
+            'error': f"{type(error).__name__}: {error}" if error else None,
+            'retryable': self.is_retryable(error) if error else None
+        })
+        if error:
+            print(f"Claude API attempt {len(attempts)} failed after {latency:.2f}s: "
+                  f"{type(error).__name__}")
@@ -0,0 +1,329 @@
+"""
+Tool Registry for Claude Computer Use Assistant
+Declares every tool once: schema, handler, side-effect class and timeout
+"""
+
+import json
+from config import Config
+
+# Side-effect classes (only SIDE_EFFECT_READ calls may run concurrently)
+SIDE_EFFECT_READ = "read"        # independent reads (file reads, page fetches)
+SIDE_EFFECT_STATE = "state"      # reads or changes a tool's session state
+SIDE_EFFECT_WRITE = "write"      # changes files on disk
+SIDE_EFFECT_DESKTOP = "desktop"  # moves the mouse or presses keys
+
+JSON_TYPES = {
+    "object": dict,
+    "array": (list, tuple),
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool
+}
+
+class ToolInputError(ValueError):
+    """Raised when a tool call's input does not match the tool's schema"""
+
+def compile_validator(schema, path="input"):
+    """Compile a JSON schema subset into a validation function
+    
+    Supports type, enum, properties, required, items, minItems and
+    maxItems - everything the tool schemas use. The returned function
+    raises ToolInputError on the first mismatch.
+    """
+    checks = []
+    
+    expected_type = schema.get("type")
+    if expected_type:
+        python_type = JSON_TYPES[expected_type]
+        
+        def check_type(value):
+            # bool is an int subclass but never a valid number
+            if not isinstance(value, python_type) or (isinstance(value, bool) and expected_type != "boolean"):
+                raise ToolInputError(f"{path} must be of type {expected_type}")
+        checks.append(check_type)
+    
+    if "enum" in schema:
+        allowed = frozenset(schema["enum"])
+        
+        def check_enum(value):
+            if value not in allowed:
+                raise ToolInputError(f"{path} must be one of: {', '.join(map(str, schema['enum']))}")
+        checks.append(check_enum)
+    
+    if "required" in schema:
+        required = tuple(schema["required"])
+        
+        def check_required(value):
+            for key in required:
+                if key not in value:
+                    raise ToolInputError(f"{path}.{key} is required")
+        checks.append(check_required)
+    
+    if "properties" in schema:
+        properties = {
+            key: compile_validator(subschema, f"{path}.{key}")
+            for key, subschema in schema["properties"].items()
+        }
+        
+        def check_properties(value):
+            for key, validate in properties.items():
+                if key in value:
+                    validate(value[key])
+        checks.append(check_properties)
+    
+    if "items" in schema:
+        validate_item = compile_validator(schema["items"], f"{path}[]")
+        
+        def check_items(value):
+            for item in value:
+                validate_item(item)
+        checks.append(check_items)
+    
+    if "minItems" in schema or "maxItems" in schema:
+        min_items = schema.get("minItems", 0)
+        max_items = schema.get("maxItems")
+        
+        def check_length(value):
+            if len(value) < min_items or (max_items is not None and len(value) > max_items):
+                raise ToolInputError(f"{path} has the wrong number of items")
+        checks.append(check_length)
+    
+    def validate(value):
+        for check in checks:
+            check(value)
+    return validate
+
+class ToolSpec:
+    """Declaration of one tool
+    
+    operation_key names the input field that selects an operation (e.g.
+    "action"). requires maps operations to the extra fields they need and
+    operation_effects overrides side_effect for individual operations.
+    """
+    
+    def __init__(self, name, description, input_schema, side_effect=SIDE_EFFECT_STATE,
+                 timeout=30, operation_key=None, requires=None, operation_effects=None,
+                 screen_coordinates=False):
+        self.name = name
+        self.description = description
+        self.input_schema = input_schema
+        self.side_effect = side_effect
+        self.timeout = timeout
+        self.operation_key = operation_key
+        self.requires = {operation: tuple(fields) for operation, fields in (requires or {}).items()}
+        self.operation_effects = operation_effects or {}
+        self.screen_coordinates = screen_coordinates
+        self.handler = None
+        
+        # Compiled once; every call reuses it
+        self.validator = compile_validator(input_schema)
+    
+    def definition(self):
+        """Get the tool definition sent to Claude"""
+        return {
+            "name": self.name,
+            "description": self.description,
+            "input_schema": self.input_schema
+        }
+    
+    def validate(self, tool_input):
+        """Raise ToolInputError if tool_input is not acceptable"""
+        self.validator(tool_input)
+        
+        if self.operation_key:
+            operation = tool_input.get(self.operation_key)
+            for field in self.requires.get(operation, ()):
+                if tool_input.get(field) in (None, ""):
+                    raise ToolInputError(f"input.{field} is required for {self.operation_key} '{operation}'")
+    
+    def effect_of(self, tool_input):
+        """Get the side-effect class of one call"""
+        if self.operation_key:
+            return self.operation_effects.get(tool_input.get(self.operation_key), self.side_effect)
+        return self.side_effect
+
+class ToolRegistry:
+    """Registered tools, their handlers and the definitions sent to Claude"""
+    
+    def __init__(self):
+        self.specs = {}
+        self._definitions = None
+        self._serialized = None
+    
+    def register(self, spec):
+        """Add a tool declaration"""
+        self.specs[spec.name] = spec
+        self._definitions = None
+        self._serialized = None
+        return spec
+    
+    def bind(self, name, handler):
+        """Attach the function that executes a tool's calls"""
+        self.get(name).handler = handler
+    
+    def get(self, name):
+        """Get a tool's declaration, raising ToolInputError for unknown tools"""
+        spec = self.specs.get(name)
+        if spec is None:
+            raise ToolInputError(f"Unknown tool: {name}")
+        return spec
+    
+    def definitions(self):
+        """Get the tool definitions for requests (built once)"""
+        if self._definitions is None:
+            self._definitions = [spec.definition() for spec in self.specs.values()]
+        return self._definitions
+    
+    def serialized(self):
+        """Get the tool definitions as JSON (serialized once)"""
+        if self._serialized is None:
+            self._serialized = json.dumps(self.definitions())
+        return self._serialized
+    
+    def side_effect(self, name, tool_input):
+        """Get the side-effect class of a call (unknown tools count as desktop)"""
+        spec = self.specs.get(name)
+        return spec.effect_of(tool_input) if spec else SIDE_EFFECT_DESKTOP
+    
+    def timeout(self, name):
+        """Get a tool's execution timeout in seconds"""
+        spec = self.specs.get(name)
+        return spec.timeout if spec else 30
+    
+    def dispatch(self, name, tool_input, scaling=None):
+        """Validate a call and run its handler
+        
+        Validation happens before the handler is touched, so bad input
+        never reaches the desktop. scaling is passed to tools that take
+        screenshot coordinates.
+        """
+        spec = self.get(name)
+        spec.validate(tool_input)
+        
+        if spec.handler is None:
+            raise ToolInputError(f"Tool {name} is not available")
+        if spec.screen_coordinates:
+            return spec.handler(tool_input, scaling=scaling)
+        return spec.handler(tool_input)
+
+POINT_SCHEMA = {
+    "type": "array",
+    "items": {"type": "integer"},
+    "minItems": 2,
+    "maxItems": 2
+}
+
+TOOL_REGISTRY = ToolRegistry()
+
+TOOL_REGISTRY.register(ToolSpec(
+    name="computer",
+    description="Use a computer to perform actions",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "action": {
+                "type": "string",
+                "enum": ["click", "type", "scroll", "key", "move", "screenshot", "drag", "find_and_click"]
+            },
+            "coordinate": dict(POINT_SCHEMA, description="[x, y] coordinates for click/move actions"),
+            "start": dict(POINT_SCHEMA, description="[x, y] start point for drag"),
+            "end": dict(POINT_SCHEMA, description="[x, y] end point for drag"),
+            "x": {"type": "integer", "description": "x coordinate to scroll at"},
+            "y": {"type": "integer", "description": "y coordinate to scroll at"},
+            "text": {
+                "type": "string",
+                "description": "Text to type"
+            },
+            "key": {
+                "type": "string",
+                "description": "Key to press"
+            },
+            "clicks": {
+                "type": "integer",
+                "description": "Number of clicks, or scroll clicks (negative scrolls down)"
+            },
+            "button": {"type": "string", "enum": ["left", "right", "middle"]},
+            "duration": {"type": "number", "description": "Seconds for move/drag motion"},
+            "image_path": {"type": "string", "description": "Image file to find for find_and_click"},
+            "confidence": {"type": "number", "description": "Match confidence for find_and_click"}
+        },
+        "required": ["action"]
+    },
+    side_effect=SIDE_EFFECT_DESKTOP,
+    timeout=60,
+    operation_key="action",
+    requires={
+        "click": ["coordinate"],
+        "move": ["coordinate"],
+        "type": ["text"],
+        "key": ["key"],
+        "drag": ["start", "end"],
+        "find_and_click": ["image_path"]
+    },
+    screen_coordinates=True
+))
+
+TOOL_REGISTRY.register(ToolSpec(
+    name="file_operations",
+    description="Perform file operations",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "operation": {
+                "type": "string",
+                "enum": ["read", "write", "list", "delete", "copy", "move"]
+            },
+            "file_path": {"type": "string"},
+            "content": {"type": "string"},
+            "dest_path": {"type": "string"},
+            "mode": {"type": "string", "enum": ["w", "a"]}
+        },
+        "required": ["operation", "file_path"]
+    },
+    side_effect=SIDE_EFFECT_WRITE,
+    timeout=30,
+    operation_key="operation",
+    requires={
+        "copy": ["dest_path"],
+        "move": ["dest_path"]
+    },
+    operation_effects={
+        "read": SIDE_EFFECT_READ,
+        "list": SIDE_EFFECT_READ
+    }
+))
+
+TOOL_REGISTRY.register(ToolSpec(
+    name="web_operations",
+    description="Perform web operations",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "operation": {
+                "type": "string",
+                "enum": ["load_page", "load_pages", "get_content", "search_elements", "extract_links",
+                         "extract_headings", "extract_forms", "extract_tables"]
+            },
+            "url": {"type": "string"},
+            "urls": {"type": "array", "items": {"type": "string"}, "minItems": 1},
+            "timeout": {"type": "number"},
+            "selector": {"type": "string"},
+            "search_text": {"type": "string"}
+        },
+        "required": ["operation"]
+    },
+    side_effect=SIDE_EFFECT_STATE,
+    timeout=Config.REQUEST_TIMEOUT * 3,
+    operation_key="operation",
+    requires={
+        "load_page": ["url"],
+        "load_pages": ["urls"],
+        "search_elements": ["search_text"]
+    },
+    # load_page replaces the current page, so it keeps Claude's order with
+    # the operations on it; load_pages fetches in parallel on its own
+    operation_effects={
+        "load_pages": SIDE_EFFECT_READ
+    }
+))
@@ -0,0 +1,57 @@
+"""
+Tool Scheduler for Claude Computer Use Assistant
+Runs independent read-only tool calls of one assistant turn concurrently
+"""
+
+import asyncio
+from config import Config
+from core.tool_registry import TOOL_REGISTRY, SIDE_EFFECT_READ
+
+def is_parallel_safe(tool_call, registry=TOOL_REGISTRY):
+    """Check whether a tool call may run concurrently with its neighbours"""
+    return registry.side_effect(tool_call.name, tool_call.input) == SIDE_EFFECT_READ
+
+class ToolScheduler:
+    """Execute a turn's tool calls in batches
+    
+    Consecutive read-only calls (see the registry's side-effect classes)
+    form one batch that runs on a bounded pool; every other call
+    (mouse/keyboard actions, writes, operations on the current page) runs
+    alone, so side effects keep Claude's order.
+    Results are always reported in the order of the tool_use blocks.
+    """
+    
+    def __init__(self, max_parallel=None, registry=TOOL_REGISTRY):
+        self.max_parallel = max_parallel or Config.TOOL_MAX_PARALLEL
+        self.registry = registry
+    
+    def plan(self, tool_calls):
+        """Split tool calls into batches of (index, tool_call) pairs"""
+        batches = []
+        
+        for index, tool_call in enumerate(tool_calls):
+            if batches and is_parallel_safe(tool_call, self.registry) \
+                    and is_parallel_safe(batches[-1][-1][1], self.registry):
+                batches[-1].append((index, tool_call))
+            else:
+                batches.append([(index, tool_call)])
+        
+        return batches
+    
+    async def run(self, tool_calls, execute):
+        """Run every call through execute(index, tool_call), batch by batch
+        
+        execute is a coroutine function; it is responsible for storing the
+        result under index so partial results survive cancellation.
+        """
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        
+        async def bounded(index, tool_call):
+            async with semaphore:
+                await execute(index, tool_call)
+        
+        for batch in self.plan(tool_calls):
+            if len(batch) == 1:
+                await execute(*batch[0])
+            else:
+                await asyncio.gather(*(bounded(index, tool_call) for index, tool_call in batch))
@@ -0,0 +1,387 @@
+"""
+Messages API Transport for Claude Computer Use Assistant
+Local stand-in for the Messages endpoint: record, replay or mock responses
+
+ClaudeClient talks to this server through base_url when CLAUDE_TRANSPORT
+is not "live":
+
+- record: forwards requests to the real API and saves each response under
+  a canonical hash of the request
+- replay: serves saved responses, never touching the network
+- mock: synthesizes responses, including streaming events and tool_use
+  blocks. A user message of the form "/tool NAME {json input}" makes the
+  mock call that tool; anything else is echoed back as text.
+
+Run standalone with: python -m core.transport --mode mock --port 8765
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import requests
+from config import Config
+
+MESSAGES_PATH = "/v1/messages"
+MODELS_PATH = "/v1/models"
+FORWARDED_HEADERS = ("x-api-key", "authorization", "anthropic-version", "anthropic-beta", "content-type")
+RELAYED_HEADERS = ("content-type", "request-id", "retry-after", "retry-after-ms")
+
+def request_key(path, body):
+    """Hash a request canonically (key order and whitespace don't matter)"""
+    try:
+        canonical = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"))
+    except ValueError:
+        canonical = body.decode("utf-8", errors="replace") if isinstance(body, bytes) else str(body)
+    return hashlib.sha256(f"{path}\n{canonical}".encode("utf-8")).hexdigest()
+
+def sse_event(data):
+    """Encode one server-sent event"""
+    return f"event: {data['type']}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+
+class RecordingStore:
+    """Request/response pairs on disk, one JSON file per request hash"""
+    
+    def __init__(self, directory=None):
+        self.directory = Path(directory or Config.CLAUDE_RECORDINGS_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+    
+    def path(self, key):
+        return self.directory / f"{key}.json"
+    
+    def load(self, key):
+        """Get the recording for a request hash, or None"""
+        path = self.path(key)
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def save(self, key, request_body, status, headers, body):
+        """Store one response"""
+        record = {
+            'key': key,
+            'recorded_at': time.time(),
+            'request': json.loads(request_body),
+            'status': status,
+            'headers': headers,
+            'body': body.decode('utf-8')
+        }
+        with open(self.path(key), 'w', encoding='utf-8') as f:
+            json.dump(record, f, indent=2, ensure_ascii=False)
+
+class MockResponder:
+    """Deterministic Messages API responses"""
+    
+    def __init__(self, token_delay=0.0):
+        self.token_delay = token_delay
+    
+    def build_message(self, request, key):
+        """Build a complete response message for a request"""
+        text, tool_call = self.interpret(request)
+        content = []
+        
+        if tool_call and request.get('tools'):
+            name, tool_input = tool_call
+            content.append({"type": "tool_use", "id": f"toolu_mock_{key[:20]}", "name": name, "input": tool_input})
+            stop_reason = "tool_use"
+        else:
+            content.append({"type": "text", "text": text})
+            stop_reason = "end_turn"
+        
+        return {
+            "id": f"msg_mock_{key[:20]}",
+            "type": "message",
+            "role": "assistant",
+            "model": request.get('model', 'mock'),
+            "content": content,
+            "stop_reason": stop_reason,
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": len(json.dumps(request)) // 4,
+                "output_tokens": max(1, len(json.dumps(content)) // 4)
+            }
+        }
+    
+    def interpret(self, request):
+        """Get (text, tool_call) for the last user turn"""
+        messages = request.get('messages') or [{}]
+        content = messages[-1].get('content', "")
+        if isinstance(content, str):
+            content = [{"type": "text", "text": content}]
+        
+        results = [block for block in content if block.get('type') == 'tool_result']
+        texts = [block.get('text', '') for block in content if block.get('type') == 'text']
+        prompt = texts[-1].strip() if texts else ""
+        
+        if results and not prompt:
+            return f"Mock response: received {len(results)} tool result(s).", None
+        
+        if prompt.startswith("/tool "):
+            name, _, raw_input = prompt[6:].strip().partition(" ")
+            try:
+                tool_input = json.loads(raw_input) if raw_input else {}
+            except ValueError:
+                tool_input = {}
+            return "", (name, tool_input)
+        
+        return f"Mock response to: {prompt[:200]}", None
+    
+    def stream(self, message):
+        """Yield the server-sent events of a streamed message"""
+        start = dict(message, content=[], stop_reason=None,
+                     usage=dict(message['usage'], output_tokens=1))
+        yield sse_event({"type": "message_start", "message": start})
+        
+        for index, block in enumerate(message['content']):
+            if block['type'] == 'text':
+                yield sse_event({"type": "content_block_start", "index": index,
+                                 "content_block": {"type": "text", "text": ""}})
+                words = block['text'].split(" ")
+                for position, word in enumerate(words):
+                    if self.token_delay:
+                        time.sleep(self.token_delay)
+                    delta = word if position == len(words) - 1 else word + " "
+                    yield sse_event({"type": "content_block_delta", "index": index,
+                                     "delta": {"type": "text_delta", "text": delta}})
+            else:
+                yield sse_event({"type": "content_block_start", "index": index,
+                                 "content_block": dict(block, input={})})
+                yield sse_event({"type": "content_block_delta", "index": index,
+                                 "delta": {"type": "input_json_delta", "partial_json": json.dumps(block['input'])}})
+            yield sse_event({"type": "content_block_stop", "index": index})
+        
+        yield sse_event({"type": "message_delta",
+                         "delta": {"stop_reason": message['stop_reason'], "stop_sequence": None},
+                         "usage": {"output_tokens": message['usage']['output_tokens']}})
+        yield sse_event({"type": "message_stop"})
+
+class MessagesServer:
+    """Local HTTP server implementing POST /v1/messages in one of the modes"""
+    
+    def __init__(self, mode, host="127.0.0.1", port=0, latency=None, token_delay=None,
+                 recordings_dir=None, upstream_url=None):
+        if mode not in ("record", "replay", "mock"):
+            raise ValueError(f"Unknown transport mode: {mode}")
+        
+        self.mode = mode
+        self.latency = Config.MOCK_LATENCY if latency is None else latency
+        self.token_delay = Config.MOCK_TOKEN_DELAY if token_delay is None else token_delay
+        self.upstream_url = (upstream_url or Config.ANTHROPIC_UPSTREAM_URL).rstrip("/")
+        self.store = RecordingStore(recordings_dir) if mode != "mock" else None
+        self.mock = MockResponder(self.token_delay)
+        self.session = requests.Session()
+        
+        self.stats = {'requests': 0, 'recorded': 0, 'replayed': 0, 'missing': 0}
+        self.stats_lock = threading.Lock()
+        
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+    
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self):
+        """Serve in a daemon thread"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="messages-transport", daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        """Stop serving"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+    
+    def count(self, stat):
+        with self.stats_lock:
+            self.stats[stat] += 1
+    
+    def _handler_class(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                path = self.path.split("?")[0]
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                server.count('requests')
+                
+                if path != MESSAGES_PATH:
+                    return server.send_error_response(self, 404, "not_found_error", f"Unknown path: {path}")
+                
+                key = request_key(path, body)
+                if server.mode == "mock":
+                    server.handle_mock(self, body, key)
+                elif server.mode == "replay":
+                    server.handle_replay(self, key)
+                else:
+                    server.handle_record(self, path, body, key)
+            
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                if path != MODELS_PATH:
+                    return server.send_error_response(self, 404, "not_found_error", f"Unknown path: {path}")
+                server.handle_models(self)
+            
+            def log_message(self, format, *args):
+                pass  # keep the console quiet
+        
+        return Handler
+    
+    def handle_models(self, handler):
+        """Answer the model list used as a health probe
+        
+        Record mode asks the real API so a bad key shows up; the offline
+        modes list the configured model.
+        """
+        if self.mode == "record":
+            headers = {name: handler.headers[name] for name in FORWARDED_HEADERS if handler.headers.get(name)}
+            try:
+                response = self.session.get(self.upstream_url + handler.path, headers=headers,
+                                            timeout=Config.HEALTH_CHECK_TIMEOUT)
+            except requests.exceptions.RequestException as e:
+                return self.send_error_response(handler, 502, "api_error", f"Upstream request failed: {str(e)}")
+            relayed = {name: response.headers[name] for name in RELAYED_HEADERS if name in response.headers}
+            return self.send_body(handler, response.status_code, relayed, response.content)
+        
+        body = {
+            "data": [{"type": "model", "id": Config.CLAUDE_MODEL, "display_name": Config.CLAUDE_MODEL,
+                      "created_at": "1970-01-01T00:00:00Z"}],
+            "has_more": False,
+            "first_id": Config.CLAUDE_MODEL,
+            "last_id": Config.CLAUDE_MODEL
+        }
+        self.send_body(handler, 200, {"content-type": "application/json"}, json.dumps(body).encode("utf-8"))
+    
+    def handle_mock(self, handler, body, key):
+        """Synthesize a response after the configured latency"""
+        request = json.loads(body)
+        message = self.mock.build_message(request, key)
+        time.sleep(self.latency)
+        
+        if request.get('stream'):
+            self.send_events(handler, 200, {"content-type": "text/event-stream"}, self.mock.stream(message))
+        else:
+            self.send_body(handler, 200, {"content-type": "application/json"}, json.dumps(message).encode("utf-8"))
+    
+    def handle_replay(self, handler, key):
+        """Serve a recorded response"""
+        record = self.store.load(key)
+        if record is None:
+            self.count('missing')
+            return self.send_error_response(handler, 404, "not_found_error", f"No recording for request {key}")
+        
+        self.count('replayed')
+        time.sleep(self.latency)
+        body = record['body'].encode("utf-8")
+        
+        if record['headers'].get('content-type', '').startswith("text/event-stream"):
+            events = (event + b"\n\n" for event in body.split(b"\n\n") if event.strip())
+            self.send_events(handler, record['status'], record['headers'], self.paced(events))
+        else:
+            self.send_body(handler, record['status'], record['headers'], body)
+    
+    def handle_record(self, handler, path, body, key):
+        """Forward to the real API, relaying and saving the response"""
+        headers = {name: handler.headers[name] for name in FORWARDED_HEADERS if handler.headers.get(name)}
+        
+        try:
+            response = self.session.post(self.upstream_url + path, data=body, headers=headers,
+                                         stream=True, timeout=Config.API_RETRY_DEADLINE)
+        except requests.exceptions.RequestException as e:
+            return self.send_error_response(handler, 502, "api_error", f"Upstream request failed: {str(e)}")
+        
+        relayed = {name: response.headers[name] for name in RELAYED_HEADERS if name in response.headers}
+        chunks = []
+        
+        def relay():
+            for chunk in response.iter_content(chunk_size=None):
+                chunks.append(chunk)
+                yield chunk
+        
+        self.send_events(handler, response.status_code, relayed, relay())
+        
+        # Only successful responses are worth replaying
+        if response.status_code < 400:
+            self.store.save(key, body, response.status_code, relayed, b"".join(chunks))
+            self.count('recorded')
+    
+    def paced(self, events):
+        """Space replayed stream events by the token delay"""
+        for event in events:
+            if self.token_delay:
+                time.sleep(self.token_delay)
+            yield event
+    
+    def send_body(self, handler, status, headers, body):
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+    
+    def send_events(self, handler, status, headers, chunks):
+        """Send a body incrementally; the connection closes when it ends"""
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header("Connection", "close")
+        handler.end_headers()
+        for chunk in chunks:
+            handler.wfile.write(chunk)
+            handler.wfile.flush()
+        handler.close_connection = True
+    
+    def send_error_response(self, handler, status, error_type, message):
+        body = json.dumps({"type": "error", "error": {"type": error_type, "message": message}}).encode("utf-8")
+        self.send_body(handler, status, {"content-type": "application/json"}, body)
+
+_server = None
+_server_lock = threading.Lock()
+
+def transport_base_url(mode=None):
+    """Get the base_url ClaudeClient should use (None for the live API)
+    
+    Non-live modes start one shared in-process MessagesServer on first use.
+    """
+    global _server
+    mode = mode or Config.CLAUDE_TRANSPORT
+    
+    if mode == "live":
+        return Config.ANTHROPIC_BASE_URL or None
+    
+    with _server_lock:
+        if _server is None or _server.mode != mode:
+            if _server is not None:
+                _server.stop()
+            _server = MessagesServer(mode).start()
+            print(f"Claude API transport: {mode} mode at {_server.base_url}")
+        return _server.base_url
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Messages API stand-in")
+    parser.add_argument("--mode", choices=["record", "replay", "mock"], default="mock")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=None, help="seconds before each response")
+    parser.add_argument("--token-delay", type=float, default=None, help="seconds between stream events")
+    parser.add_argument("--recordings", default=None, help="recordings directory")
+    args = parser.parse_args()
+    
+    server = MessagesServer(args.mode, args.host, args.port, args.latency, args.token_delay, args.recordings)
+    print(f"Serving {args.mode} Messages API at {server.base_url} (set ANTHROPIC_BASE_URL to use it)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Web Download for Claude Computer Use Assistant
+Streamed, size-capped page downloads with incremental decode and early stop
+"""
+
+import codecs
+import re
+import time
+from config import Config
+from core.html_parser import clean_text, text_extractor
+from core.http_stream import read_until
+
+# Most bytes taken from the connection per read (a read returns what has arrived)
+DOWNLOAD_CHUNK_SIZE = 16 * 1024
+
+# How far into the body to look for a <meta charset>
+CHARSET_SNIFF_BYTES = 2048
+
+META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([a-zA-Z0-9_.:-]+)', re.IGNORECASE)
+HEADER_CHARSET = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+BODY_START = re.compile(rb'<body', re.IGNORECASE)
+
+class UnsupportedContentError(Exception):
+    """The response is not a document we can parse (images, archives, ...)"""
+
+class PageDownload:
+    """A fetched page body and how the download went
+    
+    stop_reason is "complete", "byte_cap" (max_bytes reached),
+    "text_budget" (enough text extracted) or "time_limit" (the download
+    ran out of time); time_to_cap is the time from
+    the request to the early stop, None when the body was read to the end.
+    cache_status is how the HTTP cache answered ("hit", "revalidated",
+    "miss" or "bypass"), None when the session has no cache.
+    """
+    
+    def __init__(self, url, status_code, content_type, encoding):
+        self.url = url
+        self.status_code = status_code
+        self.content_type = content_type
+        self.encoding = encoding
+        self.source = ""
+        self.text = None
+        self.bytes_read = 0
+        self.stop_reason = "complete"
+        self.time_to_cap = None
+        self.elapsed = 0.0
+        self.cache_status = None
+    
+    @property
+    def truncated(self):
+        return self.stop_reason != "complete"
+    
+    def stats(self):
+        """Download figures for results and logs"""
+        return {
+            'url': self.url,
+            'content_type': self.content_type,
+            'bytes_read': self.bytes_read,
+            'stop_reason': self.stop_reason,
+            'time_to_cap': self.time_to_cap,
+            'elapsed': self.elapsed,
+            'cache_status': self.cache_status
+        }
+
+def media_type(content_type):
+    """The media type of a Content-Type header without parameters"""
+    return (content_type or "").split(";")[0].strip().lower()
+
+def is_parseable(content_type):
+    """Whether a Content-Type is one we parse (a missing header is given the benefit of the doubt)"""
+    media = media_type(content_type)
+    return not media or media in Config.WEB_PARSEABLE_CONTENT_TYPES
+
+def detect_encoding(content_type, first_chunk):
+    """Charset from the Content-Type header, else a <meta charset>, else UTF-8"""
+    match = HEADER_CHARSET.search(content_type or "")
+    if not match:
+        match = META_CHARSET.search(first_chunk[:CHARSET_SNIFF_BYTES])
+    if match:
+        name = match.group(1)
+        name = name.decode("ascii", "ignore") if isinstance(name, bytes) else name
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            pass
+    return "utf-8"
+
+def charset_settled(content_type, head):
+    """Whether more of the body could no longer change detect_encoding's answer"""
+    return (HEADER_CHARSET.search(content_type or "") is not None
+            or len(head) >= CHARSET_SNIFF_BYTES
+            or META_CHARSET.search(head) is not None
+            or BODY_START.search(head) is not None)
+
+def download_page(session, url, max_bytes=None, text_budget=None, timeout=None, backend=None, time_limit=None):
+    """Stream a page body, stopping at max_bytes or once text_budget characters of text are extracted
+    
+    Raises UnsupportedContentError before reading the body when the
+    Content-Type is not parseable, and requests exceptions for HTTP errors.
+    With text_budget, the text extracted while downloading is kept on the
+    result so the page need not be parsed again for it. timeout bounds
+    each network wait; time_limit bounds the whole download, keeping what
+    arrived in time (reads return what has arrived and never wait past it).
+    """
+    max_bytes = max_bytes or Config.WEB_MAX_DOWNLOAD_BYTES
+    start_time = time.perf_counter()
+    
+    response = session.get(url, timeout=timeout or Config.REQUEST_TIMEOUT, stream=True)
+    try:
+        response.raise_for_status()
+        
+        content_type = response.headers.get("Content-Type", "")
+        if not is_parseable(content_type):
+            raise UnsupportedContentError(f"Refusing to parse {media_type(content_type)} content")
+        
+        deadline = start_time + time_limit if time_limit else None
+        read_timeout = timeout or Config.REQUEST_TIMEOUT
+        if deadline is not None and hasattr(response.raw, 'deadline'):
+            # An HTTP cache finishing the body on close gets only the time left
+            response.raw.deadline = min(response.raw.deadline, deadline)
+        
+        def read():
+            """The next piece of the body, b"" at its end, None once time_limit has passed"""
+            return read_until(response.raw, deadline, read_timeout, DOWNLOAD_CHUNK_SIZE)
+        
+        # Reads may return a few bytes at a time; gather enough to find a <meta charset>
+        first_chunk = b""
+        while True:
+            piece = read()
+            if not piece:
+                break
+            first_chunk += piece
+            if charset_settled(content_type, first_chunk):
+                break
+        
+        download = PageDownload(response.url, response.status_code, content_type,
+                                detect_encoding(content_type, first_chunk))
+        download.cache_status = getattr(response, 'cache_status', None)
+        
+        decoder = codecs.getincrementaldecoder(download.encoding)(errors="replace")
+        extractor = text_extractor(backend) if text_budget else None
+        parts = []
+        
+        def consume(chunk):
+            """Decode and extract one chunk; return True to stop reading"""
+            room = max_bytes - download.bytes_read
+            if len(chunk) > room:
+                chunk = chunk[:room]
+                download.stop_reason = "byte_cap"
+            download.bytes_read += len(chunk)
+            
+            text = decoder.decode(chunk)
+            parts.append(text)
+            if extractor:
+                extractor.feed(text)
+                # Raw text only ever shrinks when cleaned; check cheaply first
+                if extractor.raw_length >= text_budget and len(extractor.text()) >= text_budget:
+                    download.stop_reason = "text_budget"
+            return download.stop_reason != "complete"
+        
+        stopped = consume(first_chunk) if first_chunk else False
+        while piece and not stopped:
+            piece = read()
+            stopped = consume(piece) if piece else False
+        if piece is None and not stopped:
+            download.stop_reason = "time_limit"
+        
+        if download.truncated:
+            download.time_to_cap = time.perf_counter() - start_time
+        else:
+            parts.append(decoder.decode(b"", final=True))
+        
+        download.source = "".join(parts)
+        if extractor:
+            download.text = clean_text(extractor.close())
+        download.elapsed = time.perf_counter() - start_time
+        return download
+    finally:
+        # Closing an unfinished stream drops the connection instead of draining it
+        response.close()
@@ -1,128 +1,356 @@
 import requests
+import threading
+import time
 import webbrowser
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
 from config import Config
+from core.http_cache import install_http_cache
+from core.web_download import UnsupportedContentError, download_page
+from core.web_page import WebPage, MAX_CONTENT_LENGTH
+
+# Pages kept for get_content by URL after a load
+MAX_STORED_PAGES = 20
+
+def normalize_url(url):
+    """Add https:// to a URL without a protocol"""
+    url = url.strip()
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    return url
 
 class WebOperations:
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({'User-Agent': Config.USER_AGENT})
-        self.current_url = None
-        self.current_page_content = None
-        self.current_page_source = None
+        
+        # Fresh pages come from disk, stale ones are revalidated (see HttpCache)
+        self.http_cache = install_http_cache(self.session)
+        
+        # The most recently loaded page, parsed once (see WebPage)
+        self.current_page = None
+        
+        # Pages may be loaded concurrently by the tool scheduler
+        self.state_lock = threading.Lock()
+        
+        # Recently loaded pages by URL, least recently loaded first
+        self.pages = OrderedDict()
+        
+        # Bytes read, stop reason and time to cap of recent downloads
+        self.fetch_history = deque(maxlen=100)
+        
+        # Concurrent load_pages downloads, overall and per host
+        self.fetch_slots = threading.BoundedSemaphore(Config.WEB_MAX_PARALLEL_FETCHES)
+        self.host_slots = {}
+        
+        # Dispatch table: operation name -> handler taking the operation data
+        self.operations = {
+            "load_page": lambda data: self.load_page(data.get("url")),
+            "load_pages": lambda data: self.load_pages(data.get("urls"), data.get("timeout")),
+            "get_content": lambda data: self.get_current_content(data.get("url")),
+            "search_elements": lambda data: self.search_in_content(data.get("search_text")),
+            "extract_links": lambda data: self.extract_links(),
+            "extract_headings": lambda data: self.extract_headings(),
+            "extract_forms": lambda data: self.extract_forms(),
+            "extract_tables": lambda data: self.extract_tables()
+        }
+    
+    @property
+    def current_url(self):
+        page = self.current_page
+        return page.url if page else None
+    
+    @property
+    def current_page_content(self):
+        page = self.current_page
+        return page.content if page else None
+    
+    @property
+    def current_page_source(self):
+        page = self.current_page
+        return page.source if page else None
         
     def execute_operation(self, operation_data):
         """Execute a web operation"""
         operation = operation_data.get("operation")
+        handler = self.operations.get(operation)
         
-        if operation == "load_page":
-            url = operation_data.get("url")
-            return self.load_page(url)
-        elif operation == "get_content":
-            return self.get_current_content()
-        elif operation == "search_elements":
-            search_text = operation_data.get("search_text")
-            return self.search_in_content(search_text)
-        elif operation == "extract_links":
-            return self.extract_links()
-        else:
+        if handler is None:
             return f"Unknown web operation: {operation}"
+        return handler(operation_data)
+    
+    def fetch_page(self, url, timeout=None, full=False):
+        """Download a page and keep it by URL; raises on failure
+        
+        With timeout, it bounds both each network wait and the whole
+        download (the text that arrived in time is kept). Unless full,
+        the download may stop once there is enough text for the content
+        budget; such a page is partial (see complete_page).
+        """
+        # Stream the body up to the byte cap; for text-only loads stop
+        # as soon as there is enough text to fill the content budget
+        text_budget = MAX_CONTENT_LENGTH if Config.HTML_STREAMING_TEXT and not full else None
+        download = download_page(self.session, url, text_budget=text_budget,
+                                 timeout=timeout, time_limit=timeout)
+        self.fetch_history.append(download.stats())
+        
+        # Parse at most once; text and other artifacts are derived lazily
+        page = WebPage(url, download.source, text=download.text, download=download)
+        
+        with self.state_lock:
+            self.pages[url] = page
+            self.pages.move_to_end(url)
+            while len(self.pages) > MAX_STORED_PAGES:
+                self.pages.popitem(last=False)
+        return page
+    
+    def complete_page(self, page):
+        """The whole document for a partial page, for links, search and the like
+        
+        A page cut short at the text budget or time limit is downloaded
+        again to the byte cap (usually straight from the HTTP cache) and
+        replaces the partial one. If that fails, or the page is over the
+        byte cap, the partial page is returned; check is_complete.
+        """
+        if page is None or page.is_complete or page.download.stop_reason == "byte_cap":
+            return page
+        
+        try:
+            full_page = self.fetch_page(page.url, full=True)
+        except Exception as e:
+            print(f"Could not complete page {page.url}: {str(e)}")
+            return page
+        
+        with self.state_lock:
+            if self.current_page is page:
+                self.current_page = full_page
+        return full_page
+    
+    def current_full_page(self):
+        """The current page, completed if it was cut short"""
+        return self.complete_page(self.current_page)
     
     def load_page(self, url):
         """Load a web page and extract content"""
         try:
-            # Add protocol if missing
-            if not url.startswith(('http://', 'https://')):
-                url = 'https://' + url
-            
-            # Make request
-            response = self.session.get(url, timeout=Config.REQUEST_TIMEOUT)
-            response.raise_for_status()
-            
-            # Store raw HTML source
-            self.current_page_source = response.text
-            self.current_url = url
-            
-            # Parse with BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
+            url = normalize_url(url)
+            page = self.fetch_page(url)
+            text_content = page.content
+            download = page.download
             
-            # Extract text content
-            for script in soup(["script", "style"]):
-                script.decompose()
+            # Store as the current page
+            with self.state_lock:
+                self.current_page = page
             
-            text_content = soup.get_text()
-            
-            # Clean up text
-            lines = (line.strip() for line in text_content.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text_content = '\n'.join(chunk for chunk in chunks if chunk)
-            
-            # Limit content length
-            if len(text_content) > 5000:
-                text_content = text_content[:5000] + "\n\n[Content truncated]"
-            
-            self.current_page_content = text_content
-            
-            parsed_url = urlparse(url)
             return {
                 'success': True,
                 'url': url,
-                'domain': parsed_url.netloc,
+                'domain': page.domain,
                 'content_length': len(text_content),
-                'content': text_content
+                'content': text_content,
+                'bytes_read': download.bytes_read,
+                'truncated': download.truncated,
+                'cache': download.cache_status
             }
             
+        except UnsupportedContentError as e:
+            return f"Failed to load page: {str(e)}"
         except requests.exceptions.RequestException as e:
             return f"Failed to load page: {str(e)}"
         except Exception as e:
             return f"Error processing page: {str(e)}"
     
-    def get_current_content(self):
-        """Get current page content"""
-        if self.current_page_content:
+    def load_pages(self, urls, timeout=None):
+        """Load several pages concurrently and summarize each
+        
+        At most WEB_MAX_PARALLEL_FETCHES downloads run at once, and at
+        most WEB_MAX_FETCHES_PER_HOST to any one host. Each URL gets its
+        own timeout; the call as a whole finishes within twice
+        REQUEST_TIMEOUT, under the tool's own timeout. Summaries come back
+        in the order given; the full content of any of them is available
+        through get_content with its URL. The current page is unchanged.
+        """
+        if not urls:
+            return "No URLs provided"
+        
+        urls = list(dict.fromkeys(normalize_url(url) for url in urls))
+        skipped = urls[Config.WEB_MAX_PAGES_PER_CALL:]
+        urls = urls[:Config.WEB_MAX_PAGES_PER_CALL]
+        
+        call_limit = Config.REQUEST_TIMEOUT * 2
+        timeout = min(timeout if timeout and timeout > 0 else Config.REQUEST_TIMEOUT, call_limit)
+        start_time = time.perf_counter()
+        deadline = start_time + call_limit
+        
+        executor = ThreadPoolExecutor(max_workers=min(len(urls), Config.WEB_MAX_PARALLEL_FETCHES),
+                                      thread_name_prefix="web-fetch")
+        futures = {executor.submit(self.summarize_fetch, url, timeout, deadline): url for url in urls}
+        done, _ = wait(futures, timeout=max(0, deadline - time.perf_counter()))
+        executor.shutdown(wait=False, cancel_futures=True)
+        
+        summaries = [
+            future.result() if future in done else {'url': url, 'success': False, 'error': "Timed out"}
+            for future, url in futures.items()
+        ]
+        loaded = sum(1 for summary in summaries if summary['success'])
+        return {
+            'success': loaded > 0,
+            'loaded': loaded,
+            'failed': len(summaries) - loaded,
+            'skipped': skipped,
+            'elapsed': round(time.perf_counter() - start_time, 3),
+            'pages': summaries
+        }
+    
+    def host_slot(self, host):
+        """The semaphore limiting concurrent downloads from one host"""
+        with self.state_lock:
+            slot = self.host_slots.get(host)
+            if slot is None:
+                slot = self.host_slots[host] = threading.BoundedSemaphore(Config.WEB_MAX_FETCHES_PER_HOST)
+            return slot
+    
+    def summarize_fetch(self, url, timeout, deadline):
+        """Fetch one page of a load_pages call under the concurrency limits"""
+        # Host slot first, so a download waiting on its host holds no global slot
+        host_slot = self.host_slot(urlparse(url).netloc)
+        if not host_slot.acquire(timeout=max(0, deadline - time.perf_counter())):
+            return {'url': url, 'success': False, 'error': "Timed out waiting for a fetch slot"}
+        try:
+            if not self.fetch_slots.acquire(timeout=max(0, deadline - time.perf_counter())):
+                return {'url': url, 'success': False, 'error': "Timed out waiting for a fetch slot"}
+            try:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return {'url': url, 'success': False, 'error': "Timed out waiting for a fetch slot"}
+                page = self.fetch_page(url, min(timeout, remaining))
+            finally:
+                self.fetch_slots.release()
+        except UnsupportedContentError as e:
+            return {'url': url, 'success': False, 'error': str(e)}
+        except requests.exceptions.RequestException as e:
+            return {'url': url, 'success': False, 'error': str(e)}
+        except Exception as e:
+            return {'url': url, 'success': False, 'error': f"Error processing page: {str(e)}"}
+        finally:
+            host_slot.release()
+        
+        download = page.download
+        return {
+            'url': url,
+            'success': True,
+            'domain': page.domain,
+            'summary': page.summary,
+            'content_length': len(page.content),
+            'bytes_read': download.bytes_read,
+            'truncated': download.truncated,
+            'cache': download.cache_status,
+            'elapsed': round(download.elapsed, 3)
+        }
+    
+    def cache_stats(self):
+        """HTTP cache hit, revalidation and miss counts"""
+        return self.http_cache.stats()
+    
+    def get_current_content(self, url=None):
+        """Get current page content, or that of a recently loaded page by URL"""
+        if url:
+            with self.state_lock:
+                page = self.pages.get(normalize_url(url))
+        else:
+            page = self.current_page
+        if page and page.content:
             return {
                 'success': True,
-                'url': self.current_url,
-                'content': self.current_page_content,
-                'length': len(self.current_page_content)
+                'url': page.url,
+                'content': page.content,
+                'length': len(page.content)
             }
         else:
             return "No page content available"
     
     def search_in_content(self, search_text):
         """Search for text in current page content"""
-        if not self.current_page_content or not search_text:
+        page = self.current_full_page() if search_text else self.current_page
+        if not page or not page.text or not search_text:
             return "No page content or search text provided"
         
-        if search_text.lower() in self.current_page_content.lower():
+        if page.contains(search_text):
             return f"Found '{search_text}' in current page content"
+        elif not page.is_complete:
+            return (f"'{search_text}' not found in the first {page.download.bytes_read} bytes "
+                    f"of the current page (the rest was not downloaded)")
         else:
             return f"'{search_text}' not found in current page content"
     
     def extract_links(self):
         """Extract links from current page"""
-        if not self.current_page_source:
+        page = self.current_full_page()
+        if not page:
             return "No page source available"
         
         try:
-            soup = BeautifulSoup(self.current_page_source, 'html.parser')
-            links = []
+            return {
+                'success': True,
+                'links': page.links[:20],  # Return first 20 links
+                'total_count': len(page.links),
+                'complete': page.is_complete
+            }
             
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                text = link.get_text(strip=True)
-                if href.startswith(('http', '/')):
-                    links.append({'text': text, 'url': href})
+        except Exception as e:
+            return f"Error extracting links: {str(e)}"
+    
+    def extract_headings(self):
+        """Extract the heading outline of the current page"""
+        page = self.current_full_page()
+        if not page:
+            return "No page source available"
+        
+        try:
+            return {
+                'success': True,
+                'headings': page.headings[:50],
+                'total_count': len(page.headings),
+                'complete': page.is_complete
+            }
             
+        except Exception as e:
+            return f"Error extracting headings: {str(e)}"
+    
+    def extract_forms(self):
+        """Extract forms and their fields from the current page"""
+        page = self.current_full_page()
+        if not page:
+            return "No page source available"
+        
+        try:
             return {
                 'success': True,
-                'links': links[:20],  # Return first 20 links
-                'total_count': len(links)
+                'forms': page.forms[:10],
+                'total_count': len(page.forms),
+                'complete': page.is_complete
             }
             
         except Exception as e:
-            return f"Error extracting links: {str(e)}"
+            return f"Error extracting forms: {str(e)}"
+    
+    def extract_tables(self):
+        """Extract tables from the current page"""
+        page = self.current_full_page()
+        if not page:
+            return "No page source available"
+        
+        try:
+            return {
+                'success': True,
+                'tables': page.tables[:5],
+                'total_count': len(page.tables),
+                'complete': page.is_complete
+            }
+            
+        except Exception as e:
+            return f"Error extracting tables: {str(e)}"
     
     def open_in_browser(self, url):
         """Open URL in default browser"""
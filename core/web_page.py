@@ -0,0 +1,163 @@
+"""
+Web Page Model for Claude Computer Use Assistant
+One parse per loaded page, with derived artifacts computed on first use
+"""
+
+from functools import cached_property
+from urllib.parse import urlparse
+from config import Config
+from core.html_parser import clean_text, extract_text, parse_html, resolve_backend
+
+# Characters of page text handed to Claude and shown in the UI
+MAX_CONTENT_LENGTH = 5000
+
+# Characters of page text in a multi-page summary
+SUMMARY_LENGTH = 500
+
+# Rows kept per extracted table
+MAX_TABLE_ROWS = 20
+
+class WebPage:
+    """A loaded page: the source is parsed at most once, everything else is memoized
+    
+    text, links, headings, forms and tables are each computed the first
+    time they are read and reused afterwards. The tree is only built when
+    something needs it: with HTML_STREAMING_TEXT, text read before any
+    other artifact comes from a streaming extractor instead, or is
+    passed in when it was extracted during the download.
+    Script and style elements are dropped at parse time since nothing
+    derived from the page uses them.
+    """
+    
+    def __init__(self, url, source, backend=None, text=None, download=None):
+        self.url = url
+        self.source = source
+        self.backend = resolve_backend(backend)
+        
+        # How the source was fetched (see core.web_download.PageDownload)
+        self.download = download
+        
+        # Text already extracted while downloading
+        if text is not None:
+            self.__dict__['text'] = text
+    
+    @cached_property
+    def soup(self):
+        """The parsed document"""
+        soup = parse_html(self.source, self.backend)
+        for element in soup(["script", "style"]):
+            element.decompose()
+        return soup
+    
+    @property
+    def is_parsed(self):
+        return 'soup' in self.__dict__
+    
+    @property
+    def is_complete(self):
+        """Whether the source is the whole document rather than a prefix"""
+        return self.download is None or not self.download.truncated
+    
+    @property
+    def domain(self):
+        return urlparse(self.url).netloc
+    
+    @cached_property
+    def text(self):
+        """Full visible text, one phrase per line"""
+        if Config.HTML_STREAMING_TEXT and not self.is_parsed:
+            return extract_text(self.source, self.backend)
+        return clean_text(self.soup.get_text())
+    
+    @cached_property
+    def content(self):
+        """Text limited to MAX_CONTENT_LENGTH characters"""
+        if len(self.text) > MAX_CONTENT_LENGTH:
+            return self.text[:MAX_CONTENT_LENGTH] + "\n\n[Content truncated]"
+        return self.text
+    
+    @cached_property
+    def summary(self):
+        """Opening text limited to SUMMARY_LENGTH characters"""
+        if len(self.text) > SUMMARY_LENGTH:
+            return self.text[:SUMMARY_LENGTH].rstrip() + " ..."
+        return self.text
+    
+    @cached_property
+    def text_lower(self):
+        """Lowercased text for case-insensitive search"""
+        return self.text.lower()
+    
+    @cached_property
+    def links(self):
+        """Absolute and root-relative links as {'text', 'url'} dicts"""
+        links = []
+        for link in self.soup.find_all('a', href=True):
+            href = link['href']
+            if href.startswith(('http', '/')):
+                links.append({'text': link.get_text(strip=True), 'url': href})
+        return links
+    
+    @cached_property
+    def headings(self):
+        """h1-h6 headings in document order as {'level', 'text'} dicts"""
+        return [
+            {'level': int(heading.name[1]), 'text': heading.get_text(" ", strip=True)}
+            for heading in self.soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+        ]
+    
+    @cached_property
+    def forms(self):
+        """Forms with their action, method and named fields"""
+        forms = []
+        for form in self.soup.find_all('form'):
+            fields = []
+            for field in form.find_all(['input', 'select', 'textarea', 'button']):
+                if not field.get('name'):
+                    continue
+                fields.append({
+                    'name': field['name'],
+                    'type': field.get('type', 'text' if field.name == 'input' else field.name),
+                    'required': field.has_attr('required')
+                })
+            forms.append({
+                'action': form.get('action', ''),
+                'method': form.get('method', 'get').lower(),
+                'fields': fields
+            })
+        return forms
+    
+    @cached_property
+    def tables(self):
+        """Tables as caption, header cells and up to MAX_TABLE_ROWS rows of cell text"""
+        tables = []
+        for table in self.soup.find_all('table'):
+            rows = []
+            for row in table.find_all('tr'):
+                cells = [cell.get_text(" ", strip=True) for cell in row.find_all(['th', 'td'])]
+                if cells:
+                    rows.append(cells)
+            
+            headers = []
+            if rows and row_is_header(table.find('tr')):
+                headers = rows.pop(0)
+            
+            caption = table.find('caption')
+            tables.append({
+                'caption': caption.get_text(" ", strip=True) if caption else '',
+                'headers': headers,
+                'rows': rows[:MAX_TABLE_ROWS],
+                'row_count': len(rows)
+            })
+        return tables
+    
+    def contains(self, search_text):
+        """Case-insensitive search of the full page text"""
+        return search_text.lower() in self.text_lower
+
+def row_is_header(row):
+    """Whether a table row holds only th cells"""
+    if row is None:
+        return False
+    cells = row.find_all(['th', 'td'])
+    return bool(cells) and all(cell.name == 'th' for cell in cells)
@@ -10,11 +10,11 @@ from pathlib import Path
 
 # Import configuration and components
 from config import Config
-from core.claude_client import ClaudeClient
-from core.enhanced_computer_actions import EnhancedComputerActions
+from core.async_bridge import AsyncBridge
 from core.file_operations import FileOperations
-from core.web_operations import WebOperations
 from utils.history_manager import MessageHistoryManager
+from utils.lazy import LazyProxy
+from utils.startup_profiler import startup_phase
 from gui.modern_theme import ModernTheme, ModernStyler
 from gui.modern_chat_panel import ModernChatPanel
 from gui.modern_control_panel import ModernControlPanel
@@ -24,21 +24,27 @@ class EnhancedMainWindow:
     """Enhanced main application window with modern styling"""
     
     def __init__(self):
-        # Initialize theme
-        self.theme = ModernTheme()
-        self.styler = ModernStyler()
+        # Initialize main window first: ttk styles attach to the default
+        # root, and a styler created earlier would spawn a hidden extra one
+        with startup_phase("create_root"):
+            self.root = tk.Tk()
         
-        # Initialize main window
-        self.root = tk.Tk()
-        self.setup_window()
+        # Initialize theme
+        with startup_phase("setup_window"):
+            self.theme = ModernTheme()
+            self.styler = ModernStyler()
+            self.setup_window()
         
         # Initialize components
-        self.initialize_components()
+        with startup_phase("initialize_components"):
+            self.initialize_components()
         
         # Create GUI
-        self.create_modern_interface()
-        self.create_status_bar()
-        self.setup_keyboard_shortcuts()
+        with startup_phase("create_modern_interface"):
+            self.create_modern_interface()
+        with startup_phase("create_status_bar"):
+            self.create_status_bar()
+            self.setup_keyboard_shortcuts()
         
         # Bind events
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -78,11 +84,16 @@ class EnhancedMainWindow:
     def initialize_components(self):
         """Initialize all application components"""
         try:
-            # Core components
-            self.claude_client = ClaudeClient()
-            self.computer_actions = EnhancedComputerActions()
+            # Async core: one event loop thread for chat, web and file work
+            self.bridge = AsyncBridge(self.root)
+            
+            # Core components. The Claude client, computer actions and web
+            # operations pull in anthropic, pyautogui, requests and bs4, so
+            # they are built after the window is up (see warm_up_components)
+            self.claude_client = LazyProxy("core.async_claude_client", "AsyncClaudeClient")
+            self.computer_actions = LazyProxy("core.enhanced_computer_actions", "EnhancedComputerActions")
             self.file_operations = FileOperations()
-            self.web_operations = WebOperations()
+            self.web_operations = LazyProxy("core.web_operations", "WebOperations")
             self.history_manager = MessageHistoryManager()
             
             # Status tracking
@@ -133,7 +144,8 @@ class EnhancedMainWindow:
             self.file_operations,
             self.web_operations,
             self.history_manager,
-            self.styler
+            self.styler,
+            self.bridge
         )
         
         self.chat_panel = ModernChatPanel(
@@ -141,7 +153,8 @@ class EnhancedMainWindow:
             self.claude_client,
             self.control_panel,
             self.history_manager,
-            self.styler
+            self.styler,
+            self.bridge
         )
         
         # Set initial paned window position
@@ -230,23 +243,57 @@ class EnhancedMainWindow:
         
     def show_startup_animation(self):
         """Show startup animation and check connectivity"""
-        self.update_status("Initializing...", "busy")
+        self.update_status("Connecting...", "busy")
+        
+        # Build the heavy subsystems once the window has painted
+        self.root.after_idle(self.warm_up_components)
         
-        # Simulate startup checks
-        self.root.after(500, self.check_api_connection)
+    def warm_up_components(self):
+        """Build lazy subsystems in the background and probe the API
+        
+        The probe reports back through on_connection_checked /
+        on_connection_failed and also warms the connection pool for the
+        first message.
+        """
+        self.start_connection_probe()
+        
+        for component in (self.computer_actions, self.web_operations, self.control_panel.screenshot_manager):
+            self.bridge.run_blocking(component.warm_up, errback=self.on_warm_up_failed)
+            
+    def on_warm_up_failed(self, error):
+        """Report a subsystem that could not be built (it is retried on first use)"""
+        print(f"Warm-up failed: {str(error)}")
         
     def check_api_connection(self):
         """Check API connection and update status"""
-        try:
-            # Test API connection here
-            if Config.ANTHROPIC_API_KEY:
-                self.update_status("Connected", "online")
-                self.show_welcome_message()
-            else:
-                self.update_status("API Key Missing", "error")
-                
-        except Exception as e:
-            self.update_status(f"Connection Error: {str(e)}", "error")
+        if not Config.ANTHROPIC_API_KEY and Config.CLAUDE_TRANSPORT not in ("replay", "mock"):
+            self.update_status("API Key Missing", "error")
+            return
+        
+        self.update_status("Connecting...", "busy")
+        self.start_connection_probe()
+        
+    def start_connection_probe(self):
+        """Run the client's health probe on the bridge loop"""
+        self.bridge.submit(
+            self.probe_connection(),
+            callback=self.on_connection_checked,
+            errback=self.on_connection_failed
+        )
+        
+    async def probe_connection(self):
+        """Build the Claude client off the Tk thread, then probe the API"""
+        await self.bridge.to_thread(self.claude_client.warm_up)
+        return await self.claude_client.check_connection()
+        
+    def on_connection_checked(self, rtt):
+        """Show the measured round trip time once the probe succeeds"""
+        self.update_status(f"Connected ({rtt * 1000:.0f} ms)", "online")
+        self.show_welcome_message()
+        
+    def on_connection_failed(self, error):
+        """Show why the health probe failed"""
+        self.update_status(f"Connection Error: {str(error)}", "error")
             
     def show_welcome_message(self):
         """Show enhanced welcome message"""
@@ -389,8 +436,9 @@ class EnhancedMainWindow:
                 
             # Recreate Claude client if API settings changed
             if 'ANTHROPIC_API_KEY' in new_config or 'CLAUDE_MODEL' in new_config:
-                self.claude_client = ClaudeClient()
+                self.claude_client = LazyProxy("core.async_claude_client", "AsyncClaudeClient")
                 self.chat_panel.claude_client = self.claude_client
+                self.chat_panel.summarizer.claude_client = self.claude_client
                 self.check_api_connection()
                 
         except Exception as e:
@@ -416,6 +464,9 @@ class EnhancedMainWindow:
                 # Save any pending history
                 self.history_manager.save_history()
                 
+                # Cancel in-flight requests and stop the event loop
+                self.bridge.shutdown()
+                
                 # Update status
                 self.update_status("Shutting down...", "offline")
                 
@@ -3,27 +3,61 @@ Modern Chat Panel for Claude Computer Use Assistant
 Enhanced chat interface with modern styling and improved messaging
 """
 
+import asyncio
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import threading
+import time
 from datetime import datetime
 import re
 import webbrowser
 from config import Config
+from core.context_packer import ContextPacker
+from core.history_summarizer import HistorySummarizer
+from core.tool_registry import TOOL_REGISTRY, SIDE_EFFECT_DESKTOP, ToolInputError
+from core.tool_scheduler import ToolScheduler
 from gui.modern_theme import ModernTheme
+from utils.telemetry import TelemetryStore
 
 class ModernChatPanel:
-    def __init__(self, parent, claude_client, control_panel, history_manager, styler):
+    def __init__(self, parent, claude_client, control_panel, history_manager, styler, bridge):
         self.parent = parent
         self.claude_client = claude_client
         self.control_panel = control_panel
         self.history_manager = history_manager
         self.styler = styler
+        self.bridge = bridge
         self.theme = ModernTheme()
         
         # Message counter
         self.message_count = 0
         
+        # Streaming state (deltas are buffered and flushed in batches)
+        self.stream_lock = threading.Lock()
+        self.stream_buffer = []
+        self.stream_flush_scheduled = False
+        self.stream_active = False
+        self.stream_text = ""
+        
+        # Futures of running turns, cancelled by the Stop button
+        self.active_turns = []
+        
+        # Latency and token usage of every turn
+        self.telemetry = TelemetryStore()
+        
+        # Tool handlers are registered once; the scheduler runs independent
+        # read-only calls concurrently
+        self.tool_registry = TOOL_REGISTRY
+        self.bind_tool_handlers()
+        self.tool_scheduler = ToolScheduler(registry=self.tool_registry)
+        
+        # Worker of the last desktop action; a timed-out one may still be running
+        self.desktop_worker = None
+        
+        # Background compaction of messages evicted from the history window
+        self.summarizer = HistorySummarizer(claude_client)
+        self.summary_future = None
+        
         # Create chat interface
         self.create_modern_chat_interface()
         
@@ -296,8 +330,17 @@ class ModernChatPanel:
         self.send_button.bind('<Enter>', lambda e: self.send_button.config(bg=self.theme.COLORS['accent_secondary']))
         self.send_button.bind('<Leave>', lambda e: self.send_button.config(bg=self.theme.COLORS['accent_success']))
         
+        # Stop button, enabled while a turn is running
+        self.stop_button = tk.Button(send_container, text="■",
+                                     command=self.stop_generation,
+                                     width=3,
+                                     state='disabled')
+        self.stop_button.pack(fill='y', expand=False, pady=(self.theme.SPACING['sm'], 0), padx=(self.theme.SPACING['md'], 0))
+        self.styler.apply_modern_style(self.stop_button, 'secondary')
+        
         # Bind keyboard shortcuts
         self.message_input.bind('<Control-Return>', self.send_message_event)
+        self.message_input.bind('<Escape>', self.stop_generation)
         self.message_input.bind('<KeyRelease>', self.on_input_change)
         
         # Auto-resize input
@@ -314,8 +357,8 @@ class ModernChatPanel:
         """Handle input changes for real-time features"""
         content = self.message_input.get('1.0', 'end-1c').strip()
         
-        # Update send button state
-        if content:
+        # Update send button state (a running turn keeps it disabled)
+        if content and not self.active_turns:
             self.styler.apply_modern_style(self.send_button, 'primary')
             self.send_button.config(state='normal')
         else:
@@ -325,10 +368,12 @@ class ModernChatPanel:
         self.auto_resize_input()
         
     def quick_screenshot(self):
-        """Take a quick screenshot and enable include option"""
-        self.control_panel.take_screenshot()
-        self.include_screenshot_var.set(True)
-        self.add_system_message("📸 Screenshot captured and will be included with next message")
+        """Take a quick screenshot and enable include option once it is captured"""
+        def on_captured(screenshot):
+            self.include_screenshot_var.set(True)
+            self.add_system_message("📸 Screenshot captured and will be included with next message")
+        
+        self.control_panel.take_screenshot(on_done=on_captured)
         
     def send_message_event(self, event):
         """Handle Enter key press"""
@@ -341,6 +386,11 @@ class ModernChatPanel:
         if not message:
             messagebox.showwarning("Empty Message", "Please enter a message")
             return
+        
+        # One turn at a time: turns share the stream display and the history
+        if self.active_turns:
+            self.add_system_message("⏳ Claude is still replying - wait for it or press Stop")
+            return
             
         # Check for special commands
         if self.handle_special_commands(message):
@@ -362,6 +412,9 @@ class ModernChatPanel:
                 messagebox.showwarning("No Page Content", "Please load a web page first")
                 return
         
+        # Snapshot prior turns before the new message joins the history
+        history = self.history_manager.get_messages()
+        
         # Clear input and reset options
         self.message_input.delete('1.0', 'end')
         self.include_screenshot_var.set(False)
@@ -370,12 +423,24 @@ class ModernChatPanel:
         # Add user message to chat
         self.add_user_message(message, has_screenshot=screenshot is not None)
         
-        # Update status and send in separate thread
+        # Update status and send on the async bridge
         if hasattr(self.parent.master.master, 'update_status'):
             self.parent.master.master.update_status("Sending message...", "busy")
         
-        threading.Thread(target=self.send_message_thread, 
-                        args=(message, screenshot, page_content), daemon=True).start()
+        # The turn stays active until its task has finished cleaning up
+        turn_state = {'future': None, 'started': False}
+        
+        def on_done(future):
+            # The task ends its own turn from its finally; one cancelled
+            # before it started never gets there
+            if future.cancelled() and not turn_state['started']:
+                self.bridge.call_in_ui(self.end_turn, turn_state)
+        
+        turn_state['future'] = self.bridge.submit(
+            self.send_message_task(message, screenshot, page_content, history, turn_state))
+        turn_state['future'].add_done_callback(on_done)
+        self.active_turns.append(turn_state)
+        self.set_turn_active(True)
         
     def handle_special_commands(self, message):
         """Handle special commands like sending texts"""
@@ -451,22 +516,202 @@ class ModernChatPanel:
         except Exception as e:
             self.add_system_message(f"❌ Error opening Google Voice: {str(e)}")
         
-    def send_message_thread(self, message, screenshot=None, page_content=None):
-        """Send message in separate thread"""
+    async def send_message_task(self, message, screenshot=None, page_content=None, history=None,
+                                turn_state=None):
+        """Run one chat turn on the async bridge loop
+        
+        Tool results are sent back to Claude automatically until it stops
+        calling tools or MAX_TOOL_ITERATIONS is used up. A telemetry record
+        is stored for every turn, however it ends, and the turn is ended
+        (see end_turn) only once everything else has been cleaned up.
+        """
+        if turn_state is not None:
+            turn_state['started'] = True
+        turn = self.telemetry.start_turn()
+        outcome = "error"
+        
         try:
-            # Add conversation context
-            context = self.history_manager.get_context()
-            full_message = context + message
+            messages = await self.claude_client.build_messages(message, screenshot, page_content, history)
+            encoded = self.claude_client.last_image_encoding
+            if encoded:
+                turn['encode_time'] = encoded.encode_time
             
-            # Send to Claude
-            response = self.claude_client.send_message(full_message, screenshot, page_content)
+            for step in range(Config.MAX_TOOL_ITERATIONS + 1):
+                request_start = time.perf_counter()
+                response = await self.request_response(messages, turn)
+                request_time = time.perf_counter() - request_start
+                self.telemetry.add_request(turn, self.claude_client)
+                
+                tool_calls = [block for block in response.content if block.type == "tool_use"]
+                if not tool_calls:
+                    self.log_step(turn, step, request_time)
+                    break
+                    
+                if step == Config.MAX_TOOL_ITERATIONS:
+                    self.log_step(turn, step, request_time)
+                    self.bridge.call_in_ui(
+                        self.add_system_message,
+                        f"⚠️ Stopped after {Config.MAX_TOOL_ITERATIONS} tool iterations"
+                    )
+                    break
+                
+                # Execute tool calls and return their results to Claude
+                tools_start = time.perf_counter()
+                tools_before = len(turn['tools'])
+                tool_results = await self.execute_tool_calls(tool_calls, turn['tools'])
+                # Screenshots returned by tools are encoded too
+                turn['encode_time'] += sum(tool['encode_time'] for tool in turn['tools'][tools_before:])
+                self.log_step(turn, step, request_time, len(tool_calls), time.perf_counter() - tools_start)
+                
+                messages = self.claude_client.continue_messages(messages, response, tool_results)
             
-            # Process response
-            self.parent.after(0, self.process_claude_response, response)
+            outcome = "ok"
             
+        except asyncio.CancelledError:
+            outcome = "stopped"
+            self.bridge.call_in_ui(self.on_turn_stopped)
+            raise
         except Exception as e:
             error_message = f"Error sending message: {str(e)}"
-            self.parent.after(0, self.handle_error, error_message)
+            self.bridge.call_in_ui(self.handle_error, error_message)
+        finally:
+            self.telemetry.finish_turn(turn, outcome)
+            self.bridge.call_in_ui(self.control_panel.update_telemetry, self.telemetry.summary())
+            self.bridge.call_in_ui(self.end_turn, turn_state)
+            
+    async def request_response(self, messages, turn):
+        """Send one request of the turn and display Claude's response"""
+        if Config.ENABLE_STREAMING:
+            return await self.stream_claude_response(messages, turn)
+        
+        # Send to Claude and wait for the full response
+        response = await self.claude_client.create_message(messages)
+        self.telemetry.mark_first_output(turn)
+        self.bridge.call_in_ui(self.process_claude_response, response)
+        return response
+        
+    def log_step(self, turn, step, request_time, tool_count=0, tool_time=0.0):
+        """Record and log the timing of one step of the tool loop"""
+        turn['steps'].append({
+            'step': step + 1,
+            'request_time': request_time,
+            'tool_count': tool_count,
+            'tool_time': tool_time
+        })
+        
+        summary = f"Step {step + 1}: request {request_time:.2f}s"
+        if tool_count:
+            summary += f", {tool_count} tool call(s) {tool_time:.2f}s"
+        self.bridge.call_in_ui(self.control_panel.log_action, summary)
+            
+    async def stream_claude_response(self, messages, turn):
+        """Stream Claude's response into the chat and return the final message"""
+        received_output = False
+        
+        try:
+            async for kind, payload in self.claude_client.stream_messages(messages):
+                if kind == "text":
+                    received_output = True
+                    self.telemetry.mark_first_output(turn)
+                    self.queue_stream_text(payload)
+                elif kind == "tool_use":
+                    received_output = True
+                    self.telemetry.mark_first_output(turn)
+                elif kind == "message":
+                    self.bridge.call_in_ui(self.finish_stream, payload)
+                    return payload
+                    
+        except Exception as e:
+            if received_output:
+                # Keep whatever already arrived before reporting the error
+                self.bridge.call_in_ui(self.finish_stream, None)
+                raise
+            
+            # Invalid requests would fail the same way without streaming
+            status_code = getattr(e, 'status_code', None)
+            if status_code and 400 <= status_code < 500 and status_code not in (408, 409, 429):
+                raise
+            
+            # Fall back to the blocking request if the stream failed up front
+            response = await self.claude_client.create_message(messages)
+            self.telemetry.mark_first_output(turn)
+            self.bridge.call_in_ui(self.process_claude_response, response)
+            return response
+            
+    def queue_stream_text(self, text):
+        """Buffer a streamed text delta and schedule a coalesced UI update"""
+        with self.stream_lock:
+            self.stream_buffer.append(text)
+            if self.stream_flush_scheduled:
+                return
+            self.stream_flush_scheduled = True
+            
+        self.bridge.call_in_ui(self.parent.after, Config.STREAM_UPDATE_INTERVAL, self.flush_stream_buffer)
+        
+    def flush_stream_buffer(self):
+        """Append all buffered deltas to the chat display in one update"""
+        with self.stream_lock:
+            text = "".join(self.stream_buffer)
+            self.stream_buffer.clear()
+            self.stream_flush_scheduled = False
+            
+        if not text:
+            return
+            
+        self.chat_display.config(state=tk.NORMAL)
+        
+        if not self.stream_active:
+            self.insert_assistant_header()
+            self.chat_display.mark_set('stream_start', tk.END + '-1c')
+            self.chat_display.mark_gravity('stream_start', tk.LEFT)
+            self.stream_active = True
+            self.stream_text = ""
+            
+        self.stream_text += text
+        self.chat_display.insert(tk.END, text, 'assistant_msg')
+        
+        self.chat_display.config(state=tk.DISABLED)
+        self.chat_display.see(tk.END)
+        
+    def finish_stream(self, response, stopped=False):
+        """Finalize a streamed response (response is None if it broke off)"""
+        self.flush_stream_buffer()
+        
+        if self.stream_active:
+            # Re-render the streamed text with full formatting
+            self.chat_display.config(state=tk.NORMAL)
+            self.chat_display.delete('stream_start', tk.END)
+            self.format_and_insert_message(self.stream_text, 'assistant_msg')
+            self.chat_display.insert(tk.END, "\n")
+            self.chat_display.config(state=tk.DISABLED)
+            self.chat_display.see(tk.END)
+            
+        if response is None:
+            # Stream broke off; keep the partial text in history
+            if self.stream_text:
+                partial = self.stream_text + (" [stopped]" if stopped else " [interrupted]")
+                self.history_manager.add_message("Claude", partial)
+            self.stream_active = False
+            self.stream_text = ""
+            return
+            
+        try:
+            tool_calls = [block for block in response.content if block.type == "tool_use"]
+            self.record_assistant_turn(self.stream_text, tool_calls, response)
+            self.stream_active = False
+            self.stream_text = ""
+            
+            # Update status with time to first token and cache usage
+            stats = self.claude_client.last_stream_stats
+            usage = self.report_usage()
+            if hasattr(self.parent.master.master, 'update_status'):
+                ttft = stats.get('time_to_first_token')
+                status = f"Response received (first token {ttft:.2f}s)" if ttft is not None else "Response received"
+                self.parent.master.master.update_status(f"{status} • {usage}", "online")
+                
+        except Exception as e:
+            error_message = f"Error processing response: {str(e)}"
+            self.handle_error(error_message)
             
     def process_claude_response(self, response):
         """Process Claude's response with enhanced formatting"""
@@ -483,49 +728,260 @@ class ModernChatPanel:
             
             # Add Claude's text response to chat
             if text_content:
-                self.add_assistant_message(text_content)
-            
-            # Execute tool calls if any
-            if tool_calls:
-                self.execute_tool_calls(tool_calls)
+                self.add_assistant_message(text_content, record=False)
+            self.record_assistant_turn(text_content, tool_calls, response)
                 
             # Update status
+            usage = self.report_usage()
             if hasattr(self.parent.master.master, 'update_status'):
-                self.parent.master.master.update_status("Response received", "online")
+                self.parent.master.master.update_status(f"Response received • {usage}", "online")
             
         except Exception as e:
             error_message = f"Error processing response: {str(e)}"
             self.handle_error(error_message)
             
-    def execute_tool_calls(self, tool_calls):
-        """Execute tool calls from Claude"""
-        for tool_call in tool_calls:
-            tool_name = tool_call.name
-            tool_input = tool_call.input
+    def stop_generation(self, event=None):
+        """Cancel in-flight Claude requests and pending tool calls"""
+        if not self.active_turns:
+            return
             
-            self.add_system_message(f"🔧 Executing {tool_name}: {tool_input}")
+        # Each turn cleans up after itself once its cancellation lands (see end_turn)
+        for turn_state in self.active_turns:
+            turn_state['future'].cancel()
+        self.stop_button.config(state='disabled')
+        
+    def on_turn_stopped(self):
+        """Record partial output after a turn was cancelled"""
+        self.finish_stream(None, stopped=True)
+        self.add_system_message("⏹ Stopped by user")
+        self.control_panel.log_action("Claude request stopped by user")
+        
+        if hasattr(self.parent.master.master, 'update_status'):
+            self.parent.master.master.update_status("Stopped", "online")
             
-            try:
-                if tool_name == "computer":
-                    result = self.control_panel.computer_actions.execute_action(tool_input)
-                elif tool_name == "file_operations":
-                    result = self.control_panel.file_operations.execute_operation(tool_input)
-                elif tool_name == "web_operations":
-                    result = self.control_panel.web_operations.execute_operation(tool_input)
-                else:
-                    result = f"Unknown tool: {tool_name}"
-                
-                # Log the action
-                self.control_panel.log_action(f"Tool: {tool_name} - {str(result)[:100]}")
+    def end_turn(self, turn_state):
+        """Forget a finished turn, re-enable Send when none are running and fold old history"""
+        if turn_state in self.active_turns:
+            self.active_turns.remove(turn_state)
+        if not self.active_turns:
+            self.set_turn_active(False)
+        
+        self.refresh_summary()
+        
+    def set_turn_active(self, active):
+        """Swap Send and Stop while a turn is running"""
+        self.stop_button.config(state='normal' if active else 'disabled')
+        if active:
+            self.send_button.config(state='disabled')
+        else:
+            self.on_input_change()
+        
+    def refresh_summary(self):
+        """Fold evicted history into the running summary in the background"""
+        if self.summary_future or not self.history_manager.needs_summary():
+            return
+            
+        entries = list(self.history_manager.unsummarized)
+        
+        def on_summary(summary):
+            self.summary_future = None
+            # Skip if the history was cleared meanwhile
+            if self.history_manager.unsummarized[:len(entries)] == entries:
+                self.history_manager.apply_summary(summary, len(entries))
+                self.control_panel.log_action(f"History summary updated ({len(entries)} older messages folded in)")
                 
-                # Add result to chat
-                self.add_system_message(f"✅ Result: {str(result)[:500]}")
+        def on_error(error):
+            self.summary_future = None
+            self.control_panel.log_action(f"History summary failed: {str(error)}")
+            
+        self.summary_future = self.bridge.submit(
+            self.summarizer.summarize(self.history_manager.summary, entries),
+            callback=on_summary,
+            errback=on_error
+        )
+            
+    def report_usage(self):
+        """Log token usage and prompt cache hits of the last response"""
+        usage = self.claude_client.last_usage
+        summary = (
+            f"tokens in {usage.get('input_tokens', 0)} / out {usage.get('output_tokens', 0)}, "
+            f"cache read {usage.get('cache_read_input_tokens', 0)} / "
+            f"write {usage.get('cache_creation_input_tokens', 0)}"
+        )
+        self.control_panel.log_action(f"Usage: {summary}")
+        
+        if self.claude_client.last_response_cached:
+            cache = self.claude_client.response_cache.stats()
+            self.control_panel.log_action(
+                f"Response served from cache (hit rate {cache['hit_rate']:.0%}, "
+                f"{cache['saved_latency']:.1f}s saved so far)"
+            )
+            return "cached response"
+        
+        attempts = self.claude_client.retry_policy.last_attempts
+        if len(attempts) > 1:
+            latencies = ", ".join(f"{attempt['latency']:.2f}s" for attempt in attempts)
+            self.control_panel.log_action(f"Request succeeded after {len(attempts)} attempts ({latencies})")
+        
+        queue = self.claude_client.rate_limiter.metrics()
+        if self.claude_client.last_queue_wait > 0.05 or queue['queue_depth']:
+            self.control_panel.log_action(
+                f"Rate limit queue: waited {self.claude_client.last_queue_wait:.2f}s, "
+                f"{queue['queue_depth']} request(s) waiting"
+            )
+        
+        encoded = self.claude_client.last_image_encoding
+        if encoded:
+            self.control_panel.log_action(f"Screenshot encoded: {encoded.describe()}")
+        
+        context = self.claude_client.last_context_report
+        if context and (context['dropped'] or context['truncated']):
+            self.control_panel.log_action(
+                f"Context ~{context['used']}/{context['budget']} tokens: {ContextPacker.describe(context)}"
+            )
+        return summary
+        
+    def record_assistant_turn(self, text_content, tool_calls, response):
+        """Record Claude's turn, including tool_use blocks, in history"""
+        if not text_content and not tool_calls:
+            return
+            
+        message = text_content or f"[Requested tools: {', '.join(call.name for call in tool_calls)}]"
+        blocks = self.claude_client.content_to_blocks(response.content)
+        self.history_manager.add_message("Claude", message, content=blocks)
+        
+    def bind_tool_handlers(self):
+        """Attach the control panel's executors to the tool registry
+        
+        Computer and web operations are lazy (see utils.lazy); binding must
+        not build them on the Tk thread.
+        """
+        self.tool_registry.bind("computer", self.control_panel.computer_actions.method("execute_action"))
+        self.tool_registry.bind("file_operations", self.control_panel.file_operations.execute_operation)
+        self.tool_registry.bind("web_operations", self.control_panel.web_operations.method("execute_operation"))
+        
+    async def execute_tool_calls(self, tool_calls, timings=None):
+        """Execute tool calls from Claude (async bridge loop)
+        
+        Independent read-only calls run concurrently (see ToolScheduler);
+        computer actions and other side effects keep their order. Each call
+        returns a tool_result block linked by tool_use_id, in tool_use order.
+        If the turn is stopped, calls without a result are answered with
+        error results so history stays paired. Each call's duration and
+        screenshot encoding time are appended to timings when given. A desktop action that times out or
+        is cancelled keeps running on its thread, so the next one waits
+        for it to exit (see wait_for_desktop_worker).
+        """
+        tool_results = [None] * len(tool_calls)
+        
+        # Coordinates in this batch refer to the last screenshot Claude saw
+        scaling = self.claude_client.screen_scaling
+        
+        async def run_call(index, tool_call):
+            self.bridge.call_in_ui(self.add_system_message, f"🔧 Executing {tool_call.name}: {tool_call.input}")
+            timeout = self.tool_registry.timeout(tool_call.name)
+            start_time = time.perf_counter()
+            desktop = self.tool_registry.side_effect(tool_call.name, tool_call.input) == SIDE_EFFECT_DESKTOP
+            if desktop:
+                await self.wait_for_desktop_worker()
+            
+            encodings = []
+            worker = asyncio.ensure_future(
+                self.bridge.to_thread(self.execute_tool_call, tool_call, scaling, encodings))
+            if desktop:
+                self.desktop_worker = worker
+            try:
+                # Shielded: a timeout or cancellation stops waiting, not the worker
+                tool_results[index] = await asyncio.wait_for(asyncio.shield(worker), timeout)
+            except asyncio.TimeoutError:
+                # The worker thread cannot be interrupted; Claude is told it timed out
+                self.bridge.call_in_ui(self.add_system_message, f"❌ {tool_call.name} timed out after {timeout}s")
+                tool_results[index] = self.claude_client.tool_result_block(
+                    tool_call.id, f"Tool timed out after {timeout}s", is_error=True)
+            
+            if timings is not None:
+                timings.append({
+                    'name': tool_call.name,
+                    'duration': time.perf_counter() - start_time,
+                    'encode_time': sum(encoded.encode_time for encoded in encodings),
+                    'error': bool(tool_results[index].get('is_error'))
+                })
+        
+        try:
+            await self.tool_scheduler.run(tool_calls, run_call)
+        finally:
+            for index, tool_call in enumerate(tool_calls):
+                if tool_results[index] is None:
+                    tool_results[index] = self.claude_client.tool_result_block(
+                        tool_call.id, "Cancelled by user", is_error=True)
                 
-            except Exception as e:
-                error_msg = f"Tool execution error: {str(e)}"
-                self.add_system_message(f"❌ {error_msg}")
-                self.control_panel.log_action(error_msg)
+            # Record results so the next request carries matching tool_result blocks
+            if tool_results:
+                summary = "; ".join(
+                    f"{call.name} {'failed' if result.get('is_error') else 'done'}"
+                    for call, result in zip(tool_calls, tool_results)
+                )
+                self.bridge.call_in_ui(self.history_manager.add_tool_results, tool_results, summary)
                 
+        return tool_results
+        
+    async def wait_for_desktop_worker(self):
+        """Wait until the previous desktop action's thread has exited
+        
+        Worker threads cannot be interrupted, so mouse and keyboard actions
+        would interleave if the next one started while a timed-out or
+        cancelled one was still running.
+        """
+        worker = self.desktop_worker
+        if worker is not None and not worker.done():
+            self.bridge.call_in_ui(self.add_system_message, "⏳ Waiting for the previous desktop action to finish")
+            await asyncio.wait({worker})
+        
+    def execute_tool_call(self, tool_call, scaling=None, encodings=None):
+        """Execute a single tool call and return its tool_result block (worker thread)
+        
+        A screenshot attached to the result is encoded here; its encoding
+        is appended to encodings when given.
+        """
+        tool_name = tool_call.name
+        tool_input = tool_call.input
+        screenshot = None
+        
+        try:
+            if tool_name == "computer":
+                self.control_panel.computer_actions.last_screenshot = None
+            
+            # Validates the input, then runs the registered handler. Claude's
+            # coordinates refer to the (possibly downscaled) screenshot it saw
+            result = self.tool_registry.dispatch(tool_name, tool_input, scaling=scaling)
+            
+            if tool_name == "computer" and tool_input.get("action") == "screenshot":
+                screenshot = self.control_panel.computer_actions.last_screenshot
+            
+            # Log the action
+            self.bridge.call_in_ui(self.control_panel.log_action, f"Tool: {tool_name} - {str(result)[:100]}")
+            
+            # Add result to chat
+            self.bridge.call_in_ui(self.add_system_message, f"✅ Result: {str(result)[:500]}")
+            block = self.claude_client.tool_result_block(tool_call.id, result, screenshot=screenshot)
+            if screenshot is not None and encodings is not None:
+                # Desktop actions run one at a time, so this is still ours
+                encodings.append(self.claude_client.last_image_encoding)
+            return block
+            
+        except ToolInputError as e:
+            # Rejected before anything ran
+            error_msg = f"Invalid tool input: {str(e)}"
+            self.bridge.call_in_ui(self.add_system_message, f"❌ {error_msg}")
+            self.bridge.call_in_ui(self.control_panel.log_action, error_msg)
+            return self.claude_client.tool_result_block(tool_call.id, error_msg, is_error=True)
+            
+        except Exception as e:
+            error_msg = f"Tool execution error: {str(e)}"
+            self.bridge.call_in_ui(self.add_system_message, f"❌ {error_msg}")
+            self.bridge.call_in_ui(self.control_panel.log_action, error_msg)
+            return self.claude_client.tool_result_block(tool_call.id, error_msg, is_error=True)
+            
     def add_user_message(self, message, has_screenshot=False):
         """Add a user message with modern styling"""
         timestamp = datetime.now().strftime("%H:%M:%S")
@@ -558,16 +1014,10 @@ class ModernChatPanel:
         self.chat_display.config(state=tk.DISABLED)
         self.chat_display.see(tk.END)
         
-    def add_assistant_message(self, message):
-        """Add an assistant message with modern styling"""
+    def insert_assistant_header(self):
+        """Insert the timestamp and name that start an assistant message"""
         timestamp = datetime.now().strftime("%H:%M:%S")
         
-        # Add to history
-        self.history_manager.add_message("Claude", message)
-        
-        # Add to display
-        self.chat_display.config(state=tk.NORMAL)
-        
         # Add spacing
         self.chat_display.insert(tk.END, "\n")
         
@@ -577,6 +1027,16 @@ class ModernChatPanel:
         # Add assistant name
         self.chat_display.insert(tk.END, "Claude: ", 'assistant_name')
         
+    def add_assistant_message(self, message, record=True):
+        """Add an assistant message with modern styling"""
+        # Add to history
+        if record:
+            self.history_manager.add_message("Claude", message)
+        
+        # Add to display
+        self.chat_display.config(state=tk.NORMAL)
+        self.insert_assistant_header()
+        
         # Add message content with enhanced formatting
         self.format_and_insert_message(message, 'assistant_msg')
         
@@ -11,13 +11,14 @@ from pathlib import Path
 import webbrowser
 from datetime import datetime
 from config import Config
-from utils.screenshot import ScreenshotManager
+from utils.lazy import LazyProxy
 from utils.logging import ActionLogger
 from gui.modern_theme import ModernTheme
 
 class ModernControlPanel:
-    def __init__(self, parent, claude_client, computer_actions, file_operations, web_operations, history_manager, styler):
+    def __init__(self, parent, claude_client, computer_actions, file_operations, web_operations, history_manager, styler, bridge):
         self.parent = parent
+        self.bridge = bridge
         self.claude_client = claude_client
         self.computer_actions = computer_actions
         self.file_operations = file_operations
@@ -25,7 +26,7 @@ class ModernControlPanel:
         self.history_manager = history_manager
         self.styler = styler
         self.theme = ModernTheme()
-        self.screenshot_manager = ScreenshotManager()
+        self.screenshot_manager = LazyProxy("utils.screenshot", "ScreenshotManager")
         
         # Action counter
         self.action_count = 0
@@ -69,6 +70,12 @@ class ModernControlPanel:
         self.action_counter_label.pack(side='right', anchor='e')
         self.styler.apply_modern_style(self.action_counter_label, 'caption')
         
+        # Turn latency percentiles (see update_telemetry)
+        self.telemetry_label = tk.Label(header_frame, text="",
+                                       font=self.theme.FONTS['caption'])
+        self.telemetry_label.pack(side='right', anchor='e', padx=self.theme.SPACING['md'])
+        self.styler.apply_modern_style(self.telemetry_label, 'caption')
+        
     def create_modern_tabs(self):
         """Create modern tabbed interface"""
         # Create notebook with modern styling
@@ -450,23 +457,26 @@ class ModernControlPanel:
         self.styler.apply_modern_style(self.log_text)
         
     # Screenshot methods
-    def take_screenshot(self):
-        """Take a screenshot with enhanced feedback"""
-        def screenshot_thread():
-            try:
-                screenshot = self.screenshot_manager.take_screenshot()
-                thumbnail = self.screenshot_manager.get_thumbnail()
-                
-                # Update UI in main thread
-                self.parent.after(0, self.update_screenshot_display, screenshot, thumbnail)
-                self.log_action("Screenshot taken successfully")
-                self.increment_action_counter()
-                
-            except Exception as e:
-                self.log_action(f"Screenshot failed: {str(e)}")
-                self.parent.after(0, lambda: messagebox.showerror("Screenshot Error", str(e)))
+    def take_screenshot(self, on_done=None):
+        """Take a screenshot with enhanced feedback
+        
+        The capture runs off the UI thread; on_done(screenshot) is called on
+        the UI thread once it has succeeded.
+        """
+        def on_captured(screenshot):
+            thumbnail = self.screenshot_manager.get_thumbnail()
+            self.update_screenshot_display(screenshot, thumbnail)
+            self.log_action("Screenshot taken successfully")
+            self.increment_action_counter()
+            if on_done:
+                on_done(screenshot)
+            
+        def on_error(e):
+            self.log_action(f"Screenshot failed: {str(e)}")
+            messagebox.showerror("Screenshot Error", str(e))
         
-        threading.Thread(target=screenshot_thread, daemon=True).start()
+        self.bridge.run_blocking(self.screenshot_manager.method("take_screenshot"),
+                                 callback=on_captured, errback=on_error)
         
     def update_screenshot_display(self, screenshot, thumbnail):
         """Update screenshot display with modern styling"""
@@ -548,15 +558,15 @@ class ModernControlPanel:
             
     def execute_computer_action(self, action_data):
         """Execute computer action"""
-        def action_thread():
-            try:
-                result = self.computer_actions.execute_action(action_data)
-                self.log_action(f"Computer action: {result}")
-                self.increment_action_counter()
-            except Exception as e:
-                self.log_action(f"Computer action failed: {str(e)}")
-                
-        threading.Thread(target=action_thread, daemon=True).start()
+        def on_done(result):
+            self.log_action(f"Computer action: {result}")
+            self.increment_action_counter()
+            
+        def on_error(e):
+            self.log_action(f"Computer action failed: {str(e)}")
+            
+        self.bridge.run_blocking(self.computer_actions.method("execute_action"), action_data,
+                                 callback=on_done, errback=on_error)
         
     def track_mouse_position(self):
         """Track and display mouse position"""
@@ -597,24 +607,21 @@ class ModernControlPanel:
             messagebox.showwarning("No File", "Please enter a file path or browse for a file")
             return
             
-        def read_thread():
-            try:
-                operation_data = {
-                    "operation": "read",
-                    "file_path": file_path
-                }
-                result = self.file_operations.execute_operation(operation_data)
-                
-                # Update UI in main thread
-                self.parent.after(0, self.update_file_content, result)
-                self.log_action(f"Read file: {file_path}")
-                self.increment_action_counter()
-                
-            except Exception as e:
-                self.log_action(f"File read error: {str(e)}")
-                self.parent.after(0, lambda: messagebox.showerror("File Error", str(e)))
+        def on_read(result):
+            self.update_file_content(result)
+            self.log_action(f"Read file: {file_path}")
+            self.increment_action_counter()
+            
+        def on_error(e):
+            self.log_action(f"File read error: {str(e)}")
+            messagebox.showerror("File Error", str(e))
         
-        threading.Thread(target=read_thread, daemon=True).start()
+        operation_data = {
+            "operation": "read",
+            "file_path": file_path
+        }
+        self.bridge.run_blocking(self.file_operations.execute_operation, operation_data,
+                                 callback=on_read, errback=on_error)
         
     def update_file_content(self, result):
         """Update file content display"""
@@ -631,24 +638,21 @@ class ModernControlPanel:
         """List directory contents"""
         dir_path = self.file_path_var.get().strip() or "."
         
-        def list_thread():
-            try:
-                operation_data = {
-                    "operation": "list",
-                    "file_path": dir_path
-                }
-                result = self.file_operations.execute_operation(operation_data)
-                
-                # Update UI in main thread
-                self.parent.after(0, self.update_directory_listing, result)
-                self.log_action(f"Listed directory: {dir_path}")
-                self.increment_action_counter()
-                
-            except Exception as e:
-                self.log_action(f"Directory list error: {str(e)}")
-                self.parent.after(0, lambda: messagebox.showerror("Directory Error", str(e)))
+        def on_listed(result):
+            self.update_directory_listing(result)
+            self.log_action(f"Listed directory: {dir_path}")
+            self.increment_action_counter()
+            
+        def on_error(e):
+            self.log_action(f"Directory list error: {str(e)}")
+            messagebox.showerror("Directory Error", str(e))
         
-        threading.Thread(target=list_thread, daemon=True).start()
+        operation_data = {
+            "operation": "list",
+            "file_path": dir_path
+        }
+        self.bridge.run_blocking(self.file_operations.execute_operation, operation_data,
+                                 callback=on_listed, errback=on_error)
         
     def update_directory_listing(self, result):
         """Update directory listing display"""
@@ -675,24 +679,22 @@ class ModernControlPanel:
             messagebox.showwarning("No Content", "Please enter content to write")
             return
             
-        def write_thread():
-            try:
-                operation_data = {
-                    "operation": "write",
-                    "file_path": file_path,
-                    "content": content
-                }
-                result = self.file_operations.execute_operation(operation_data)
-                
-                self.log_action(f"Wrote file: {file_path}")
-                self.increment_action_counter()
-                self.parent.after(0, lambda: messagebox.showinfo("Success", str(result)))
-                
-            except Exception as e:
-                self.log_action(f"File write error: {str(e)}")
-                self.parent.after(0, lambda: messagebox.showerror("File Error", str(e)))
-        
-        threading.Thread(target=write_thread, daemon=True).start()
+        def on_written(result):
+            self.log_action(f"Wrote file: {file_path}")
+            self.increment_action_counter()
+            messagebox.showinfo("Success", str(result))
+            
+        def on_error(e):
+            self.log_action(f"File write error: {str(e)}")
+            messagebox.showerror("File Error", str(e))
+        
+        operation_data = {
+            "operation": "write",
+            "file_path": file_path,
+            "content": content
+        }
+        self.bridge.run_blocking(self.file_operations.execute_operation, operation_data,
+                                 callback=on_written, errback=on_error)
         
     # Web operation methods
     def load_page(self):
@@ -702,24 +704,25 @@ class ModernControlPanel:
             messagebox.showwarning("No URL", "Please enter a URL")
             return
             
-        def load_thread():
-            try:
-                operation_data = {
-                    "operation": "load_page",
-                    "url": url
-                }
-                result = self.web_operations.execute_operation(operation_data)
-                
-                # Update UI in main thread
-                self.parent.after(0, self.update_web_content, result)
-                self.log_action(f"Loaded page: {url}")
-                self.increment_action_counter()
-                
-            except Exception as e:
-                self.log_action(f"Page load error: {str(e)}")
-                self.parent.after(0, lambda: messagebox.showerror("Web Error", str(e)))
+        def on_loaded(result):
+            self.update_web_content(result)
+            self.log_action(f"Loaded page: {url}")
+            if isinstance(result, dict) and result.get('cache'):
+                stats = self.web_operations.cache_stats()
+                self.log_action(f"HTTP cache: {result['cache']} ({stats['hits']} hits, "
+                                f"{stats['revalidated']} revalidated, {stats['misses']} misses)")
+            self.increment_action_counter()
+            
+        def on_error(e):
+            self.log_action(f"Page load error: {str(e)}")
+            messagebox.showerror("Web Error", str(e))
         
-        threading.Thread(target=load_thread, daemon=True).start()
+        operation_data = {
+            "operation": "load_page",
+            "url": url
+        }
+        self.bridge.run_blocking(self.web_operations.method("execute_operation"), operation_data,
+                                 callback=on_loaded, errback=on_error)
         
     def update_web_content(self, result):
         """Update web content display"""
@@ -738,39 +741,33 @@ class ModernControlPanel:
             
     def get_page_content(self):
         """Get current page content"""
-        def content_thread():
-            try:
-                operation_data = {"operation": "get_content"}
-                result = self.web_operations.execute_operation(operation_data)
-                
-                # Update UI in main thread
-                self.parent.after(0, self.update_web_content, result)
-                self.log_action("Retrieved current page content")
-                self.increment_action_counter()
-                
-            except Exception as e:
-                self.log_action(f"Get content error: {str(e)}")
-                self.parent.after(0, lambda: messagebox.showerror("Web Error", str(e)))
+        def on_content(result):
+            self.update_web_content(result)
+            self.log_action("Retrieved current page content")
+            self.increment_action_counter()
+            
+        def on_error(e):
+            self.log_action(f"Get content error: {str(e)}")
+            messagebox.showerror("Web Error", str(e))
         
-        threading.Thread(target=content_thread, daemon=True).start()
+        operation_data = {"operation": "get_content"}
+        self.bridge.run_blocking(self.web_operations.method("execute_operation"), operation_data,
+                                 callback=on_content, errback=on_error)
         
     def extract_links(self):
         """Extract links from current page"""
-        def extract_thread():
-            try:
-                operation_data = {"operation": "extract_links"}
-                result = self.web_operations.execute_operation(operation_data)
-                
-                # Update UI in main thread
-                self.parent.after(0, self.update_links_display, result)
-                self.log_action("Extracted links from current page")
-                self.increment_action_counter()
-                
-            except Exception as e:
-                self.log_action(f"Extract links error: {str(e)}")
-                self.parent.after(0, lambda: messagebox.showerror("Web Error", str(e)))
+        def on_extracted(result):
+            self.update_links_display(result)
+            self.log_action("Extracted links from current page")
+            self.increment_action_counter()
+            
+        def on_error(e):
+            self.log_action(f"Extract links error: {str(e)}")
+            messagebox.showerror("Web Error", str(e))
         
-        threading.Thread(target=extract_thread, daemon=True).start()
+        operation_data = {"operation": "extract_links"}
+        self.bridge.run_blocking(self.web_operations.method("execute_operation"), operation_data,
+                                 callback=on_extracted, errback=on_error)
         
     def update_links_display(self, result):
         """Update links display with enhanced formatting"""
@@ -797,23 +794,21 @@ class ModernControlPanel:
             messagebox.showwarning("No Search Text", "Please enter text to search")
             return
             
-        def search_thread():
-            try:
-                operation_data = {
-                    "operation": "search_elements",
-                    "search_text": search_text
-                }
-                result = self.web_operations.execute_operation(operation_data)
-                
-                self.log_action(f"Searched for: {search_text}")
-                self.increment_action_counter()
-                self.parent.after(0, lambda: messagebox.showinfo("Search Result", str(result)))
-                
-            except Exception as e:
-                self.log_action(f"Search error: {str(e)}")
-                self.parent.after(0, lambda: messagebox.showerror("Search Error", str(e)))
+        def on_searched(result):
+            self.log_action(f"Searched for: {search_text}")
+            self.increment_action_counter()
+            messagebox.showinfo("Search Result", str(result))
+            
+        def on_error(e):
+            self.log_action(f"Search error: {str(e)}")
+            messagebox.showerror("Search Error", str(e))
         
-        threading.Thread(target=search_thread, daemon=True).start()
+        operation_data = {
+            "operation": "search_elements",
+            "search_text": search_text
+        }
+        self.bridge.run_blocking(self.web_operations.method("execute_operation"), operation_data,
+                                 callback=on_searched, errback=on_error)
         
     def open_in_browser(self):
         """Open URL in browser"""
@@ -875,12 +870,28 @@ class ModernControlPanel:
                 
     def get_current_screenshot(self):
         """Get current screenshot for use by other components"""
+        if not self.screenshot_manager.is_loaded:
+            return None  # nothing captured yet
         return self.screenshot_manager.current_screenshot
         
     def get_current_page_content(self):
         """Get current page content for use by other components"""
+        if not self.web_operations.is_loaded:
+            return None  # no page loaded yet
         return self.web_operations.current_page_content
         
+    def update_telemetry(self, summary):
+        """Show p50/p95 turn latency and time to first token"""
+        def fmt(value):
+            return f"{value:.1f}s" if value is not None else "-"
+        
+        latency = summary['total_latency']
+        ttft = summary['time_to_first_token']
+        self.telemetry_label.config(
+            text=f"Turn p50 {fmt(latency['p50'])} / p95 {fmt(latency['p95'])} • "
+                 f"TTFT p50 {fmt(ttft['p50'])} / p95 {fmt(ttft['p95'])} ({summary['turns']} turns)"
+        )
+        
     def log_action(self, message):
         """Log an action with timestamp and auto-scroll"""
         self.logger.log(message)
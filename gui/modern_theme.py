@@ -338,6 +338,5 @@ class ModernStyler:
                            font=('Arial', 12))
         return indicator
 
-# Global theme instance
+# Global theme instance (ModernStyler needs a Tk root, so it is created by the window)
 theme = ModernTheme()
-styler = ModernStyler()
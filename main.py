@@ -7,43 +7,43 @@ import tkinter as tk
 from tkinter import messagebox
 import sys
 import os
+import importlib.util
 from pathlib import Path
 
 # Add the project directory to Python path
 project_dir = Path(__file__).parent
 sys.path.insert(0, str(project_dir))
 
+# --profile-startup[=PATH] times every import and startup phase (see utils.startup_profiler)
+PROFILE_ARG = next((arg for arg in sys.argv[1:] if arg.startswith("--profile-startup")), None)
+if PROFILE_ARG:
+    from utils.startup_profiler import start_profiling
+    profiler = start_profiling()
+
 from config import Config
 from gui.enhanced_main_window import EnhancedMainWindow
+from utils.startup_profiler import startup_phase
+
+if PROFILE_ARG:
+    profiler.add_phase("imports", profiler.start_time)
+
+# Required packages: pip name -> importable module
+REQUIRED_PACKAGES = {
+    "anthropic": "anthropic",
+    "pyautogui": "pyautogui",
+    "requests": "requests",
+    "beautifulsoup4": "bs4",
+    "pillow": "PIL"
+}
 
 def check_dependencies():
-    """Check if all required dependencies are installed"""
-    missing_deps = []
-    
-    try:
-        import anthropic
-    except ImportError:
-        missing_deps.append("anthropic")
-    
-    try:
-        import pyautogui
-    except ImportError:
-        missing_deps.append("pyautogui")
+    """Check if all required dependencies are installed
     
-    try:
-        import requests
-    except ImportError:
-        missing_deps.append("requests")
-    
-    try:
-        from bs4 import BeautifulSoup
-    except ImportError:
-        missing_deps.append("beautifulsoup4")
-    
-    try:
-        from PIL import Image
-    except ImportError:
-        missing_deps.append("pillow")
+    Uses find_spec so nothing is imported here; the heavy packages load
+    in the background once the window is up.
+    """
+    missing_deps = [name for name, module in REQUIRED_PACKAGES.items()
+                    if importlib.util.find_spec(module) is None]
     
     if missing_deps:
         deps_str = ", ".join(missing_deps)
@@ -56,28 +56,36 @@ def check_dependencies():
     
     return True
 
-def setup_pyautogui():
-    """Setup PyAutoGUI with safe defaults"""
-    try:
-        import pyautogui
-        pyautogui.FAILSAFE = Config.PYAUTOGUI_FAILSAFE
-        pyautogui.PAUSE = Config.PYAUTOGUI_PAUSE
-        
-        # Test basic functionality
-        pyautogui.position()
-        return True
-    except Exception as e:
+def check_pyautogui():
+    """Import and test PyAutoGUI (runs on the bridge executor)"""
+    import pyautogui
+    pyautogui.FAILSAFE = Config.PYAUTOGUI_FAILSAFE
+    pyautogui.PAUSE = Config.PYAUTOGUI_PAUSE
+    
+    # Test basic functionality
+    pyautogui.position()
+    return True
+
+def setup_pyautogui(app):
+    """Setup PyAutoGUI with safe defaults once the window is up"""
+    def on_failure(e):
+        try:
+            app.computer_actions.available = False
+        except Exception as build_error:
+            # Headless systems fail here too (KeyError: 'DISPLAY', Xlib errors)
+            print(f"Computer actions unavailable: {str(build_error)}")
         messagebox.showwarning(
             "PyAutoGUI Warning",
             f"PyAutoGUI setup failed: {str(e)}\n\n"
-            "Computer automation features may not work properly.\n"
+            "Desktop control (mouse, keyboard, screenshots) is unavailable.\n"
             "You can still use chat and other features."
         )
-        return False
+    
+    app.root.after_idle(lambda: app.bridge.run_blocking(check_pyautogui, errback=on_failure))
 
 def check_api_key():
-    """Check if API key is configured"""
-    if not Config.ANTHROPIC_API_KEY:
+    """Check if API key is configured (replay and mock transports need none)"""
+    if not Config.ANTHROPIC_API_KEY and Config.CLAUDE_TRANSPORT not in ("replay", "mock"):
         root = tk.Tk()
         root.withdraw()  # Hide the main window
         
@@ -106,36 +114,33 @@ def check_api_key():
 def create_directories():
     """Create necessary directories if they don't exist"""
     try:
-        # Create logs directory
-        logs_dir = project_dir / "logs"
-        logs_dir.mkdir(exist_ok=True)
-        
-        # Create exports directory
-        exports_dir = project_dir / "exports"
-        exports_dir.mkdir(exist_ok=True)
-        
-        # Create temp directory
-        temp_dir = project_dir / "temp"
-        temp_dir.mkdir(exist_ok=True)
-        
+        Config.create_directories()
         return True
     except Exception as e:
         print(f"Warning: Could not create directories: {str(e)}")
         return False
 
+def report_config_issues():
+    """Print configuration problems found by Config.validate_config"""
+    config_issues = Config.validate_config()
+    if config_issues:
+        print("⚠️  Configuration Issues:")
+        for issue in config_issues:
+            print(f"   • {issue}")
+
 def main():
     """Enhanced main entry point"""
     print("🚀 Starting Claude AI Assistant...")
     
     # Check dependencies first
-    if not check_dependencies():
-        return
+    with startup_phase("check_dependencies"):
+        if not check_dependencies():
+            return
     
     # Create necessary directories
-    create_directories()
-    
-    # Setup PyAutoGUI
-    pyautogui_available = setup_pyautogui()
+    with startup_phase("create_directories"):
+        create_directories()
+        report_config_issues()
     
     # Check for API key
     if not check_api_key():
@@ -146,9 +151,12 @@ def main():
         print("🎨 Initializing modern interface...")
         app = EnhancedMainWindow()
         
-        # Set PyAutoGUI availability flag
-        if hasattr(app, 'computer_actions'):
-            app.computer_actions.available = pyautogui_available
+        # Check PyAutoGUI in the background; computer actions are disabled if it fails
+        setup_pyautogui(app)
+        
+        if PROFILE_ARG:
+            output_path = PROFILE_ARG.partition("=")[2] or None
+            profiler.finish_after_paint(app.root, output_path)
         
         print("✅ Claude AI Assistant ready!")
         app.run()
@@ -4,29 +4,158 @@ from datetime import datetime
 from pathlib import Path
 from config import Config
 
+# Opens the text block carrying the running summary in get_messages()
+SUMMARY_HEADER = "[Summary of earlier conversation]"
+
 class MessageHistoryManager:
     def __init__(self):
         self.history = deque(maxlen=Config.MAX_HISTORY_MESSAGES)
         self.history_file = Config.HISTORY_FILE
+        
+        # Running summary of messages that fell out of the history window,
+        # and evicted messages not yet folded into it
+        self.summary = ""
+        self.summary_updated = None
+        self.unsummarized = []
+        
         self.load_history()
         
-    def add_message(self, sender, message, has_screenshot=False):
-        """Add a message to history"""
+    def add_message(self, sender, message, has_screenshot=False, content=None):
+        """Add a message to history
+        
+        content optionally holds the Messages API content blocks for the turn
+        (e.g. text plus tool_use blocks) so it can be replayed verbatim.
+        """
         message_entry = {
             'timestamp': datetime.now().isoformat(),
             'sender': sender,
             'message': message,
             'has_screenshot': has_screenshot
         }
+        if content:
+            message_entry['content'] = content
+        
+        # Keep the oldest message for the summary before the deque drops it
+        if Config.ENABLE_HISTORY_SUMMARY and len(self.history) == self.history.maxlen:
+            self.unsummarized.append(self.history[0])
+            del self.unsummarized[:-Config.SUMMARY_MAX_PENDING]
+        
         self.history.append(message_entry)
         self.save_history()
         
+    def add_tool_results(self, results, summary=""):
+        """Add tool_result blocks answering Claude's tool_use blocks
+        
+        Image results (screenshots) are stored as a text placeholder to keep
+        the history file small; Claude already saw them during the tool loop.
+        """
+        stored = []
+        for result in results:
+            result = {key: value for key, value in result.items() if key != 'cache_control'}
+            if isinstance(result.get('content'), list):
+                result['content'] = [
+                    block if block.get('type') != 'image' else {'type': 'text', 'text': '[screenshot]'}
+                    for block in result['content']
+                ]
+            stored.append(result)
+        
+        self.add_message("Tool", summary or f"{len(results)} tool result(s)", content=stored)
+        
+    def needs_summary(self):
+        """Check whether enough evicted messages are waiting to be summarized"""
+        return Config.ENABLE_HISTORY_SUMMARY and len(self.unsummarized) >= Config.SUMMARY_BATCH_SIZE
+    
+    def apply_summary(self, summary, summarized_count):
+        """Store an updated summary covering the first summarized_count pending messages"""
+        self.summary = summary
+        self.summary_updated = datetime.now().isoformat()
+        del self.unsummarized[:summarized_count]
+        self.save_history()
+        
+    def get_messages(self):
+        """Get conversation history as an alternating Messages API list
+        
+        The running summary of older messages, if any, opens the first turn.
+        """
+        messages = []
+        
+        for msg in self.history:
+            role = 'assistant' if msg['sender'].lower() == 'claude' else 'user'
+            
+            if msg.get('content'):
+                content = [dict(block) for block in msg['content']]
+            else:
+                text = msg.get('message', '')
+                if msg.get('has_screenshot', False):
+                    text += " [screenshot attached]"
+                content = [{'type': 'text', 'text': text}] if text.strip() else []
+            
+            if not content:
+                continue
+            
+            # Merge consecutive turns from the same role
+            if messages and messages[-1]['role'] == role:
+                messages[-1]['content'].extend(content)
+            else:
+                messages.append({'role': role, 'content': content})
+        
+        messages = self._pair_tool_blocks(messages)
+        
+        if self.summary:
+            summary_block = {'type': 'text', 'text': f"{SUMMARY_HEADER}\n{self.summary}"}
+            if messages:
+                messages[0]['content'].insert(0, summary_block)
+            else:
+                messages.append({'role': 'user', 'content': [summary_block]})
+        
+        return messages
+    
+    def _pair_tool_blocks(self, messages):
+        """Drop tool_use/tool_result blocks that lost their counterpart"""
+        paired = []
+        
+        for i, msg in enumerate(messages):
+            content = msg['content']
+            
+            if msg['role'] == 'assistant':
+                # Every tool_use must be answered in the following user turn
+                next_msg = messages[i + 1] if i + 1 < len(messages) else None
+                answered = {
+                    block.get('tool_use_id') for block in (next_msg['content'] if next_msg else [])
+                    if block.get('type') == 'tool_result'
+                }
+                content = [block for block in content
+                           if block.get('type') != 'tool_use' or block.get('id') in answered]
+            else:
+                # Every tool_result must answer a tool_use in the preceding turn
+                prev_msg = paired[-1] if paired and paired[-1]['role'] == 'assistant' else None
+                requested = {
+                    block.get('id') for block in (prev_msg['content'] if prev_msg else [])
+                    if block.get('type') == 'tool_use'
+                }
+                results = [block for block in content
+                           if block.get('type') == 'tool_result' and block.get('tool_use_id') in requested]
+                others = [block for block in content if block.get('type') != 'tool_result']
+                content = results + others  # tool_result blocks must come first
+            
+            if not content:
+                continue
+            
+            if paired and paired[-1]['role'] == msg['role']:
+                paired[-1]['content'].extend(content)
+            elif paired or msg['role'] == 'user':
+                # The conversation must open with a user turn
+                paired.append({'role': msg['role'], 'content': content})
+        
+        return paired
+        
     def get_context(self):
         """Get conversation context for Claude"""
         if not self.history:
             return "No previous conversation history.\n\nCurrent message:\n"
             
-        context = "Previous conversation history (last 20 messages):\n\n"
+        context = f"Summary of earlier conversation:\n{self.summary}\n\n" if self.summary else ""
+        context += "Previous conversation history (last 20 messages):\n\n"
         for i, msg in enumerate(self.history, 1):
             timestamp = datetime.fromisoformat(msg['timestamp']).strftime("%H:%M:%S")
             screenshot_note = " [with screenshot]" if msg.get('has_screenshot', False) else ""
@@ -42,6 +171,10 @@ class MessageHistoryManager:
                     history_data = json.load(f)
                     self.history = deque(history_data.get('messages', []), 
                                        maxlen=Config.MAX_HISTORY_MESSAGES)
+                    summary_data = history_data.get('summary', {})
+                    self.summary = summary_data.get('text', "")
+                    self.summary_updated = summary_data.get('updated')
+                    self.unsummarized = summary_data.get('unsummarized', [])
         except Exception as e:
             print(f"Error loading history: {str(e)}")
             self.history = deque(maxlen=Config.MAX_HISTORY_MESSAGES)
@@ -51,7 +184,12 @@ class MessageHistoryManager:
         try:
             history_data = {
                 'last_updated': datetime.now().isoformat(),
-                'messages': list(self.history)
+                'messages': list(self.history),
+                'summary': {
+                    'text': self.summary,
+                    'updated': self.summary_updated,
+                    'unsummarized': self.unsummarized
+                }
             }
             with open(self.history_file, 'w', encoding='utf-8') as f:
                 json.dump(history_data, f, indent=2, ensure_ascii=False)
@@ -61,6 +199,9 @@ class MessageHistoryManager:
     def clear_history(self):
         """Clear all history"""
         self.history.clear()
+        self.summary = ""
+        self.summary_updated = None
+        self.unsummarized = []
         self.save_history()
     
     def export_history(self, filename, format='json'):
@@ -0,0 +1,161 @@
+"""
+Screenshot Encoding for Claude Computer Use Assistant
+Downscales and compresses screenshots before they are sent to Claude
+"""
+
+import io
+import base64
+import time
+from PIL import Image, features
+from config import Config
+
+# Largest image the API takes without downscaling it again; anything
+# bigger is resized server-side and its coordinates no longer match ours
+API_MAX_LONG_EDGE = 1568
+API_MAX_PIXELS = 1_150_000
+
+class ScalingContext:
+    """Maps coordinates in an encoded screenshot back to real screen space
+    
+    screen_region is the (left, top, width, height) area of the virtual
+    desktop, in pyautogui coordinates, that the screenshot covers. left/top
+    may be negative when monitors sit left of or above the primary one.
+    """
+    
+    def __init__(self, image_size, screen_region):
+        self.image_size = image_size
+        self.screen_region = screen_region
+        
+        left, top, width, height = screen_region
+        self.scale_x = width / image_size[0]
+        self.scale_y = height / image_size[1]
+        
+    def to_screen(self, x, y):
+        """Convert screenshot pixel coordinates to screen coordinates"""
+        left, top = self.screen_region[:2]
+        return (round(x * self.scale_x) + left, round(y * self.scale_y) + top)
+    
+    def to_image(self, x, y):
+        """Convert screen coordinates to screenshot pixel coordinates"""
+        left, top = self.screen_region[:2]
+        return (round((x - left) / self.scale_x), round((y - top) / self.scale_y))
+    
+    def contains(self, x, y):
+        """Check whether screen coordinates fall inside the captured region"""
+        left, top, width, height = self.screen_region
+        return left <= x <= left + width and top <= y <= top + height
+
+class EncodedImage:
+    """A screenshot encoded for upload, with size and timing details"""
+    
+    def __init__(self, data, media_type, size, original_size, encoded_bytes, encode_time, scaling=None):
+        self.data = data
+        self.media_type = media_type
+        self.size = size
+        self.original_size = original_size
+        self.encoded_bytes = encoded_bytes
+        self.encode_time = encode_time
+        self.scaling = scaling
+        
+    def to_content_block(self):
+        """Get the Messages API image block for this image"""
+        return {
+            "type": "image",
+            "source": {
+                "type": "base64",
+                "media_type": self.media_type,
+                "data": self.data
+            }
+        }
+    
+    def describe(self):
+        """Get a short human readable summary of the encoding"""
+        return (
+            f"{self.original_size[0]}x{self.original_size[1]} -> {self.size[0]}x{self.size[1]} "
+            f"{self.media_type.split('/')[-1].upper()}, {self.encoded_bytes / 1024:.0f} KB "
+            f"in {self.encode_time * 1000:.0f} ms"
+        )
+
+class ImageEncoder:
+    """Resize and encode screenshots according to the performance settings"""
+    
+    FORMATS = {
+        'png': ('PNG', 'image/png'),
+        'jpeg': ('JPEG', 'image/jpeg'),
+        'webp': ('WEBP', 'image/webp'),
+    }
+    
+    def __init__(self, max_size=None, compress=None, image_format=None, quality=None):
+        self.max_size = max_size or Config.MAX_SCREENSHOT_SIZE
+        self.compress = Config.COMPRESS_SCREENSHOTS if compress is None else compress
+        self.image_format = (image_format or Config.SCREENSHOT_FORMAT).lower()
+        self.quality = quality or Config.SCREENSHOT_QUALITY
+        self.webp_available = features.check('webp')
+        
+    def encode(self, image):
+        """Downscale and encode an image, returning an EncodedImage"""
+        start_time = time.perf_counter()
+        original_size = image.size
+        
+        # Screen area the capture covers; defaults to pixels == screen points at (0, 0)
+        screen_region = image.info.get('screen_region', (0, 0) + original_size)
+        
+        image = self.resize(image)
+        image_format = self.choose_format(image)
+        pil_format, media_type = self.FORMATS[image_format]
+        
+        buffer = io.BytesIO()
+        if image_format == 'png':
+            image.save(buffer, format=pil_format)
+        elif image_format == 'jpeg':
+            image.convert('RGB').save(buffer, format=pil_format, quality=self.quality)
+        else:
+            image.save(buffer, format=pil_format, quality=self.quality, method=4)
+        
+        encoded = buffer.getvalue()
+        return EncodedImage(
+            data=base64.b64encode(encoded).decode(),
+            media_type=media_type,
+            size=image.size,
+            original_size=original_size,
+            encoded_bytes=len(encoded),
+            encode_time=time.perf_counter() - start_time,
+            scaling=ScalingContext(image.size, screen_region)
+        )
+    
+    def target_size(self, size):
+        """Largest size with the same aspect ratio within max_size and the API's image limits"""
+        width, height = size
+        max_width, max_height = self.max_size
+        scale = min(
+            1.0,
+            max_width / width,
+            max_height / height,
+            API_MAX_LONG_EDGE / max(width, height),
+            (API_MAX_PIXELS / (width * height)) ** 0.5
+        )
+        return (max(1, int(width * scale)), max(1, int(height * scale)))
+    
+    def resize(self, image):
+        """Shrink an image to its target size, keeping its aspect ratio"""
+        size = self.target_size(image.size)
+        if size == image.size:
+            return image
+        return image.resize(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+    
+    def choose_format(self, image):
+        """Pick an output format from the settings and the image content"""
+        if not self.compress or self.quality >= 95:
+            return 'png'
+        
+        if self.image_format in self.FORMATS:
+            if self.image_format == 'webp' and not self.webp_available:
+                return 'jpeg'
+            return self.image_format
+        
+        # Flat UI screens compress well losslessly; photos and video do not
+        sample = image.convert('RGB').resize((128, 128), Image.Resampling.NEAREST)
+        if sample.getcolors(maxcolors=Config.SCREENSHOT_PNG_MAX_COLORS) is not None:
+            return 'png'
+        
+        return 'webp' if self.webp_available else 'jpeg'
@@ -0,0 +1,56 @@
+"""
+Lazy Construction for Claude Computer Use Assistant
+Stand-ins that import and build heavy subsystems on first use
+"""
+
+import importlib
+import threading
+
+class LazyProxy:
+    """Stand-in for an object whose module is imported only when needed
+
+    Getting or setting an attribute builds the target first. warm_up()
+    builds it ahead of time, typically from a background thread once the
+    window is up, so the first real use finds it ready.
+    """
+
+    def __init__(self, module_name, class_name, *args, **kwargs):
+        object.__setattr__(self, '_spec', (module_name, class_name, args, kwargs))
+        object.__setattr__(self, '_target', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    @property
+    def is_loaded(self):
+        """Whether the target has been built"""
+        return self._target is not None
+
+    def warm_up(self):
+        """Import and build the target if needed, and return it"""
+        target = self._target
+        if target is not None:
+            return target
+
+        with self._lock:
+            if self._target is None:
+                module_name, class_name, args, kwargs = self._spec
+                cls = getattr(importlib.import_module(module_name), class_name)
+                object.__setattr__(self, '_target', cls(*args, **kwargs))
+            return self._target
+
+    def method(self, name):
+        """Get a function calling one of the target's methods, without building it yet"""
+        def call(*args, **kwargs):
+            return getattr(self.warm_up(), name)(*args, **kwargs)
+        call.__name__ = name
+        return call
+
+    def __getattr__(self, name):
+        return getattr(self.warm_up(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.warm_up(), name, value)
+
+    def __repr__(self):
+        module_name, class_name = self._spec[:2]
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<LazyProxy {module_name}.{class_name} ({state})>"
@@ -1,19 +1,46 @@
 import pyautogui
+import platform
 from PIL import Image, ImageTk
-import io
-import base64
 from config import Config
+from utils.image_encoding import ImageEncoder
+
+def capture_screen(all_screens=None):
+    """Capture the screen, tagging the image with the screen region it covers"""
+    if all_screens is None:
+        all_screens = Config.SCREENSHOT_ALL_SCREENS
+        
+    if all_screens:
+        from PIL import ImageGrab
+        screenshot = ImageGrab.grab(all_screens=True)
+        region = virtual_screen_region(screenshot.size)
+    else:
+        screenshot = pyautogui.screenshot()
+        region = (0, 0) + tuple(pyautogui.size())
+    
+    # Travels with the image so encoded copies can map coordinates back
+    screenshot.info['screen_region'] = region
+    return screenshot
+
+def virtual_screen_region(image_size):
+    """Get (left, top, width, height) of the desktop spanning all monitors"""
+    if platform.system() == "Windows":
+        import ctypes
+        metrics = ctypes.windll.user32.GetSystemMetrics
+        # SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN, SM_CXVIRTUALSCREEN, SM_CYVIRTUALSCREEN
+        return (metrics(76), metrics(77), metrics(78), metrics(79))
+    return (0, 0) + tuple(image_size)
 
 class ScreenshotManager:
     def __init__(self):
         pyautogui.FAILSAFE = Config.PYAUTOGUI_FAILSAFE
         pyautogui.PAUSE = Config.PYAUTOGUI_PAUSE
         self.current_screenshot = None
+        self.encoder = ImageEncoder()
         
     def take_screenshot(self):
         """Take a screenshot and return PIL Image"""
         try:
-            screenshot = pyautogui.screenshot()
+            screenshot = capture_screen()
             self.current_screenshot = screenshot
             return screenshot
         except Exception as e:
@@ -28,14 +55,17 @@ class ScreenshotManager:
         thumbnail.thumbnail(size, Image.Resampling.LANCZOS)
         return ImageTk.PhotoImage(thumbnail)
     
-    def to_base64(self, image=None):
-        """Convert image to base64 string"""
+    def encode(self, image=None):
+        """Downscale and compress image for upload, returning an EncodedImage"""
         if image is None:
             image = self.current_screenshot
             
         if not image:
             return None
             
-        buffer = io.BytesIO()
-        image.save(buffer, format='PNG')
-        return base64.b64encode(buffer.getvalue()).decode()
+        return self.encoder.encode(image)
+    
+    def to_base64(self, image=None):
+        """Convert image to base64 string"""
+        encoded = self.encode(image)
+        return encoded.data if encoded else None
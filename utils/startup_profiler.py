@@ -0,0 +1,204 @@
+"""
+Startup Profiler for Claude Computer Use Assistant
+In-process import timing and startup phase timing (main.py --profile-startup)
+"""
+
+import contextlib
+import importlib.abc
+import json
+import platform
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+class _TimedLoader:
+    """Loader wrapper that times exec_module of one module"""
+    
+    def __init__(self, loader, profiler, find_time):
+        self.loader = loader
+        self.profiler = profiler
+        self.find_time = find_time
+    
+    def create_module(self, spec):
+        create_module = getattr(self.loader, 'create_module', None)
+        return create_module(spec) if create_module else None
+    
+    def exec_module(self, module):
+        # Put the real loader back so the module never sees the wrapper
+        module.__loader__ = self.loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self.loader
+        
+        self.profiler._enter(module.__name__, self.find_time)
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.profiler._exit()
+    
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """First meta path finder: finds specs through the others and wraps their loaders"""
+    
+    def __init__(self, profiler):
+        self.profiler = profiler
+    
+    def find_spec(self, fullname, path, target=None):
+        start_time = time.perf_counter()
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        
+        if spec.loader is None or not hasattr(spec.loader, 'exec_module'):
+            return spec
+        spec.loader = _TimedLoader(spec.loader, self.profiler, time.perf_counter() - start_time)
+        return spec
+
+class StartupProfiler:
+    """Per-module import times (like -X importtime) and wall time per startup phase
+    
+    Import times are self (the module's own code) and cumulative
+    (including the modules it imported), both counting the time spent
+    finding the module. Imports made on other threads are tagged with the
+    thread name.
+    """
+    
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.imports = []
+        self.phases = []
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.finder = _ImportTimer(self)
+    
+    def install(self):
+        """Start timing imports"""
+        if self.finder not in sys.meta_path:
+            sys.meta_path.insert(0, self.finder)
+        return self
+    
+    def uninstall(self):
+        """Stop timing imports"""
+        if self.finder in sys.meta_path:
+            sys.meta_path.remove(self.finder)
+    
+    def _enter(self, name, find_time):
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        stack.append({'name': name, 'start': time.perf_counter() - find_time, 'children': 0.0})
+    
+    def _exit(self):
+        stack = self.local.stack
+        frame = stack.pop()
+        cumulative = time.perf_counter() - frame['start']
+        if stack:
+            stack[-1]['children'] += cumulative
+        
+        with self.lock:
+            self.imports.append({
+                'module': frame['name'],
+                'self': cumulative - frame['children'],
+                'cumulative': cumulative,
+                'parent': stack[-1]['name'] if stack else None,
+                'thread': threading.current_thread().name
+            })
+    
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time a block of startup work"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, start_time)
+    
+    def add_phase(self, name, start_time, end_time=None):
+        """Record a phase that ran from start_time (perf_counter) until end_time or now"""
+        end_time = time.perf_counter() if end_time is None else end_time
+        self.phases.append({
+            'name': name,
+            'start': start_time - self.start_time,
+            'duration': end_time - start_time
+        })
+    
+    def finish_after_paint(self, root, output_path=None):
+        """Record the first paint of a Tk window, then write the report
+        
+        Runs from an idle callback queued after the window's own redraws,
+        so it fires once the initial widgets have been drawn.
+        """
+        requested_time = time.perf_counter()
+        
+        def on_paint():
+            root.update_idletasks()
+            self.add_phase("first_paint", requested_time)
+            self.uninstall()
+            path = self.write(output_path)
+            print(self.report())
+            print(f"📄 Startup profile written to {path}")
+        
+        root.after_idle(on_paint)
+    
+    def to_dict(self):
+        """Profile as a JSON-serializable dict, imports sorted by cumulative time"""
+        with self.lock:
+            imports = sorted(self.imports, key=lambda entry: entry['cumulative'], reverse=True)
+        return {
+            'created': datetime.now().isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'time_to_first_paint': max((phase['start'] + phase['duration'] for phase in self.phases), default=0.0),
+            'phases': list(self.phases),
+            'imports': imports
+        }
+    
+    def report(self, limit=25):
+        """Human-readable report: phases in order, then the slowest imports"""
+        profile = self.to_dict()
+        lines = ["", "⏱️  Startup profile", "", "Phases:"]
+        for phase in profile['phases']:
+            lines.append(f"  {phase['duration'] * 1000:9.1f} ms  {phase['name']}  (at {phase['start'] * 1000:.0f} ms)")
+        lines.append(f"  Time to first paint: {profile['time_to_first_paint'] * 1000:.0f} ms")
+        
+        lines.extend(["", f"Slowest imports ({len(profile['imports'])} modules):",
+                      "   cumulative        self  module"])
+        for entry in profile['imports'][:limit]:
+            thread = "" if entry['thread'] == "MainThread" else f"  [{entry['thread']}]"
+            lines.append(f"  {entry['cumulative'] * 1000:8.1f} ms {entry['self'] * 1000:8.1f} ms  "
+                         f"{entry['module']}{thread}")
+        return "\n".join(lines)
+    
+    def write(self, output_path=None):
+        """Write the profile as JSON and return its path"""
+        if output_path is None:
+            from config import Config
+            output_path = Config.LOGS_DIR / f"startup_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        
+        path = Path(output_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+_active_profiler = None
+
+def start_profiling():
+    """Create, install and register the process's startup profiler"""
+    global _active_profiler
+    _active_profiler = StartupProfiler().install()
+    return _active_profiler
+
+def startup_phase(name):
+    """Time a startup phase if profiling is on (a no-op context otherwise)"""
+    if _active_profiler is None:
+        return contextlib.nullcontext()
+    return _active_profiler.phase(name)
@@ -0,0 +1,103 @@
+"""
+Turn Telemetry for Claude Computer Use Assistant
+Per-turn latency breakdown and token usage with a rolling store and JSONL sink
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from config import Config
+
+class TelemetryStore:
+    """Rolling in-memory telemetry records, also appended to a JSONL file
+    
+    One record per chat turn: queue wait, screenshot encode time, time to
+    first token, total latency, token usage (including prompt cache reads
+    and writes) and every tool execution with its duration.
+    """
+    
+    def __init__(self, max_records=None, sink_path=None):
+        self.records = deque(maxlen=max_records or Config.TELEMETRY_MAX_RECORDS)
+        self.sink_path = Path(sink_path or Config.TELEMETRY_FILE) if Config.TELEMETRY_SINK_ENABLED else None
+        self.lock = threading.Lock()
+    
+    def start_turn(self):
+        """Create the record for a new turn"""
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'start': time.perf_counter(),
+            'outcome': None,
+            'requests': 0,
+            'cached_responses': 0,
+            'queue_wait': 0.0,
+            'encode_time': 0.0,
+            'time_to_first_token': None,
+            'total_latency': None,
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'cache_read_input_tokens': 0,
+            'cache_creation_input_tokens': 0,
+            'steps': [],
+            'tools': []
+        }
+    
+    def mark_first_output(self, turn):
+        """Note the first visible output of a turn"""
+        if turn['time_to_first_token'] is None:
+            turn['time_to_first_token'] = time.perf_counter() - turn['start']
+    
+    def add_request(self, turn, claude_client):
+        """Add the details of the request the client just completed"""
+        turn['requests'] += 1
+        if claude_client.last_response_cached:
+            turn['cached_responses'] += 1
+            return
+        
+        turn['queue_wait'] += claude_client.last_queue_wait
+        for field in ('input_tokens', 'output_tokens', 'cache_read_input_tokens', 'cache_creation_input_tokens'):
+            turn[field] += claude_client.last_usage.get(field, 0)
+    
+    def finish_turn(self, turn, outcome):
+        """Complete a turn's record and store it"""
+        turn['outcome'] = outcome
+        turn['total_latency'] = time.perf_counter() - turn.pop('start')
+        self.record(turn)
+        return turn
+    
+    def record(self, entry):
+        """Store a record and append it to the JSONL sink"""
+        with self.lock:
+            self.records.append(entry)
+            if self.sink_path is None:
+                return
+            try:
+                with open(self.sink_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, default=str) + "\n")
+            except OSError as e:
+                print(f"Error writing telemetry: {str(e)}")
+    
+    @staticmethod
+    def percentile(values, pct):
+        """Nearest-rank percentile of a list of numbers"""
+        if not values:
+            return None
+        ordered = sorted(values)
+        rank = max(1, round(pct / 100 * len(ordered)))
+        return ordered[min(rank, len(ordered)) - 1]
+    
+    def summary(self):
+        """Get p50/p95 of the latency fields over the stored turns"""
+        with self.lock:
+            records = list(self.records)
+        
+        summary = {'turns': len(records)}
+        for field in ('total_latency', 'time_to_first_token', 'queue_wait', 'encode_time'):
+            values = [record[field] for record in records if record.get(field) is not None]
+            summary[field] = {'p50': self.percentile(values, 50), 'p95': self.percentile(values, 95)}
+        
+        tool_times = [tool['duration'] for record in records for tool in record['tools']]
+        summary['tool_time'] = {'p50': self.percentile(tool_times, 50), 'p95': self.percentile(tool_times, 95)}
+        return summary